@@ -0,0 +1,271 @@
+"""
+Benchmarks for derek.
+
+Times, and measures the peak memory allocated by, :code:`Derek.tree`,
+:code:`Derek.parse` (for each strategy) and :code:`Derek.example`, on
+deterministic synthetic workloads.
+
+Usage::
+
+    python python/benchmarks/bench.py --output results.json
+    python python/benchmarks/bench.py --compare results.json
+
+With :code:`--compare`, the results are compared with those saved from a
+previous run (for example, on another commit), and the exit status is 1 if
+any time or peak memory has increased by more than the tolerance.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+)
+
+import derek  # noqa: E402
+from derek import Derek  # noqa: E402
+
+STRATEGIES = ("permissive", "restricted", "inner_join")
+
+# Times shorter than this (in seconds) are too noisy to compare
+MIN_TIME = 1e-3
+
+
+# Workloads. Each takes a random number generator and a size, and returns a
+# JSON-serializable value.
+
+
+def uniform_records(rng, n):
+    """
+    Wide list of records, all with the same keys and value types.
+    """
+    return [
+        {
+            "id": i,
+            "name": "name{}".format(i),
+            "score": rng.random(),
+            "active": rng.random() < 0.5,
+            "tags": ["a", "b"],
+            "address": {"street": "street", "number": rng.randrange(100)},
+        }
+        for i in range(n)
+    ]
+
+
+def heterogeneous_records(rng, n):
+    """
+    Wide list of records with optional keys, and values of varying types.
+    """
+    keys = ["k{}".format(i) for i in range(12)]
+    makers = [
+        lambda: rng.randrange(1000),
+        lambda: rng.random(),
+        lambda: "s{}".format(rng.randrange(10)),
+        lambda: rng.random() < 0.5,
+        lambda: [rng.randrange(10) for _ in range(rng.randrange(4))],
+        lambda: {"x": rng.randrange(10), "y": "y"},
+    ]
+    return [
+        {k: rng.choice(makers)() for k in rng.sample(keys, rng.randrange(1, 8))}
+        for _ in range(n)
+    ]
+
+
+def deep_nesting(rng, n):
+    """
+    Dictionaries and lists nested to a depth of :code:`n`, with siblings at
+    each level.
+    """
+    obj = {"leaf": rng.random()}
+    for i in range(n):
+        if i % 2:
+            obj = [obj, {"level": i}]
+        else:
+            obj = {"child": obj, "level": i, "name": "n{}".format(i)}
+    return obj
+
+
+def large_map(rng, n):
+    """
+    Dictionary with many keys, mapping to small records.
+    """
+    return {
+        "key{}".format(i): {"value": rng.randrange(1000), "label": "l"}
+        for i in range(n)
+    }
+
+
+def numeric_arrays(rng, n):
+    """
+    List of rows of numbers.
+    """
+    return [[rng.random() for _ in range(16)] for _ in range(n)]
+
+
+# Name: (workload, size for scale 1)
+WORKLOADS = {
+    "uniform_records": (uniform_records, 20000),
+    "heterogeneous_records": (heterogeneous_records, 20000),
+    "deep_nesting": (deep_nesting, 200),
+    "large_map": (large_map, 50000),
+    "numeric_arrays": (numeric_arrays, 10000),
+}
+
+
+def operations(obj):
+    """
+    Get the operations to benchmark for a value, as (name, function) pairs.
+    """
+    tree = Derek.tree(obj)
+    yield "tree", lambda: Derek.tree(obj)
+    for strategy in STRATEGIES:
+        yield "parse_" + strategy, lambda s=strategy: tree.parse(strategy=s)
+    yield "example", tree.example
+
+
+def measure(function, repeat):
+    """
+    Get the best time of :code:`repeat` calls to a function, and the peak
+    memory allocated during one call.
+    """
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    # (Measured separately, as tracing slows down the function)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"time": min(times), "peak_memory": peak}
+
+
+def run(scale=1.0, repeat=3, seed=0, workloads=None):
+    """
+    Run the benchmarks.
+
+    Parameters
+    ----------
+    scale:
+        Factor by which to multiply the size of each workload.
+    repeat:
+        Number of times to time each operation.
+    seed:
+        Seed for generating the workloads.
+    workloads:
+        Names of the workloads to run. If not specified, all are run.
+
+    Returns
+    -------
+    Dict
+        Results, keyed by workload then by operation.
+    """
+    results = {}
+    for name in workloads or WORKLOADS:
+        workload, size = WORKLOADS[name]
+        obj = workload(random.Random(seed), max(1, int(size * scale)))
+        results[name] = {
+            operation: measure(function, repeat)
+            for operation, function in operations(obj)
+        }
+    return results
+
+
+def compare(old, new, tolerance):
+    """
+    Print a comparison of two sets of results.
+
+    Returns
+    -------
+    bool
+        Whether any time or peak memory has increased by more than the
+        tolerance (a fraction). Times shorter than :data:`MIN_TIME` are
+        not counted.
+    """
+    regressed = False
+    row = "{:<24}{:<32}{:>12}{:>12}{:>8}"
+    print(row.format("workload", "operation", "old", "new", "ratio"))
+    for workload, operations in new.items():
+        for operation, result in operations.items():
+            previous = old.get(workload, {}).get(operation)
+            if previous is None:
+                continue
+            for metric in ("time", "peak_memory"):
+                if not previous[metric]:
+                    continue
+                ratio = result[metric] / previous[metric]
+                flag = ""
+                if ratio > 1 + tolerance and (
+                    metric != "time" or result[metric] >= MIN_TIME
+                ):
+                    regressed = True
+                    flag = " !"
+                print(
+                    row.format(
+                        workload,
+                        "{} ({})".format(operation, metric),
+                        "{:.4g}".format(previous[metric]),
+                        "{:.4g}".format(result[metric]),
+                        "{:.2f}".format(ratio),
+                    )
+                    + flag
+                )
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="File to save the results to (JSON).")
+    parser.add_argument("--compare", help="File of results to compare with.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Fractional increase counted as a regression (default 0.2).",
+    )
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--workload", action="append", choices=sorted(WORKLOADS), dest="workloads"
+    )
+    args = parser.parse_args(argv)
+
+    results = {
+        "derek": derek.__version__,
+        "python": platform.python_version(),
+        "scale": args.scale,
+        "seed": args.seed,
+        "results": run(args.scale, args.repeat, args.seed, args.workloads),
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        return int(compare(old["results"], results["results"], args.tolerance))
+
+    json.dump(results, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
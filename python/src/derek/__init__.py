@@ -1,4 +1,16 @@
 from ._derek import Derek
-from ._parse import Parser
+from ._tree import DerekTree
+from ._lazy import LazyDerek
+from ._dag import DerekDAG
+from ._weak import WeakDerek
+from ._parse import (
+    Parser,
+    Accumulator,
+    PathStats,
+    Tracer,
+    SchemaCache,
+    get_schema_cache,
+    set_schema_cache,
+)
 
 __version__ = "0.0.2"
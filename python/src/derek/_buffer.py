@@ -0,0 +1,107 @@
+import struct
+from array import array
+from typing import Any, Optional, Tuple
+
+# Kinds of element for each format of the struct module, as used by
+# memoryview (ignoring any byte order or size prefix)
+_FORMAT_KINDS = {
+    "?": "boolean",
+    "b": "integer",
+    "B": "integer",
+    "h": "integer",
+    "H": "integer",
+    "i": "integer",
+    "I": "integer",
+    "l": "integer",
+    "L": "integer",
+    "q": "integer",
+    "Q": "integer",
+    "n": "integer",
+    "N": "integer",
+    "e": "number",
+    "f": "number",
+    "d": "number",
+}
+
+# Kinds of element for each array.array typecode
+_TYPECODE_KINDS = dict(_FORMAT_KINDS, u="string", w="string")
+
+
+def layout(value: Any) -> Optional[Tuple[Optional[str], Tuple[int, ...]]]:
+    """
+    Get the kind of the elements of a buffer, and its shape, without reading
+    the elements.
+
+    Buffers are values with at least one dimension supporting the buffer
+    protocol, other than :code:`bytes` and :code:`bytearray`: for example,
+    :code:`array.array`, :code:`memoryview` or :code:`numpy.ndarray`. (NumPy
+    is never imported.) A buffer is treated like a list (of lists, for each
+    further dimension) of its elements.
+
+    Parameters
+    ----------
+    value:
+        Any value.
+
+    Returns
+    -------
+    Optional[Tuple]
+        Kind of the elements (see :func:`derek._parse._oas2._leaf_kind`),
+        found from the typecode or format of the buffer (None if not
+        supported), and the length of each dimension. None if :code:`value`
+        is not a buffer.
+    """
+    if isinstance(value, array):
+        return _TYPECODE_KINDS.get(value.typecode), (len(value),)
+    elif isinstance(value, (str, bytes, bytearray)):
+        return None
+
+    try:
+        view = memoryview(value)
+    except TypeError:
+        return None
+    if not view.ndim:
+        return None
+    return _FORMAT_KINDS.get(view.format.lstrip("@=<>!")), view.shape
+
+
+def example(value: Any, shape: Tuple[int, ...]) -> list:
+    """
+    Get the example of a buffer, without copying it.
+
+    Parameters
+    ----------
+    value:
+        Buffer (see :func:`layout`).
+    shape:
+        Length of each dimension of the buffer, as returned by
+        :func:`layout`.
+
+    Returns
+    -------
+    list
+        The first element of the buffer, in a list for each dimension (or,
+        if a dimension is empty, an empty list in a list for each dimension
+        before it). This is the same as the example of the buffer as nested
+        lists (see :func:`derek._example.example`).
+    """
+    if 0 in shape:
+        depth = shape.index(0)
+        result = []
+    else:
+        depth = len(shape)
+        if isinstance(value, array):
+            result = value[0]
+        else:
+            view = memoryview(value)
+            try:
+                result = view[(0,) * depth]
+            except NotImplementedError:
+                # (Formats that memoryview can't unpack, like those with a
+                # byte order, as made by ctypes)
+                first = view.cast("B")[: view.itemsize]
+                (result,) = struct.unpack(view.format, first)
+
+    for _ in range(depth):
+        result = [result]
+    return result
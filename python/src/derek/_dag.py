@@ -0,0 +1,132 @@
+from typing import Optional
+
+from ._derek import Derek
+from ._gc import paused_gc
+
+from . import _typing
+
+
+class DerekDAG(Derek):
+    """
+    A node in a data structure, in a tree where structurally identical
+    subtrees share a single node (so that the tree is a directed acyclic
+    graph).
+
+    Two values are structurally identical if they are equal and have the same
+    types throughout, e.g. two :code:`{"street": "a", "number": 1}`
+    dictionaries (but not :code:`1` and :code:`1.0`, or :code:`1` and
+    :code:`True`). A shared node's :code:`value` is the first of the
+    identical values, and its :code:`parent` is the parent of that value.
+
+    :meth:`example` and :meth:`parse` give the same results as for a tree of
+    Derek nodes. While parsing, the children of each shared node are only
+    visited once, so the time taken scales with the number of distinct
+    subtrees.
+
+    Use :meth:`DerekDAG.tree`, or :code:`Derek.tree(obj, intern=True)`, to
+    make a tree.
+    """
+
+    __slots__ = tuple()
+
+    # (Nodes may appear more than once in the tree; see Parser.oas2)
+    _shared = True
+
+    @classmethod
+    def tree(
+        cls,
+        obj: _typing.JSON,
+        parent: Optional[_typing.DerekType] = None,
+        name: Optional[str] = None,
+    ) -> "DerekDAG":
+        """
+        Create a tree representation of :code:`obj`, sharing the nodes of
+        structurally identical subtrees.
+
+        Parameters
+        ----------
+        obj: :data:`derek._typing.JSON`
+            A JSON-serializable dictionary/list.
+        parent
+            Parent node of the returned DerekDAG instance.
+        name:
+            Name of the returned DerekDAG instance.
+
+        Returns
+        -------
+        Tree representation of :code:`obj`, as a DerekDAG instance.
+
+        :code:`obj` is identical (same :code:`id`) to `self.value`.
+        """
+        new = cls.__new__
+        # Structural key -> node. Keys of lists and dictionaries refer to
+        # their children by id, which is unique as the nodes are kept here.
+        nodes = {}
+
+        def make(value, children, key):
+            node = nodes.get(key)
+            if node is None:
+                node = nodes[key] = new(cls)
+                node.parent = None
+                node.children = children
+                node.value = value
+                node.name = None
+                if children:
+                    for child in children:
+                        if child.parent is None:
+                            child.parent = node
+            return node
+
+        def leaf(value):
+            if isinstance(value, list):
+                return make(value, [], (list,))
+            elif isinstance(value, dict):
+                return make(value, [], (dict,))
+            elif type(value) is float and value == 0:
+                # (0.0 and -0.0 are equal, but not identical)
+                return make(value, None, (float, repr(value)))
+            elif isinstance(value, memoryview):
+                # (Writable memoryviews can't be hashed, and equal ones may
+                # differ in format, like "?" and "B", so aren't shared)
+                return make(value, None, (object, id(value)))
+            try:
+                return make(value, None, (type(value), value))
+            except TypeError:
+                # (Unhashable, so not shared)
+                return make(value, None, (object, id(value)))
+
+        if not (isinstance(obj, (list, dict)) and obj):
+            root = leaf(obj)
+        else:
+            with paused_gc():
+                root = cls._build(obj, make, leaf)
+
+        root.parent = parent
+        root.name = name
+        return root
+
+    @staticmethod
+    def _build(obj, make, leaf):
+        """
+        Make the nodes for a non-empty list or dictionary, in post-order.
+        """
+        # Each entry is (value, iterator over children, child nodes)
+        stack = [(obj, iter(obj if isinstance(obj, list) else obj.values()), [])]
+        while True:
+            value, remaining, children = stack[-1]
+            for item in remaining:
+                if isinstance(item, (list, dict)) and item:
+                    items = item if isinstance(item, list) else item.values()
+                    stack.append((item, iter(items), []))
+                    break
+                children.append(leaf(item))
+            else:
+                stack.pop()
+                ids = tuple(map(id, children))
+                if isinstance(value, list):
+                    node = make(value, children, (list, ids))
+                else:
+                    node = make(value, children, (dict, tuple(value), ids))
+                if not stack:
+                    return node
+                stack[-1][2].append(node)
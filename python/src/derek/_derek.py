@@ -1,11 +1,78 @@
 import json
+import os
+import weakref
+from collections.abc import Sequence
 from copy import deepcopy as dcp
 
-from . import _parse
+from . import _index, _parse
+from ._example import example as _example
+from ._gc import paused_gc
+from ._parse._oas2 import _expand_node, _scalar_kinds
 
-from typing import Optional, Any, Iterable
+from typing import Optional, Any, AsyncIterable, Iterable, IO, List, Union
 from . import _typing
 
+# Length from which the child nodes of a list of scalars are made on first
+# access (see _ScalarChildren), rather than with the tree. (Making a few
+# nodes costs less than scanning their types.)
+_SCALAR_CHILDREN_MIN = 4
+
+
+class _ScalarChildren(Sequence):
+    """
+    Child nodes of a node whose value is a list of scalars, made
+    (and cached) on first access rather than when the tree is made.
+
+    Parsing the tree, or making an example of it, only needs the list, so
+    doesn't make the child nodes.
+    """
+
+    __slots__ = "value", "_cls", "_parent", "_nodes"
+
+    def __init__(self, parent: "Derek"):
+        self.value = parent.value
+        self._cls = type(parent)
+        # (Referenced weakly where possible, so as not to add a reference
+        # cycle to a tree of WeakDerek nodes)
+        if hasattr(parent, "__weakref__"):
+            self._parent = weakref.ref(parent)
+        else:
+            self._parent = parent
+        self._nodes = None
+
+    def __len__(self):
+        return len(self.value)
+
+    def __getitem__(self, i):
+        return self._made()[i]
+
+    def __iter__(self):
+        return iter(self._made())
+
+    def _made(self) -> List["Derek"]:
+        """
+        Get the child nodes, making them if they haven't been made.
+        """
+        nodes = self._nodes
+        if nodes is None:
+            cls = self._cls
+            new = cls.__new__
+            parent = self._parent
+            if isinstance(parent, weakref.ref):
+                parent = parent()
+
+            nodes = []
+            append = nodes.append
+            for item in self.value:
+                child = new(cls)
+                child.parent = parent
+                child.children = None
+                child.value = item
+                child.name = None
+                append(child)
+            self._nodes = nodes
+        return nodes
+
 
 class Derek:
     """
@@ -46,7 +113,7 @@ class Derek:
     # TODO: Add reload method
     # TODO: Add checkIntegrity method
 
-    __slots__ = "parent", "children", "value", "name"
+    __slots__ = "parent", "children", "value", "name", "_index"
 
     def __init__(
         self,
@@ -72,12 +139,73 @@ class Derek:
         """
         return _parse.Parser
 
+    @property
+    def index(self) -> "_index.PathIndex":
+        """
+        Index of the nodes in the tree below this node, by path, made on
+        first access. See :class:`derek._index.PathIndex`.
+        """
+        index = getattr(self, "_index", None)
+        if index is None:
+            index = self._index = _index.PathIndex(_expand_node)
+        return index
+
+    def _index_root(self):
+        """
+        Get the root item for looking up paths in :attr:`index`.
+        """
+        return self
+
+    def node_at(self, path: str) -> Any:
+        """
+        Get the node at a path below this node.
+
+        Parameters
+        ----------
+        path:
+            JSON pointer (like :code:`"/items/0/owner/id"`) or JSONPath (like
+            :code:`"$.items[0].owner.id"`), relative to this node. See
+            :func:`derek._index.parse_path`.
+
+        Returns
+        -------
+        The node.
+
+        Raises
+        ------
+        KeyError
+            If there is no node at the path.
+        """
+        return self.index.get(self._index_root(), path)
+
+    def nodes_at(self, path: str) -> List[Any]:
+        """
+        Get the nodes matching a path below this node.
+
+        Parameters
+        ----------
+        path:
+            JSON pointer or JSONPath, relative to this node, in which
+            :code:`*` matches every element of a list (or value of a
+            dictionary), like :code:`"$.items[*].owner.id"`. See
+            :func:`derek._index.parse_path`.
+
+        Returns
+        -------
+        List
+            The nodes, in order (empty if none).
+        """
+        return self.index.find(self._index_root(), path)
+
     @classmethod
     def tree(
         cls,
         obj: _typing.JSON,
         parent: Optional[_typing.DerekType] = None,
         name: Optional[str] = None,
+        lazy: bool = False,
+        intern: bool = False,
+        weak: bool = False,
     ) -> _typing.DerekType:
         """
         Create a tree representation of :code:`obj`.
@@ -96,32 +224,92 @@ class Derek:
             set to :code:`None`.
         name:
             Name of the returned Derek instance.
+        lazy:
+            If True, only make the root node, as a
+            :class:`derek.LazyDerek` instance. Child nodes are then made
+            when they are first accessed.
+        intern:
+            If True, share a single node between structurally identical
+            subtrees, as :class:`derek.DerekDAG` instances.
+        weak:
+            If True, make :class:`derek.WeakDerek` nodes, which only hold
+            weak references to their parents, so that the tree has no
+            reference cycles.
 
         Returns
         -------
         Tree representation of :code:`obj`, as a Derek instance.
 
         :code:`obj` is identical (same :code:`id`) to `self.value`.
+
+        The child nodes of a list of scalars (like a list of numbers), unless
+        it is very short, are only made when its :code:`children` are first
+        iterated over or indexed.
         """
+        if lazy + intern + weak > 1:
+            raise ValueError("Only one of lazy, intern and weak can be used")
+        elif lazy:
+            from ._lazy import LazyDerek
 
-        # TODO: return DerekTree (a subclass of Derek) instead of Derek.
-        self = cls.__new__(cls)
-        children = []
+            return LazyDerek.tree(obj, parent, name)
+        elif intern:
+            from ._dag import DerekDAG
 
-        if isinstance(obj, list):
-            # Make child nodes
-            children = [cls.tree(item, self) for item in obj]
-        elif isinstance(obj, dict):
-            # Make child nodes
-            children = [cls.tree(item, self) for item in obj.values()]
-        else:
-            # Not iterable
-            children = None
+            return DerekDAG.tree(obj, parent, name)
+        elif weak:
+            from ._weak import WeakDerek
 
+            return WeakDerek.tree(obj, parent, name)
+
+        # (See DerekTree for a compact representation.)
+        new = cls.__new__
+
+        self = new(cls)
         self.parent = parent
-        self.children = children
+        self.children = None
         self.value = obj
         self.name = name
+
+        # Build the tree iteratively, using an explicit stack of nodes that
+        # still need child nodes, so that the nesting depth of obj is not
+        # limited by the recursion limit.
+        stack = [self] if isinstance(obj, (list, dict)) else []
+        pop = stack.pop
+        push = stack.append
+
+        # Every node references its parent and vice versa, so the cyclic
+        # garbage collector would otherwise repeatedly traverse the partially
+        # built tree while it grows.
+        with paused_gc():
+            while stack:
+                node = pop()
+                value = node.value
+                if (
+                    isinstance(value, list)
+                    and len(value) >= _SCALAR_CHILDREN_MIN
+                    and _scalar_kinds(value)
+                ):
+                    # (Found with a single scan of the types of the elements)
+                    node.children = _ScalarChildren(node)
+                    continue
+
+                children = []
+                append = children.append
+
+                # Make child nodes
+                for item in value if isinstance(value, list) else value.values():
+                    child = new(cls)
+                    child.parent = node
+                    child.children = None
+                    child.value = item
+                    child.name = None
+                    append(child)
+
+                    if isinstance(item, (list, dict)):
+                        push(child)
+
+                node.children = children
+
         return self
 
     def parse(self, format: str = "oas3", **kwargs) -> _typing.JSON:
@@ -146,10 +334,255 @@ class Derek:
         else:
             raise NotImplementedError
 
-        result = parser(self, **kwargs)
-        result["example"] = self.example()
+        # (The example is made while parsing; see Parser.oas2)
+        result = parser(self, example=True, **kwargs)
         return {self.name or "untitled": result}
 
+    @classmethod
+    def infer_stream(
+        cls,
+        objs: Iterable[Any],
+        format: str = "oas3",
+        name: Optional[str] = None,
+        **kwargs,
+    ) -> _typing.JSON:
+        """
+        Convert a stream of values to a given format, as if they were the
+        elements of a list, without making a tree of Derek nodes.
+
+        The values are consumed one at a time, so :code:`objs` can be, for
+        example, a generator reading records from an NDJSON file that
+        doesn't fit in memory.
+
+        Parameters
+        ----------
+        objs
+            JSON-serializable values.
+        format
+            Output format.
+        name:
+            Name of the result.
+        kwargs
+            Keyword arguments to pass to :class:`derek.Accumulator`, such as
+            :code:`strategy`.
+
+        Returns
+        -------
+        j: :data:`derek._typing.JSON`
+            A JSON-serializable dictionary/list.
+
+            This is the same as the result of :meth:`parse` for a tree
+            made from :code:`list(objs)`.
+        """
+        format = format.lower()
+        if not hasattr(cls().parser, format + "_stream"):
+            raise NotImplementedError
+
+        # (The example is made in the same pass as the schema of the first
+        # value, without a tree)
+        return _parse.Accumulator(name=name, **kwargs).extend(objs).parse(format)
+
+    @classmethod
+    def infer_batch(
+        cls,
+        objs: Iterable[Any],
+        names: Optional[Iterable[str]] = None,
+        format: str = "oas3",
+        **kwargs,
+    ) -> _typing.JSON:
+        """
+        Convert each of many separate values to a given format, without
+        making trees of Derek nodes.
+
+        The parser is looked up once, and its caches are shared by the
+        whole batch, so this is much faster than calling :meth:`parse` for
+        a tree of each value. See :meth:`derek.Parser.oas2_batch`.
+
+        Parameters
+        ----------
+        objs
+            JSON-serializable values.
+        names:
+            Name of the result for each value, in the same order as
+            :code:`objs` (by default, the position of the value, from "0").
+        format
+            Output format.
+        kwargs
+            Keyword arguments to pass to the parser.
+
+        Returns
+        -------
+        j: :data:`derek._typing.JSON`
+            A JSON-serializable dictionary.
+
+            This is the same as merging the results of :meth:`parse` for a
+            tree made from each value, named by its name.
+        """
+        format = format.lower()
+        parser = cls().parser
+        if hasattr(parser, format + "_batch"):
+            parser = getattr(parser, format + "_batch")
+        else:
+            raise NotImplementedError
+
+        return parser(objs, names, example=True, **kwargs)
+
+    @classmethod
+    async def ainfer(
+        cls,
+        source: AsyncIterable[Any],
+        format: str = "oas3",
+        name: Optional[str] = None,
+        yield_every: int = 1000,
+        **kwargs,
+    ) -> _typing.JSON:
+        """
+        Convert records from an asynchronous source to a given format, as if
+        they were the elements of a list, consuming them as they arrive.
+
+        Parameters
+        ----------
+        source
+            Asynchronous iterable of records, such as an async generator, or
+            an :class:`asyncio.StreamReader` of NDJSON lines. (See
+            :func:`derek._parse._async.accumulate_async`.)
+        format
+            Output format.
+        name:
+            Name of the result.
+        yield_every:
+            Number of records to add between yielding to the event loop. At
+            least 1.
+        kwargs
+            Keyword arguments to pass to :class:`derek.Accumulator`, such as
+            :code:`strategy`.
+
+        Returns
+        -------
+        j: :data:`derek._typing.JSON`
+            A JSON-serializable dictionary/list.
+
+            This is the same as the result of :meth:`parse` for a tree
+            made from the list of records.
+
+        Raises
+        ------
+        ValueError
+            If :code:`yield_every` is less than 1.
+        """
+        format = format.lower()
+        if not hasattr(cls().parser, format + "_stream"):
+            raise NotImplementedError
+
+        # (Raises ValueError for yield_every < 1 before reading the source)
+        accumulator = await _parse.accumulate_async(
+            source, yield_every, name=name, **kwargs
+        )
+        return accumulator.parse(format)
+
+    @classmethod
+    def from_ndjson(
+        cls,
+        path: str,
+        format: str = "oas3",
+        name: Optional[str] = None,
+        workers: Optional[int] = None,
+        **kwargs,
+    ) -> _typing.JSON:
+        """
+        Convert the records in an NDJSON file (one JSON value per line) to a
+        given format, as if they were the elements of a list, without making
+        a tree of Derek nodes.
+
+        The file is memory-mapped and decoded one line at a time (see
+        :func:`derek._parse._ndjson.ndjson_accumulator`), so no process
+        holds all of the records.
+
+        Parameters
+        ----------
+        path
+            Path of the NDJSON file.
+        format
+            Output format.
+        name:
+            Name of the result.
+        workers:
+            If greater than 1, the file is split into chunks, which are
+            converted in a pool of this many worker processes.
+        kwargs
+            Keyword arguments to pass to
+            :func:`derek._parse._ndjson.ndjson_accumulator`, such as
+            :code:`strategy`.
+
+        Returns
+        -------
+        j: :data:`derek._typing.JSON`
+            A JSON-serializable dictionary/list.
+
+            This is the same as the result of :meth:`parse` for a tree
+            made from the list of records.
+        """
+        format = format.lower()
+        if not hasattr(cls().parser, format + "_stream"):
+            raise NotImplementedError
+
+        accumulator = _parse.ndjson_accumulator(
+            path, workers=workers, name=name, **kwargs
+        )
+        return accumulator.parse(format)
+
+    @classmethod
+    def from_json(
+        cls,
+        file: Union[str, IO],
+        format: str = "oas3",
+        name: Optional[str] = None,
+        bufsize: int = 65536,
+        **kwargs,
+    ) -> _typing.JSON:
+        """
+        Convert a JSON document in a file to a given format, reading it
+        incrementally, without loading it or making a tree of Derek nodes.
+
+        The document is read as a sequence of events (see
+        :func:`derek._parse._events.iter_events`), so documents much larger
+        than the available memory can be converted.
+
+        Parameters
+        ----------
+        file
+            Path of the file, or file object (opened in text or binary mode).
+        format
+            Output format.
+        name:
+            Name of the result.
+        bufsize:
+            Number of characters (or bytes) to read at a time.
+        kwargs
+            Keyword arguments to pass to the parser.
+
+        Returns
+        -------
+        j: :data:`derek._typing.JSON`
+            A JSON-serializable dictionary/list.
+
+            This is the same as the result of :meth:`parse` for a tree
+            made from the decoded document.
+        """
+        format = format.lower()
+        parser = cls().parser
+        if hasattr(parser, format + "_events"):
+            parser = getattr(parser, format + "_events")
+        else:
+            raise NotImplementedError
+
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "rb") as f:
+                result = parser(_parse.iter_events(f, bufsize), example=True, **kwargs)
+        else:
+            result = parser(_parse.iter_events(file, bufsize), example=True, **kwargs)
+        return {name or "untitled": result}
+
     def example(self) -> _typing.JSON:
         """
         Generate example JSON-serializable dictionary from self.
@@ -168,9 +601,11 @@ class Derek:
         if isinstance(self.value, list):
             if self.value == []:
                 result = []
+            elif isinstance(self.children, _ScalarChildren):
+                # (Without making the child nodes)
+                result = [dcp(self.value[0])]
             else:
                 c = self.children[0]
-                v = c.example()
                 result = [c if not isinstance(c, Derek) else c.example()]
         elif isinstance(self.value, dict):
             if self.value == {}:
@@ -181,6 +616,7 @@ class Derek:
                     for k, v in zip(self.value.keys(), self.children)
                 }
         else:
-            result = dcp(self.value)
+            # (Buffers, like array.array, are sliced rather than copied)
+            result = _example(self.value)
 
         return result
@@ -0,0 +1,50 @@
+from copy import deepcopy as dcp
+from typing import Any
+
+from . import _buffer, _typing
+
+_IMMUTABLE_TYPES = {str, int, float, bool, type(None)}
+
+
+def example(obj: Any) -> _typing.JSON:
+    """
+    Generate an example from a JSON-serializable value, without making a
+    tree of Derek nodes.
+
+    Parameters
+    ----------
+    obj:
+        A JSON-serializable value.
+
+    Returns
+    -------
+    j: :data:`derek._typing.JSON`
+        Example. This is the same as the example for a tree made from
+        :code:`obj` (see :meth:`derek.Derek.example`).
+    """
+    # Each entry is (container, key, value), where the example of value is
+    # to be stored as container[key]
+    result = [None]
+    stack = [(result, 0, obj)]
+    while stack:
+        container, key, value = stack.pop()
+        if isinstance(value, list):
+            example = [None] if value else []
+            if value:
+                stack.append((example, 0, value[0]))
+        elif isinstance(value, dict):
+            example = dict.fromkeys(value)
+            stack.extend((example, k, v) for k, v in value.items())
+        elif type(value) in _IMMUTABLE_TYPES:
+            # (Shared rather than copied)
+            example = value
+        else:
+            layout = _buffer.layout(value)
+            if layout is not None and layout[0] is not None:
+                # (A slice of the buffer, rather than a copy)
+                example = _buffer.example(value, layout[1])
+            else:
+                example = dcp(value)
+        container[key] = example
+
+    return result[0]
@@ -0,0 +1,21 @@
+import gc
+from contextlib import contextmanager
+
+
+@contextmanager
+def paused_gc():
+    """
+    Pause the cyclic garbage collector within a :code:`with` block.
+
+    Making or walking a large tree makes many objects, so the collector would
+    otherwise repeatedly traverse the tree (which may be large) while it
+    grows, finding nothing to free. The collector is enabled again on
+    leaving the block, only if it was enabled on entering it.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
@@ -0,0 +1,192 @@
+import re
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+# Tokens of the supported subset of JSONPath
+_JSONPATH_TOKEN = re.compile(
+    r"""
+    \.(?P<name>[^.\[\]]+)
+    | \[(?P<index>[0-9]+)\]
+    | \[(?P<star>\*)\]
+    | \[\s*(?P<quote>["'])(?P<key>(?:\\.|(?!(?P=quote)).)*)(?P=quote)\s*\]
+    """,
+    re.VERBOSE,
+)
+_ESCAPE = re.compile(r"\\(.)")
+# List indices in JSON pointers (no leading zeros)
+_INDEX = re.compile(r"0|[1-9][0-9]*")
+
+
+def parse_path(path: str) -> Tuple[Optional[str], ...]:
+    """
+    Split a path into its segments.
+
+    Parameters
+    ----------
+    path:
+        Either a JSON pointer (RFC 6901), such as :code:`"/items/0/owner"`
+        (or :code:`""` for the root), or a JSONPath, such as
+        :code:`"$.items[0].owner"` or :code:`"$['items'][0]['owner']"`.
+
+        In both, a segment :code:`*` (or :code:`[*]`, in a JSONPath) is a
+        wildcard, matching every element of a list or value of a dictionary.
+        (For a key that is literally :code:`"*"`, use :code:`['*']` in a
+        JSONPath.)
+
+    Returns
+    -------
+    Tuple[Optional[str], ...]
+        Segments: keys of dictionaries and indices of lists, as strings, and
+        None for wildcards.
+
+    Raises
+    ------
+    ValueError
+        If the path is neither a JSON pointer nor a supported JSONPath.
+    """
+    if path == "" or path.startswith("/"):
+        return tuple(
+            None if segment == "*" else segment.replace("~1", "/").replace("~0", "~")
+            for segment in path.split("/")[1:]
+        )
+    elif not path.startswith("$"):
+        raise ValueError("Not a JSON pointer or JSONPath: {!r}".format(path))
+
+    segments = []
+    pos = 1
+    while pos < len(path):
+        match = _JSONPATH_TOKEN.match(path, pos)
+        if match is None:
+            raise ValueError("Unsupported JSONPath: {!r}".format(path))
+        name, index, star, _, key = match.group("name", "index", "star", "quote", "key")
+        if name is not None:
+            segments.append(None if name == "*" else name)
+        elif index is not None:
+            segments.append(str(int(index)))
+        elif star is not None:
+            segments.append(None)
+        else:
+            segments.append(_ESCAPE.sub(r"\1", key))
+        pos = match.end()
+    return tuple(segments)
+
+
+class PathIndex:
+    """
+    Index of the nodes of a tree, by path.
+
+    Nodes are looked up one segment of the path at a time: list elements by
+    position, and dictionary values through a table of the keys of each
+    dictionary, made the first time that a path goes through it. Looking up
+    a path therefore takes time proportional to its length (rather than to
+    the size of the tree), and only the dictionaries along the paths looked
+    up are indexed.
+
+    The index assumes that the tree isn't modified once made, and is only
+    used while the tree is alive. It doesn't reference the root node, so
+    storing it on the root doesn't make a reference cycle.
+
+    Parameters
+    ----------
+    expand:
+        Function returning :code:`(value, children)` for a node (see
+        :meth:`derek._parse._oas2._Engine.walk`), where :code:`children`
+        supports indexing.
+    by_id:
+        Whether to identify nodes by :code:`id` (for node objects), rather
+        than by value (for hashable node identifiers, like indices).
+    """
+
+    __slots__ = "expand", "by_id", "_keys"
+
+    def __init__(self, expand: Callable, by_id: bool = True):
+        self.expand = expand
+        self.by_id = by_id
+        # Node (or id) -> {key: child node}, for the dictionaries indexed so
+        # far
+        self._keys = {}
+
+    def get(self, root: Any, path: str) -> Any:
+        """
+        Get the node at a path.
+
+        Parameters
+        ----------
+        root:
+            Root node of the tree (the same for every call).
+        path:
+            JSON pointer or JSONPath, without wildcards. See
+            :func:`parse_path`.
+
+        Returns
+        -------
+        The node.
+
+        Raises
+        ------
+        KeyError
+            If there is no node at the path.
+        ValueError
+            If the path is not valid, or contains wildcards.
+        """
+        segments = parse_path(path)
+        if None in segments:
+            raise ValueError("Wildcard in path: {!r}".format(path))
+
+        node = root
+        for segment in segments:
+            node = self._child(node, segment)
+            if node is None:
+                raise KeyError(path)
+        return node
+
+    def find(self, root: Any, path: str) -> List[Any]:
+        """
+        Get the nodes matching a path.
+
+        Parameters
+        ----------
+        root:
+            Root node of the tree (the same for every call).
+        path:
+            JSON pointer or JSONPath, which may contain wildcards. See
+            :func:`parse_path`.
+
+        Returns
+        -------
+        List
+            The nodes matching the path, in order (empty if none).
+
+        Raises
+        ------
+        ValueError
+            If the path is not valid.
+        """
+        nodes = [root]
+        for segment in parse_path(path):
+            if segment is None:
+                nodes = [c for node in nodes for c in self.expand(node)[1] or ()]
+            else:
+                nodes = [self._child(node, segment) for node in nodes]
+                nodes = [node for node in nodes if node is not None]
+            if not nodes:
+                break
+        return nodes
+
+    def _child(self, node: Any, segment: Hashable) -> Any:
+        """
+        Get the child of a node for one segment of a path (None if none).
+        """
+        value, children = self.expand(node)
+        if not children:
+            return None
+        elif isinstance(value, list):
+            if not _INDEX.fullmatch(segment):
+                return None
+            i = int(segment)
+            return children[i] if i < len(children) else None
+
+        identity = id(node) if self.by_id else node
+        keys = self._keys.get(identity)
+        if keys is None:
+            keys = self._keys[identity] = dict(zip(value, children))
+        return keys.get(segment)
@@ -0,0 +1,125 @@
+from typing import List, Optional
+
+from ._derek import Derek
+from ._example import example as _example
+from ._parse._oas2 import _expand_value
+
+from . import _typing
+
+
+class LazyDerek(Derek):
+    """
+    A node in a data structure, whose child nodes are only made when
+    :code:`children` is first accessed.
+
+    Making a tree (see :meth:`LazyDerek.tree`) takes constant time, and
+    nodes are only made for the parts of the tree that are visited.
+    :meth:`example` and :meth:`parse` work from the values, so don't make
+    any nodes.
+
+    Parameters are the same as for :class:`derek.Derek`.
+    """
+
+    __slots__ = ("_children",)
+
+    @property
+    def children(self) -> Optional[List[_typing.DerekType]]:
+        """
+        Child nodes, made (and cached) on first access.
+
+        None if the value is neither a list nor a dictionary.
+        """
+        children = self._children
+        if children is None:
+            value = self.value
+            if isinstance(value, dict):
+                value = value.values()
+            elif not isinstance(value, list):
+                return None
+
+            new = type(self).__new__
+            children = []
+            append = children.append
+            for item in value:
+                child = new(type(self))
+                child.parent = self
+                child._children = None
+                child.value = item
+                child.name = None
+                append(child)
+
+            self._children = children
+        return children
+
+    @children.setter
+    def children(self, children: Optional[List[_typing.DerekType]]):
+        self._children = children
+
+    @classmethod
+    def tree(
+        cls,
+        obj: _typing.JSON,
+        parent: Optional[_typing.DerekType] = None,
+        name: Optional[str] = None,
+    ) -> "LazyDerek":
+        """
+        Create a lazy tree representation of :code:`obj`.
+
+        Only the root node is made. Child nodes are made when
+        :code:`children` is accessed.
+
+        Parameters
+        ----------
+        obj: :data:`derek._typing.JSON`
+            A JSON-serializable dictionary/list.
+        parent
+            Parent node of the returned LazyDerek instance.
+        name:
+            Name of the returned LazyDerek instance.
+
+        Returns
+        -------
+        Tree representation of :code:`obj`, as a LazyDerek instance.
+
+        :code:`obj` is identical (same :code:`id`) to `self.value`.
+        """
+        self = cls.__new__(cls)
+        self.parent = parent
+        self._children = None
+        self.value = obj
+        self.name = name
+        return self
+
+    def _expansion(self):
+        """
+        Get the root item and expand function for walking the tree (see
+        :meth:`derek._parse._oas2._Engine.walk`).
+
+        Child nodes that have already been made are used; below any node
+        whose child nodes have not been made, the values are walked
+        instead.
+        """
+
+        def expand(item):
+            if isinstance(item, LazyDerek):
+                children = item._children
+                if children is not None:
+                    return item.value, children
+                item = item.value
+            return _expand_value(item)
+
+        return self, expand
+
+    def example(self) -> _typing.JSON:
+        """
+        Generate example JSON-serializable dictionary from self.
+
+        The example yields the same schema as a tree created
+        with self.value.
+
+        Returns
+        -------
+        j: :data:`derek._typing.JSON`
+            Example, as a JSON-serializable dictionary.
+        """
+        return _example(self.value)
@@ -1,17 +1,24 @@
 import json
+from typing import Any, Iterable, Optional, Tuple
 
 from .. import _typing
 
 from ._oas2 import oas2 as _oas2
+from ._accumulate import oas2_stream as _oas2_stream
+from ._events import oas2_events as _oas2_events
+from ._batch import oas2_batch as _oas2_batch
 
 
 class Parser:
     __slots__ = tuple()
 
     oas2 = staticmethod(_oas2)
+    oas2_stream = staticmethod(_oas2_stream)
+    oas2_events = staticmethod(_oas2_events)
+    oas2_batch = staticmethod(_oas2_batch)
 
     @classmethod
-    def oas3(cls, node: _typing.DerekType, strategy: str = "permissive"):
+    def oas3(cls, node: _typing.DerekType, strategy: str = "permissive", **kwargs):
         """
         Convert a data structure, with :code:`node` as the root node,
         into OAS3 schema. (Alias for OAS2.)
@@ -22,6 +29,8 @@ class Parser:
             Root node of tree.
         strategy
             Strategy for producing the schema. See :meth:`Parser.oas2`.
+        kwargs
+            Keyword arguments to pass to :meth:`Parser.oas2`.
 
         Returns
         -------
@@ -29,4 +38,83 @@ class Parser:
             OAS2 schema, as JSON-serializable dictionary.
         """
 
-        return cls.oas2(node, strategy)
+        return cls.oas2(node, strategy, **kwargs)
+
+    @classmethod
+    def oas3_stream(cls, objs: Iterable[Any], strategy: str = "permissive", **kwargs):
+        """
+        Convert a stream of values into the OAS3 schema of a list containing
+        them. (Alias for OAS2.)
+
+        Parameters
+        ----------
+        objs
+            JSON-serializable values.
+        strategy
+            Strategy for producing the schema. See :meth:`Parser.oas2`.
+        kwargs
+            Keyword arguments to pass to :meth:`Parser.oas2_stream`.
+
+        Returns
+        -------
+        j: :data:`derek._typing.JSON`
+            OAS2 schema, as JSON-serializable dictionary.
+        """
+
+        return cls.oas2_stream(objs, strategy, **kwargs)
+
+    @classmethod
+    def oas3_events(
+        cls, events: Iterable[Tuple[str, Any]], strategy: str = "permissive", **kwargs
+    ):
+        """
+        Convert a JSON document, given as a sequence of events, into OAS3
+        schema. (Alias for OAS2.)
+
+        Parameters
+        ----------
+        events
+            Events, as yielded by :func:`derek._parse._events.iter_events`.
+        strategy
+            Strategy for producing the schema. See :meth:`Parser.oas2`.
+        kwargs
+            Keyword arguments to pass to :meth:`Parser.oas2_events`.
+
+        Returns
+        -------
+        j: :data:`derek._typing.JSON`
+            OAS2 schema, as JSON-serializable dictionary.
+        """
+
+        return cls.oas2_events(events, strategy, **kwargs)
+
+    @classmethod
+    def oas3_batch(
+        cls,
+        objs: Iterable[Any],
+        names: Optional[Iterable[str]] = None,
+        strategy: str = "permissive",
+        **kwargs
+    ):
+        """
+        Convert each of many separate values into OAS3 schema. (Alias for
+        OAS2.)
+
+        Parameters
+        ----------
+        objs
+            JSON-serializable values.
+        names
+            Name of the schema of each value. See :meth:`Parser.oas2_batch`.
+        strategy
+            Strategy for producing the schema. See :meth:`Parser.oas2`.
+        kwargs
+            Keyword arguments to pass to :meth:`Parser.oas2_batch`.
+
+        Returns
+        -------
+        Dict[str, :data:`derek._typing.JSON`]
+            Name -> OAS2 schema, as JSON-serializable dictionary.
+        """
+
+        return cls.oas2_batch(objs, names, strategy, **kwargs)
@@ -1 +1,8 @@
 from ._Parser import Parser
+from ._accumulate import Accumulator
+from ._ndjson import ndjson_accumulator
+from ._events import iter_events
+from ._async import accumulate_async
+from ._stats import PathStats
+from ._trace import Tracer
+from ._cache import SchemaCache, get_schema_cache, set_schema_cache
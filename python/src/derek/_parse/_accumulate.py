@@ -0,0 +1,265 @@
+from typing import Any, Iterable, Optional
+
+from .. import _typing
+from .._example import example as _example
+
+from ._oas2 import (
+    _Engine,
+    _expand_value,
+    _list_schema,
+    _copy_schema,
+    _new_leaf_schema,
+)
+
+
+class Accumulator:
+    """
+    Running OAS2 schema for the elements of a list, to which elements are
+    added one at a time.
+
+    The schema of each element is extracted (see :func:`derek.Parser.oas2`)
+    as it is added, then only its distinct subschemas are kept. The memory
+    used therefore depends on the size of the schema, not on the number of
+    elements added, and adding elements takes time proportional to the
+    number of elements added.
+
+    The schema is always the same as the schema of a list containing all of
+    the elements added, in order. For "inner_join", this includes the
+    properties that are required, i.e. that appear in every dictionary
+    added.
+
+    Accumulators can be merged (see :meth:`merge`), and pickled.
+
+    Parameters
+    ----------
+    strategy:
+        Schema extraction strategy. See :meth:`derek.Parser.oas2`.
+    memo_size:
+        Maximum number of distinct subtree shapes for which subschemas are
+        memoized. See :meth:`derek.Parser.oas2`.
+    name:
+        Name of the result of :meth:`parse`.
+
+    Attributes
+    ----------
+    count: int
+        Number of elements added.
+    """
+
+    __slots__ = (
+        "strategy",
+        "name",
+        "count",
+        "_example",
+        "_engine",
+        "_schemas",
+        "_seen",
+        "_shapes",
+    )
+
+    def __init__(
+        self,
+        strategy: str = "permissive",
+        memo_size: int = 4096,
+        name: Optional[str] = None,
+    ):
+        self.strategy = strategy
+        self.name = name
+        self.count = 0
+        # Example of the first element added
+        self._example = None
+        self._engine = _Engine(strategy, memo_size)
+        # Distinct schemas of the elements, in order of first appearance
+        self._schemas = []
+        # Fingerprints of self._schemas
+        self._seen = set()
+        # Recently seen element shapes (a shortcut for self._seen)
+        self._shapes = set()
+
+    def __getstate__(self):
+        # Shapes and fingerprints are only meaningful to this process's
+        # engine, so are rebuilt when unpickled
+        return (
+            self.strategy,
+            self._engine.memo_size,
+            self.name,
+            self.count,
+            self._example,
+            self._schemas,
+        )
+
+    def __setstate__(self, state):
+        strategy, memo_size, name, count, example, schemas = state
+        self.__init__(strategy, memo_size, name)
+        self.count = count
+        self._example = example
+        self._add_schemas(schemas)
+
+    def add(self, obj: Any) -> "Accumulator":
+        """
+        Add an element.
+
+        Parameters
+        ----------
+        obj:
+            A JSON-serializable value.
+
+        Returns
+        -------
+        Accumulator
+            self.
+        """
+        shape, schema, example = self._engine.walk(obj, _expand_value, self.count == 0)
+        if self.count == 0:
+            self._example = example
+        self.count += 1
+
+        shapes = self._shapes
+        if shape in shapes:
+            return self
+        if len(shapes) > self._engine.memo_size:
+            # (Shapes are not reused once dropped from the engine's memo)
+            shapes.clear()
+        shapes.add(shape)
+
+        self._add_schemas([schema])
+        return self
+
+    def extend(self, objs: Iterable[Any]) -> "Accumulator":
+        """
+        Add each element of an iterable, in order.
+
+        Parameters
+        ----------
+        objs:
+            JSON-serializable values.
+
+        Returns
+        -------
+        Accumulator
+            self.
+        """
+        add = self.add
+        for obj in objs:
+            add(obj)
+        return self
+
+    def merge(self, other: "Accumulator") -> "Accumulator":
+        """
+        Add the elements added to another accumulator, as if they had been
+        added to this accumulator, in order.
+
+        Parameters
+        ----------
+        other:
+            Accumulator, with the same strategy.
+
+        Returns
+        -------
+        Accumulator
+            self.
+        """
+        if other.strategy != self.strategy:
+            raise ValueError(
+                "Cannot merge accumulators with strategies {!r} and {!r}".format(
+                    self.strategy, other.strategy
+                )
+            )
+
+        if self.count == 0:
+            self._example = other._example
+        self.count += other.count
+        self._add_schemas(other._schemas)
+        return self
+
+    def _add_schemas(self, schemas):
+        """
+        Add schemas of elements, skipping any already present.
+        """
+        fingerprint = self._engine.fingerprint
+        seen = self._seen
+        for schema in schemas:
+            f = fingerprint(schema)
+            if f not in seen:
+                seen.add(f)
+                self._schemas.append(schema)
+
+    def schema(self) -> _typing.JSON:
+        """
+        Get the schema of a list containing all of the elements added.
+
+        Returns
+        -------
+        j: :data:`derek._typing.JSON`
+            OAS2 schema, as JSON-serializable dictionary.
+        """
+        if not self._schemas:
+            return _new_leaf_schema("array")
+
+        schema = _list_schema(self._schemas, self.strategy, self._engine.fingerprint)
+        return _copy_schema(schema)
+
+    def example(self) -> _typing.JSON:
+        """
+        Generate an example of a list containing all of the elements added.
+
+        Returns
+        -------
+        j: :data:`derek._typing.JSON`
+            Example, as a JSON-serializable list. This is the same as the
+            example for a tree made from the list.
+        """
+        # (Copied, as the example of an example is itself)
+        return [] if self.count == 0 else [_example(self._example)]
+
+    def parse(self, format: str = "oas3") -> _typing.JSON:
+        """
+        Convert the list containing all of the elements added to a given
+        format.
+
+        Parameters
+        ----------
+        format
+            Output format. Must be "oas2" or "oas3".
+
+        Returns
+        -------
+        j: :data:`derek._typing.JSON`
+            A JSON-serializable dictionary/list. This is the same as the
+            result of :meth:`derek.Derek.parse` for a tree made from the list.
+        """
+        if format.lower() not in ("oas2", "oas3"):
+            raise NotImplementedError
+
+        result = self.schema()
+        result["example"] = self.example()
+        return {self.name or "untitled": result}
+
+
+def oas2_stream(objs: Iterable[Any], strategy: str = "permissive", **kwargs):
+    """
+    Convert a stream of values into the OAS2 schema of a list containing
+    them, without making Derek nodes.
+
+    The values are consumed one at a time (see :class:`Accumulator`), so
+    :code:`objs` can be, for example, a generator reading records from an
+    NDJSON file that doesn't fit in memory.
+
+    Parameters
+    ----------
+    objs:
+        JSON-serializable values.
+    strategy:
+        Schema extraction strategy. See :meth:`derek.Parser.oas2`.
+    kwargs:
+        Keyword arguments to pass to :class:`Accumulator`.
+
+    Returns
+    -------
+    j: :data:`derek._typing.JSON`
+        OAS2 schema, as JSON-serializable dictionary. This is the same as the
+        schema for a tree made from :code:`list(objs)`.
+    """
+    accumulator = Accumulator(strategy, **kwargs)
+    accumulator.extend(objs)
+    return accumulator.schema()
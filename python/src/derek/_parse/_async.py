@@ -0,0 +1,59 @@
+import asyncio
+import json
+from typing import Any, AsyncIterable
+
+from ._accumulate import Accumulator
+
+
+async def accumulate_async(
+    source: AsyncIterable[Any], yield_every: int = 1000, **kwargs
+) -> Accumulator:
+    """
+    Add records from an asynchronous source to an :class:`Accumulator`, as
+    they arrive.
+
+    Parameters
+    ----------
+    source:
+        Asynchronous iterable of records, such as an async generator, or an
+        :class:`asyncio.StreamReader`. Records that are :code:`bytes` (such
+        as lines read from a stream) are decoded as JSON, and blank ones are
+        skipped.
+    yield_every:
+        Number of records to add between yielding to the event loop, so
+        that other tasks can run while a batch of records that have already
+        arrived is added. At least 1.
+    kwargs:
+        Keyword arguments to pass to :class:`Accumulator`.
+
+    Returns
+    -------
+    Accumulator
+        Accumulator, to which the records have been added in order.
+
+    Raises
+    ------
+    ValueError
+        If :code:`yield_every` is less than 1.
+    """
+    if yield_every < 1:
+        raise ValueError("yield_every must be at least 1, got {}".format(yield_every))
+
+    accumulator = Accumulator(**kwargs)
+    add = accumulator.add
+    loads = json.loads
+
+    n = 0
+    async for record in source:
+        if isinstance(record, (bytes, bytearray)):
+            if not record.strip():
+                continue
+            record = loads(record)
+        add(record)
+
+        n += 1
+        if n == yield_every:
+            n = 0
+            await asyncio.sleep(0)
+
+    return accumulator
@@ -0,0 +1,77 @@
+from typing import Any, Dict, Iterable, Optional
+
+from .. import _typing
+from .._gc import paused_gc
+
+from ._oas2 import _Engine, _copy_schema, _expand_value
+
+
+def oas2_batch(
+    objs: Iterable[Any],
+    names: Optional[Iterable[str]] = None,
+    strategy: str = "permissive",
+    memo_size: int = 4096,
+    example: bool = False,
+) -> Dict[str, _typing.JSON]:
+    """
+    Convert each of many separate values into OAS2 schema, without making
+    trees of Derek nodes.
+
+    One engine (see :class:`derek._parse._oas2._Engine`) is used for the
+    whole batch, so the subschemas memoized for one value, and the
+    fingerprints used to remove duplicate subschemas, are reused for every
+    later value: a value with the same shape as an earlier one only costs a
+    walk over its nodes and a copy of the schema. The cyclic garbage
+    collector is paused once for the batch, rather than once per value.
+
+    Parameters
+    ----------
+    objs:
+        JSON-serializable values.
+    names:
+        Name of the schema of each value, in the same order as
+        :code:`objs`. If not specified, the schemas are named by the
+        position of their values, from "0".
+    strategy:
+        Schema extraction strategy. See :meth:`derek.Parser.oas2`.
+    memo_size:
+        Maximum number of distinct subtree shapes for which subschemas are
+        memoized. See :meth:`derek.Parser.oas2`.
+    example:
+        If True, add an example of each value to its schema, as "example".
+        See :meth:`derek.Parser.oas2`.
+
+    Returns
+    -------
+    Dict[str, :data:`derek._typing.JSON`]
+        Name -> OAS2 schema, as JSON-serializable dictionary, in the order
+        of :code:`objs`. Each schema is the same as the schema for a tree
+        made from its value, and shares no dictionaries or lists with the
+        others.
+
+    Raises
+    ------
+    ValueError
+        If the names are not unique, or there are more or fewer names than
+        values.
+    """
+    engine = _Engine(strategy, memo_size)
+    walk = engine.walk
+    objs = list(objs)
+    names = [str(i) for i in range(len(objs))] if names is None else list(names)
+    if len(names) != len(objs):
+        raise ValueError("Expected {} names, got {}".format(len(objs), len(names)))
+
+    schemas = {}
+    with paused_gc():
+        for name, obj in zip(names, objs):
+            if name in schemas:
+                raise ValueError("Duplicate name: {!r}".format(name))
+
+            _, schema, example_ = walk(obj, _expand_value, example)
+            # The schema may be memoized, and shared with other schemas in
+            # the batch, so is copied whole
+            schema = schemas[name] = _copy_schema(schema)
+            if example:
+                schema["example"] = example_
+    return schemas
@@ -0,0 +1,221 @@
+import hashlib
+import io
+import pickle
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional
+
+
+class _NotPlain(Exception):
+    """
+    Raised on meeting a value that :meth:`SchemaCache.key` doesn't accept.
+    """
+
+
+class _Rejecting(dict):
+    """
+    Pickler dispatch table with no reductions, so that pickling stops at the
+    first value of a type that the pickler doesn't encode itself. (The
+    pickler only looks in the table for such values, so exact JSON types are
+    encoded without calling into Python.)
+    """
+
+    __slots__ = ()
+
+    def __missing__(self, cls):
+        raise _NotPlain(cls)
+
+    def get(self, cls, default=None):
+        # (As used by the pure-Python pickler)
+        raise _NotPlain(cls)
+
+
+_REJECTING = _Rejecting()
+
+
+class SchemaCache:
+    """
+    Least recently used cache of schemas, keyed by the content of the data
+    structures they were extracted from, shared between calls.
+
+    Once set as the process-wide cache (see :func:`set_schema_cache`),
+    :meth:`derek.Parser.oas2` (and so :meth:`derek.Derek.parse`) looks up
+    the schema of a data structure in the cache before doing any work, and
+    adds it afterwards. Repeatedly parsing identical data structures (for
+    example, polling an API that returns the same response) then only costs
+    encoding the data structure, hashing it and copying the schema: many
+    times less than extracting the schema again.
+
+    A data structure is identified by a hash of its encoding as a pickle,
+    made in a single pass in C, which keeps the type of every value and key
+    apart: for example, :code:`{1: [1]}` and :code:`{"1": [1]}`, or
+    :code:`(1, 2)` and :code:`[1, 2]`. The data structure of a tree is
+    assumed to be the value of its root node (as it is for trees made by
+    :meth:`derek.Derek.tree`).
+
+    Only values of the types that the pickler encodes itself (exact
+    :code:`dict`, :code:`list`, :code:`str`, :code:`int`, :code:`float`,
+    :code:`bool` and None, as well as tuples, sets and bytes, which are
+    encoded as such) are accepted. The encoding stops at the first value of
+    any other type, including subclasses and buffers such as
+    :code:`array.array`, and the data structure isn't cached, nor is one
+    that contains itself or is nested too deeply to be encoded.
+
+    The cache can be used from several threads at once.
+
+    Parameters
+    ----------
+    maxsize:
+        Maximum number of schemas to keep. The least recently used schema is
+        dropped when the limit is exceeded.
+
+    Attributes
+    ----------
+    hits: int
+        Number of schemas found in the cache.
+    misses: int
+        Number of schemas not found in the cache (including those of data
+        structures that can't be cached).
+    """
+
+    __slots__ = "maxsize", "hits", "misses", "_schemas", "_lock"
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._schemas = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._schemas)
+
+    @staticmethod
+    def key(value: Any, *options: Hashable) -> Optional[Hashable]:
+        """
+        Get the key of a data structure.
+
+        Parameters
+        ----------
+        value:
+            A JSON-serializable value.
+        options:
+            Any other arguments that the schema depends on.
+
+        Returns
+        -------
+        Optional[Hashable]
+            Key, or None if :code:`value` can't be cached.
+        """
+        encoded = io.BytesIO()
+        pickler = pickle.Pickler(encoded, 4)
+        pickler.dispatch_table = _REJECTING
+        # (Without a memo, so that the key doesn't depend on which equal
+        # values are the same object, and so that values containing
+        # themselves are rejected)
+        pickler.fast = True
+        try:
+            pickler.dump(value)
+        except (_NotPlain, pickle.PicklingError, TypeError, ValueError, RecursionError):
+            return None
+        digest = hashlib.blake2b(encoded.getbuffer(), digest_size=16).digest()
+        return options + (digest,)
+
+    def get(self, key: Optional[Hashable]) -> Optional[Dict]:
+        """
+        Get the schema for a key, counting a hit or a miss.
+
+        Parameters
+        ----------
+        key:
+            Key, as returned by :meth:`key`.
+
+        Returns
+        -------
+        Optional[Dict]
+            Schema (which must not be modified), or None if not found.
+        """
+        with self._lock:
+            schema = None if key is None else self._schemas.get(key)
+            if schema is None:
+                self.misses += 1
+            else:
+                self._schemas.move_to_end(key)
+                self.hits += 1
+            return schema
+
+    def put(self, key: Optional[Hashable], schema: Dict):
+        """
+        Add the schema for a key (unless the key is None).
+
+        Parameters
+        ----------
+        key:
+            Key, as returned by :meth:`key`.
+        schema:
+            Schema, which must not be modified afterwards.
+        """
+        if key is None:
+            return
+        with self._lock:
+            schemas = self._schemas
+            schemas[key] = schema
+            schemas.move_to_end(key)
+            if len(schemas) > self.maxsize:
+                schemas.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove every schema, and reset the counts of hits and misses.
+        """
+        with self._lock:
+            self._schemas.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        """
+        Summarize the use of the cache.
+
+        Returns
+        -------
+        Dict[str, int]
+            Dictionary with "hits", "misses", "size" (the number of schemas
+            kept) and "maxsize".
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._schemas),
+            "maxsize": self.maxsize,
+        }
+
+
+# The process-wide cache, if any
+_cache = None
+
+
+def set_schema_cache(cache: Optional[SchemaCache]) -> Optional[SchemaCache]:
+    """
+    Set the process-wide schema cache, used by :meth:`derek.Parser.oas2`.
+
+    Parameters
+    ----------
+    cache:
+        The cache, or None to stop caching schemas (the default).
+
+    Returns
+    -------
+    Optional[SchemaCache]
+        The previous process-wide cache, if any.
+    """
+    global _cache
+    previous, _cache = _cache, cache
+    return previous
+
+
+def get_schema_cache() -> Optional[SchemaCache]:
+    """
+    Get the process-wide schema cache, if any. See :func:`set_schema_cache`.
+    """
+    return _cache
@@ -0,0 +1,367 @@
+import codecs
+import json
+import re
+from json.decoder import JSONDecodeError, scanstring
+from typing import IO, Any, Iterable, Iterator, Tuple
+
+from .. import _typing
+
+from ._oas2 import _Engine, _new_leaf_schema, _unshare
+
+# Event names for scalar values, keyed by the exact type of the value.
+_SCALAR_EVENTS = {
+    str: "string",
+    float: "number",
+    bool: "boolean",
+    int: "integer",
+    type(None): "null",
+}
+
+# Kinds of leaf for scalar events (see derek._parse._oas2._leaf_kind).
+# ("null" has no kind, as None is not supported.)
+_EVENT_KINDS = {
+    "string": "string",
+    "number": "number",
+    "boolean": "boolean",
+    "integer": "integer",
+}
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters that may be part of a number, true, false, null, NaN, Infinity
+_BARE = re.compile(r"[-+.0-9A-Za-z]*")
+
+# What the tokenizer expects next
+_VALUE, _ARRAY_FIRST, _MAP_FIRST, _KEY, _COLON, _NEXT, _DONE = range(7)
+
+
+def iter_events(file: IO, bufsize: int = 65536) -> Iterator[Tuple[str, Any]]:
+    """
+    Read a JSON document incrementally, as a sequence of events.
+
+    The document is read :code:`bufsize` characters (or bytes) at a time,
+    so it is never held in memory as a whole, and no lists or dictionaries
+    are made.
+
+    Parameters
+    ----------
+    file:
+        File object containing one JSON document, opened in text or binary
+        mode. (Binary files are decoded as UTF-8.)
+    bufsize:
+        Number of characters (or bytes) to read at a time. (While a key or
+        scalar doesn't fit in what has been read, as much again as is kept is
+        read at a time instead, so that it is only scanned a few times.)
+
+    Yields
+    ------
+    Tuple[str, Any]
+        Pairs of :code:`(event, value)`. The events are:
+
+        * "start_map", "end_map", "start_array", "end_array", with value
+          None.
+        * "map_key", with the key as value.
+        * "string", "integer", "number", "boolean" or "null", with the
+          scalar as value (as it would be decoded by :func:`json.load`).
+
+    Raises
+    ------
+    json.JSONDecodeError
+        If the document is not valid JSON.
+    """
+    read = file.read
+    decode = None
+
+    def more(size=bufsize):
+        """
+        Read at least :code:`bufsize` more characters (or bytes) of the
+        document, returning the text and whether the end of the file has
+        been reached.
+        """
+        data = read(max(size, bufsize))
+        if decode is not None:
+            return decode(data, not data), not data
+        return data, not data
+
+    data = read(bufsize)
+    if isinstance(data, bytes):
+        decode = codecs.getincrementaldecoder("utf-8-sig")().decode
+        data = decode(data, not data)
+    eof = not data
+
+    scan_once = json.JSONDecoder().scan_once
+    whitespace = _WHITESPACE.match
+    bare = _BARE.match
+    scalar_events = _SCALAR_EVENTS
+
+    buf = data
+    pos = 0
+    # For each open container, True for a dictionary, False for a list
+    stack = []
+    state = _VALUE
+    while True:
+        if pos < len(buf) and buf[pos] in " \t\n\r":
+            pos = whitespace(buf, pos).end()
+        if pos == len(buf):
+            if not eof:
+                data, eof = more()
+                buf = buf[pos:] + data
+                pos = 0
+                continue
+            elif state == _DONE:
+                return
+            raise JSONDecodeError("Unexpected end of data", buf, pos)
+
+        c = buf[pos]
+        if state == _NEXT:
+            if c == ",":
+                state = _KEY if stack[-1] else _VALUE
+                pos += 1
+                continue
+            elif c == ("}" if stack[-1] else "]"):
+                yield ("end_map" if stack.pop() else "end_array"), None
+                state = _NEXT if stack else _DONE
+                pos += 1
+                continue
+            raise JSONDecodeError("Expecting ',' delimiter", buf, pos)
+
+        if state == _COLON:
+            if c != ":":
+                raise JSONDecodeError("Expecting ':' delimiter", buf, pos)
+            state = _VALUE
+            pos += 1
+            continue
+
+        if state == _DONE:
+            raise JSONDecodeError("Extra data", buf, pos)
+
+        if (state == _ARRAY_FIRST and c == "]") or (state == _MAP_FIRST and c == "}"):
+            yield ("end_map" if stack.pop() else "end_array"), None
+            state = _NEXT if stack else _DONE
+            pos += 1
+            continue
+
+        if state == _KEY or state == _MAP_FIRST:
+            if c != '"':
+                raise JSONDecodeError(
+                    "Expecting property name enclosed in double quotes", buf, pos
+                )
+            try:
+                key, end = scanstring(buf, pos + 1)
+            except JSONDecodeError:
+                if eof:
+                    raise
+                # (Incomplete, so read more: as much again as what is
+                # kept, so that a long key is only scanned a few times)
+                data, eof = more(len(buf) - pos)
+                buf = buf[pos:] + data
+                pos = 0
+                continue
+            yield "map_key", key
+            state = _COLON
+            pos = end
+            continue
+
+        # A value
+        if c == "{":
+            yield "start_map", None
+            stack.append(True)
+            state = _MAP_FIRST
+            pos += 1
+        elif c == "[":
+            yield "start_array", None
+            stack.append(False)
+            state = _ARRAY_FIRST
+            pos += 1
+        else:
+            if not eof and c != '"' and bare(buf, pos).end() == len(buf):
+                # (Scalars other than strings must be followed by another
+                # character, to be sure that they are complete)
+                data, eof = more(len(buf) - pos)
+                buf = buf[pos:] + data
+                pos = 0
+                continue
+            try:
+                value, end = scan_once(buf, pos)
+            except (StopIteration, JSONDecodeError):
+                if eof or c != '"':
+                    raise JSONDecodeError("Expecting value", buf, pos) from None
+                # (Incomplete string, so read more, as for a key)
+                data, eof = more(len(buf) - pos)
+                buf = buf[pos:] + data
+                pos = 0
+                continue
+            yield scalar_events[type(value)], value
+            state = _NEXT if stack else _DONE
+            pos = end
+
+
+def oas2_events(
+    events: Iterable[Tuple[str, Any]],
+    strategy: str = "permissive",
+    memo_size: int = 4096,
+    example: bool = False,
+) -> _typing.JSON:
+    """
+    Convert a JSON document, given as a sequence of events, into OAS2
+    schema, without making the lists and dictionaries in the document, or
+    Derek nodes.
+
+    Parameters
+    ----------
+    events:
+        Events, as yielded by :func:`iter_events`.
+    strategy:
+        Schema extraction strategy. See :meth:`derek.Parser.oas2`.
+    memo_size:
+        Maximum number of distinct subtree shapes for which subschemas are
+        memoized. See :meth:`derek.Parser.oas2`.
+    example:
+        If True, add an example of the document to the schema, as
+        "example". Only the values in the example are kept.
+
+    Returns
+    -------
+    j: :data:`derek._typing.JSON`
+        OAS2 schema, as JSON-serializable dictionary. This is the same as the
+        schema for a tree made from the decoded document.
+    """
+    engine = _Engine(strategy, memo_size)
+    _, schema, example_ = _walk_events(engine, events, example)
+    if engine.reused:
+        schema = _unshare(schema)
+    if example:
+        schema["example"] = example_
+    return schema
+
+
+class _Frame:
+    """
+    A list or dictionary whose events are being read.
+    """
+
+    __slots__ = (
+        "keys",
+        "key_indices",
+        "key",
+        "shapes",
+        "subschemas",
+        "seen",
+        "examples",
+    )
+
+    def __init__(self, is_map, examples):
+        # Keys, in order, and the index of each key (for dictionaries)
+        self.keys = [] if is_map else None
+        self.key_indices = {} if is_map else None
+        # Key of the value being read
+        self.key = None
+        self.shapes = []
+        self.subschemas = []
+        # Shapes seen (for lists; a dictionary's values are only known once
+        # it ends, as a repeated key replaces the earlier value)
+        self.seen = None if is_map else set()
+        # Example being made (None if not needed)
+        self.examples = examples
+
+
+def _walk_events(engine, events, example=False):
+    """
+    Get the shape, schema and example (None if :code:`example` is False) of
+    a JSON document given as a sequence of events, like
+    :meth:`derek._parse._oas2._Engine.walk`.
+    """
+    permissive = engine.strategy == "permissive"
+    combine = engine.combine
+    event_kinds = _EVENT_KINDS
+
+    stack = []
+    for event, value in events:
+        frame = stack[-1] if stack else None
+
+        if event == "map_key":
+            frame.key = value
+            continue
+
+        if frame is None:
+            wanted = example
+        elif frame.keys is None:
+            # (Only the first element of a list is in the example)
+            wanted = frame.examples is not None and not frame.examples
+        else:
+            wanted = frame.examples is not None
+
+        if event == "start_map":
+            stack.append(_Frame(True, {} if wanted else None))
+            continue
+        elif event == "start_array":
+            stack.append(_Frame(False, [] if wanted else None))
+            continue
+        elif event == "end_map" or event == "end_array":
+            stack.pop()
+            child = frame
+            child_example = child.examples
+            if not child.shapes:
+                shape = "object" if child.keys is not None else "array"
+                schema = None
+            else:
+                shapes, subschemas = child.shapes, child.subschemas
+                if child.keys is not None and permissive:
+                    # The schema only depends on the distinct subschemas
+                    shapes, subschemas = _distinct(shapes, subschemas)
+                shape, schema = combine(child.keys, shapes, subschemas)
+
+            frame = stack[-1] if stack else None
+            wanted = child_example is not None
+        else:
+            shape = event_kinds.get(event)
+            if shape is None:
+                raise NotImplementedError
+            schema = None
+            child_example = value if wanted else None
+
+        if frame is None:
+            if schema is None:
+                schema = _new_leaf_schema(shape)
+            return shape, schema, child_example if example else None
+
+        # Add the child to the list or dictionary
+        if frame.keys is None:
+            if shape not in frame.seen:
+                frame.seen.add(shape)
+                frame.shapes.append(shape)
+                frame.subschemas.append(schema)
+            if wanted:
+                frame.examples.append(child_example)
+        else:
+            key = frame.key
+            index = frame.key_indices.get(key)
+            if index is None:
+                frame.key_indices[key] = len(frame.keys)
+                frame.keys.append(key)
+                frame.shapes.append(shape)
+                frame.subschemas.append(schema)
+            else:
+                # (Like json.load, the last value is kept, in the place of
+                # the first)
+                frame.shapes[index] = shape
+                frame.subschemas[index] = schema
+            if wanted:
+                frame.examples[key] = child_example
+
+    raise ValueError("Incomplete sequence of events")
+
+
+def _distinct(shapes, subschemas):
+    """
+    Get the distinct shapes, in order of first appearance, and their
+    subschemas.
+    """
+    seen = set()
+    distinct_shapes = []
+    distinct_subschemas = []
+    for shape, schema in zip(shapes, subschemas):
+        if shape not in seen:
+            seen.add(shape)
+            distinct_shapes.append(shape)
+            distinct_subschemas.append(schema)
+    return distinct_shapes, distinct_subschemas
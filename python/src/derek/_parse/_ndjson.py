@@ -0,0 +1,122 @@
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterator, List, Optional, Tuple
+
+from ._accumulate import Accumulator
+
+
+def ndjson_accumulator(
+    path: str, workers: Optional[int] = None, chunksize: Optional[int] = None, **kwargs
+) -> Accumulator:
+    """
+    Add the records in an NDJSON file (one JSON value per line) to an
+    :class:`Accumulator`.
+
+    The file is memory-mapped, rather than read, and the records are decoded
+    one line at a time, so only one record is held in memory at a time by
+    each process.
+
+    Parameters
+    ----------
+    path:
+        Path of the NDJSON file. Blank lines are skipped.
+    workers:
+        If greater than 1, the file is split into chunks at line boundaries,
+        and the records in each chunk are added to an accumulator in a pool
+        of this many worker processes. The accumulators are merged in order,
+        so the result is the same as when the file is read in this process.
+    chunksize:
+        Approximate size, in bytes, of each chunk. If not specified, the file
+        is split into four chunks per worker.
+    kwargs:
+        Keyword arguments to pass to :class:`Accumulator`.
+
+    Returns
+    -------
+    Accumulator
+        Accumulator, to which the records have been added in order.
+    """
+    accumulator = Accumulator(**kwargs)
+
+    if not workers or workers <= 1:
+        return accumulator.extend(_records(path, 0, None))
+
+    size = os.path.getsize(path)
+    if chunksize is None:
+        chunksize = -(-size // (4 * workers))
+    chunks = _split(path, size, max(1, chunksize))
+
+    # (The strategy etc. of the accumulator made by each worker)
+    options = {
+        "strategy": accumulator.strategy,
+        "memo_size": accumulator._engine.memo_size,
+    }
+    with ProcessPoolExecutor(workers) as executor:
+        for partial in executor.map(_accumulate, repeat(path), chunks, repeat(options)):
+            accumulator.merge(partial)
+    return accumulator
+
+
+def _split(path: str, size: int, chunksize: int) -> List[Tuple[int, int]]:
+    """
+    Split a file into chunks of roughly :code:`chunksize` bytes, ending at
+    line boundaries.
+
+    Returns
+    -------
+    List[Tuple[int, int]]
+        Start (inclusive) and end (exclusive) offset of each chunk.
+    """
+    if size == 0:
+        return []
+
+    bounds = [0]
+    with open(path, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        while True:
+            # End the chunk after the first newline at or after the target
+            end = data.find(b"\n", bounds[-1] + chunksize - 1)
+            if end == -1 or end + 1 >= size:
+                break
+            bounds.append(end + 1)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _records(path: str, start: int, end: Optional[int]) -> Iterator:
+    """
+    Decode the records in the lines of a file between two offsets.
+
+    :code:`start` must be the start of a line, and :code:`end` (if not
+    None) the end of a line.
+    """
+    if os.path.getsize(path) == 0:
+        # (Empty files can't be memory-mapped)
+        return
+
+    with open(path, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        if end is None:
+            end = len(data)
+
+        data.seek(start)
+        readline = data.readline
+        loads = json.loads
+        while data.tell() < end:
+            line = readline()
+            if line.strip():
+                yield loads(line)
+
+
+def _accumulate(path, chunk, options):
+    """
+    Add the records in a chunk of a file to a new accumulator (in a worker
+    process).
+    """
+    start, end = chunk
+    return Accumulator(**options).extend(_records(path, start, end))
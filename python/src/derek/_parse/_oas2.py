@@ -1,9 +1,26 @@
-import json
-
-from .. import _typing
-
-
-def oas2(node: _typing.DerekType, strategy: str = "permissive"):
+from collections import Counter, OrderedDict
+from itertools import count
+from time import perf_counter
+from typing import Optional
+
+from .. import _buffer, _typing
+from .._example import example as _example
+from .._gc import paused_gc
+
+from ._cache import get_schema_cache
+from ._stats import KINDS, PathStats
+from ._trace import Tracer
+
+
+def oas2(
+    node: _typing.DerekType,
+    strategy: str = "permissive",
+    memo_size: int = 4096,
+    workers: Optional[int] = None,
+    example: bool = False,
+    stats: Optional[PathStats] = None,
+    tracer: Optional[Tracer] = None,
+):
     """
     Convert a data structure, with :code:`node` as the root node,
     into OAS2 schema.
@@ -15,7 +32,8 @@ def oas2(node: _typing.DerekType, strategy: str = "permissive"):
     strategy: str
         Schema extraction strategy.
 
-        Must be one of "permissive" (default), "restricted", or "inner_join".
+        Must be one of "permissive" (default), "restricted", "inner_join" or
+        "deep_join".
 
         * "permissive" considers each dictionary in the data structure to have
           optional key-value pairs. Key names can be freely chosen. For each
@@ -26,7 +44,38 @@ def oas2(node: _typing.DerekType, strategy: str = "permissive"):
           the values specified in :code:`node.value`.
         * "inner_join" extends "restricted", combining subschemas together for
           each element in lists in the data structure.
-
+        * "deep_join" extends "inner_join", combining the subschemas of the
+          elements of lists at every depth (see :func:`_deep_merge`), so that
+          there is at most one object and one array subschema in each
+          "oneOf". The keys of each dictionary are required.
+    memo_size: int
+        Maximum number of distinct subtree shapes for which subschemas are
+        memoized while parsing. See :class:`_Engine`.
+    workers: int
+        If greater than 1, and :code:`node.value` is a list, the schemas of
+        its elements are extracted in a pool of this many worker processes
+        (see :func:`derek._parse._parallel.oas2_parallel`). The schema is the
+        same as when extracted in this process.
+    example: bool
+        If True, add an example of the data structure to the schema, as
+        "example", made in the same pass as the schema. This is the same as
+        :code:`node.example()` (see :meth:`derek.Derek.example`), except that
+        scalar values are shared with the data structure rather than copied.
+    stats: PathStats
+        If specified, statistics for each path in the data structure are
+        added to it, in the same pass as the schema (see
+        :class:`derek._parse.PathStats`). The schema is extracted in this
+        process, even if :code:`workers` is specified.
+    tracer: Tracer
+        If specified, timings of each phase of the extraction, counts of the
+        nodes of each kind and the sizes of the lists of subschemas are
+        passed to it (see :class:`derek._parse.Tracer`). If not specified,
+        nothing is measured.
+
+    If a process-wide :class:`derek._parse.SchemaCache` is set (see
+    :func:`derek._parse.set_schema_cache`), and :code:`stats` isn't
+    specified, the schema is looked up in it first, by the content of
+    :code:`node.value`, the strategy and :code:`example`.
 
     Examples
     --------
@@ -96,41 +145,746 @@ def oas2(node: _typing.DerekType, strategy: str = "permissive"):
     j: :data:`derek._typing.JSON`
         OAS2 schema, as JSON-serializable dictionary.
     """
-    if node.value == []:
-        j = {"type": "array", "items": {}, "maxItems": 0}
-    elif node.value == {}:
-        j = {"type": "object", "properties": {}}
-    elif isinstance(node.value, str):
-        j = {"type": "string"}
-    elif isinstance(node.value, float):
-        j = {"type": "number"}
-    elif isinstance(node.value, bool):
-        j = {"type": "boolean"}
-    elif isinstance(node.value, int):
-        j = {"type": "integer"}
-    elif isinstance(node.value, list):
-        j = _oas2_list(node, strategy)
-    elif isinstance(node.value, dict):
-        j = _oas2_dict(node, strategy)
+    cache = get_schema_cache()
+    if cache is None or stats is not None:
+        return _extract(node, strategy, memo_size, workers, example, stats, tracer)
+
+    key = cache.key(node.value, strategy, example)
+    schema = cache.get(key)
+    if tracer is not None:
+        tracer.count("cache_miss" if schema is None else "cache_hit")
+    if schema is not None:
+        return _copy_schema(schema)
+    schema = _extract(node, strategy, memo_size, workers, example, tracer=tracer)
+    # (Copied, as the caller may modify the schema returned)
+    cache.put(key, _copy_schema(schema))
+    return schema
+
+
+def _extract(
+    node, strategy, memo_size=4096, workers=None, example=False, stats=None, tracer=None
+):
+    """
+    Get the schema of the tree with :code:`node` as the root node, without
+    looking it up in the cache. See :func:`oas2`.
+    """
+    value = node.value
+    if (
+        workers is not None
+        and workers > 1
+        and stats is None
+        and isinstance(value, list)
+        and value
+    ):
+        # (Imported here, as _parallel depends on this module)
+        from ._parallel import oas2_parallel
+
+        if tracer is not None:
+            start = perf_counter()
+        schema = oas2_parallel(value, strategy, workers, memo_size)
+        if tracer is not None:
+            tracer.phase("workers", perf_counter() - start)
+        if example:
+            schema["example"] = _example(value)
+        return schema
+
+    return _run(_Engine(strategy, memo_size, tracer), node, example, stats)
+
+
+def _run(engine, node, example=False, stats=None):
+    """
+    Get the schema of the tree with :code:`node` as the root node, with an
+    engine. See :func:`oas2`.
+    """
+    if hasattr(node, "_expansion"):
+        # (Trees not made of Derek nodes, like DerekTree)
+        return engine.run(*node._expansion(), example=example, stats=stats)
+    # (Trees in which nodes may appear more than once, like DerekDAG)
+    shared = getattr(node, "_shared", False)
+    return engine.run(node, example=example, shared=shared, stats=stats)
+
+
+_STRATEGIES = ("permissive", "restricted", "inner_join", "deep_join")
+
+# Schema type names for scalar values, keyed by the exact type of the value.
+# (bool must be looked up before int, as bool is a subclass of int.)
+_SCALAR_TYPES = {str: "string", float: "number", bool: "boolean", int: "integer"}
+
+
+def _leaf_kind(value):
+    """
+    Get the kind of a value that has no subschemas.
+
+    Parameters
+    ----------
+    value:
+        Value of a node.
+
+    Returns
+    -------
+    Optional[str]
+        Schema type name for scalars, "array" for empty lists and "object"
+        for empty dictionaries.
+
+        None for non-empty lists and dictionaries, which have a schema
+        depending on the subschemas of their children, and for non-empty
+        buffers (see :meth:`_Engine.buffer`).
+    """
+    name = _SCALAR_TYPES.get(type(value))
+    if name is not None:
+        return name
+    elif isinstance(value, list):
+        return None if value else "array"
+    elif isinstance(value, dict):
+        return None if value else "object"
+
+    # Subclasses of scalar types
+    for t, name in _SCALAR_TYPES.items():
+        if isinstance(value, t):
+            return name
+
+    # Buffers, like array.array
+    layout = _buffer.layout(value)
+    if layout is not None and layout[0] is not None:
+        return None if layout[1][0] else "array"
+
+    raise NotImplementedError
+
+
+def _scalar_kinds(value):
+    """
+    Get the kinds of the elements of a non-empty list, if they are all
+    scalars, with a single scan of their types.
+
+    Parameters
+    ----------
+    value: List
+        Value of a node.
+
+    Returns
+    -------
+    Optional[List[str]]
+        Kind of each distinct type of element, in order of first appearance
+        (so that the shapes are the same as if each element was visited), or
+        None if any element is not a scalar of one of the types in
+        :data:`_SCALAR_TYPES` (including lists and dictionaries).
+    """
+    scalar_types = _SCALAR_TYPES
+    if type(value[0]) not in scalar_types:
+        return None
+    kinds = [scalar_types.get(t) for t in dict.fromkeys(map(type, value))]
+    return None if None in kinds else kinds
+
+
+def _count_scalars(value, kinds, counts):
+    """
+    Count the elements of a list of scalars by kind, given the kinds found
+    by :func:`_scalar_kinds`.
+    """
+    if len(kinds) == 1:
+        counts[kinds[0]] += len(value)
     else:
-        raise NotImplementedError
+        for t, n in Counter(map(type, value)).items():
+            counts[_SCALAR_TYPES[t]] += n
 
-    return j
+
+def _container_kind(value):
+    """
+    Get the kind of a list ("array") or dictionary ("object").
+    """
+    return "object" if isinstance(value, dict) else "array"
+
+
+def _new_leaf_schema(kind):
+    """
+    Make the schema for a kind of value returned by :func:`_leaf_kind`.
+    """
+    if kind == "array":
+        return {"type": "array", "items": {}, "maxItems": 0}
+    elif kind == "object":
+        return {"type": "object", "properties": {}}
+    else:
+        return {"type": kind}
 
 
-def _oas2_list(node, strategy):
+def _leaf_schema(value):
     """
-    Parse a list node with a given strategy, and return an OAS2 JSON
-    schema.
+    Get the schema for a value that has no subschemas.
+
+    Parameters
+    ----------
+    value:
+        Value of a node.
+
+    Returns
+    -------
+    Optional[Dict]
+        Schema for scalars, empty lists and empty dictionaries.
+
+        None for non-empty lists and dictionaries, which have a schema
+        depending on the subschemas of their children, and for non-empty
+        buffers (see :meth:`_Engine.buffer`).
+    """
+    kind = _leaf_kind(value)
+    return None if kind is None else _new_leaf_schema(kind)
+
+
+def _leaf_example(value, kind, example=True):
+    """
+    Get the example for a value that has no subschemas, with the kind
+    returned by :func:`_leaf_kind`. (None if :code:`example` is False.)
+    """
+    if not example:
+        return None
+    elif kind == "array":
+        return []
+    elif kind == "object":
+        return {}
+    else:
+        # (Scalars are immutable, so are shared rather than copied)
+        return value
+
+
+def _expand_node(node):
+    """
+    Get the value and child nodes of a Derek node.
+    """
+    return node.value, node.children
+
+
+def _expand_value(value):
+    """
+    Get the value and children of a value, without making Derek nodes.
+    """
+    if isinstance(value, list):
+        return value, value
+    elif isinstance(value, dict):
+        return value, value.values()
+    else:
+        return value, None
+
+
+class _Engine:
+    """
+    Post-order schema extraction over a tree of nodes.
+
+    Instead of calling itself once per node, the engine keeps an explicit
+    stack of the lists and dictionaries whose children are being visited.
+    Leaf children are handled directly, without being put on the stack. Once
+    all of the children of a list or dictionary have been visited, their
+    subschemas are combined into its schema, which is passed up to the
+    enclosing list or dictionary.
+
+    As no Python frame is used per node, there is no limit on the depth of
+    the tree.
+
+    Subschemas are memoized by shape. The shape of a leaf is its kind (see
+    :func:`_leaf_kind`). The shape of a list or dictionary is an integer
+    identifying the shapes of its children (in order, without repeats, where
+    the strategy allows), and its key names (for strategies other than
+    "permissive"), as these determine its schema. Subschemas are only made
+    for the first node of each shape; the schema of any later node of the
+    same shape is reused, so that the work done scales with the number of
+    distinct shapes rather than the number of nodes.
+
+    The elements of a list of scalars aren't visited at all: the kinds of
+    its elements are found with a single scan of their types (see
+    :func:`_scalar_kinds`).
 
     Parameters
     ----------
-    node: Derek
-        Root node of tree.
     strategy:
-        Schema extraction strategy.
+        Schema extraction strategy. See :func:`oas2`.
+    memo_size:
+        Maximum number of shapes to memoize. The least recently used shape
+        is dropped when the limit is exceeded.
+    tracer:
+        :class:`derek._parse.Tracer` to pass measurements to, if any.
+
+    Attributes
+    ----------
+    fingerprint: _Fingerprints
+        Fingerprints of the schemas made by the engine, used to remove
+        duplicate subschemas.
+    memo: OrderedDict
+        Shape key -> (shape, schema), in order of least recent use.
+    memo_hits: int
+        Number of shapes found in the memo (only counted with a tracer).
+    memo_misses: int
+        Number of shapes not found in the memo (only counted with a tracer).
+    reused: bool
+        Whether a schema made earlier has been reused (found in the memo, or
+        for a list or dictionary appearing again in a shared tree) since this
+        was last set to False, so that it may appear more than once in a
+        schema (see :func:`_unshare`).
+    """
+
+    __slots__ = (
+        "strategy",
+        "fingerprint",
+        "memo",
+        "memo_size",
+        "memo_hits",
+        "memo_misses",
+        "reused",
+        "tracer",
+        "_shapes",
+    )
+
+    def __init__(
+        self,
+        strategy: str = "permissive",
+        memo_size: int = 4096,
+        tracer: Optional[Tracer] = None,
+    ):
+        if strategy not in _STRATEGIES:
+            raise NotImplementedError
+
+        self.strategy = strategy
+        self.tracer = tracer
+        self.fingerprint = _Fingerprints()
+        self.memo = OrderedDict()
+        self.memo_size = memo_size
+        self.memo_hits = self.memo_misses = 0
+        self.reused = False
+        # Shapes of lists and dictionaries (never reused, even once dropped
+        # from the memo)
+        self._shapes = count()
+
+    def run(self, root, expand=_expand_node, example=False, shared=False, stats=None):
+        """
+        Get the schema of the tree with :code:`root` as the root node.
+
+        Parameters
+        ----------
+        root:
+            Root node of tree.
+        expand:
+            Function returning :code:`(value, children)` for a node.
+        example:
+            Whether to add an example of the tree to the schema, as
+            "example". See :meth:`walk`.
+        shared:
+            Whether lists and dictionaries may appear more than once in the
+            tree. See :meth:`walk`.
+        stats:
+            :class:`derek._parse.PathStats` to add the statistics of the
+            tree to, if any. See :meth:`walk`.
+
+        Returns
+        -------
+        j: :data:`derek._typing.JSON`
+            OAS2 schema, as JSON-serializable dictionary.
+        """
+        # The walk makes many small objects, none of them in reference
+        # cycles, so the cyclic garbage collector would otherwise repeatedly
+        # traverse the tree (which may be large) for nothing.
+        tracer = self.tracer
+        self.reused = False
+        with paused_gc():
+            if tracer is None:
+                _, schema, example_ = self.walk(root, expand, example, shared, stats)
+            else:
+                counts = dict.fromkeys(KINDS, 0)
+                hits, misses = self.memo_hits, self.memo_misses
+                start = perf_counter()
+                _, schema, example_ = self.walk(
+                    root, expand, example, shared, stats, counts
+                )
+                tracer.phase("walk", perf_counter() - start)
+
+        # (Only needed where a schema may appear more than once, so that
+        # trees without repeated shapes don't pay for another pass)
+        if self.reused:
+            if tracer is None:
+                schema = _unshare(schema)
+            else:
+                start = perf_counter()
+                schema = _unshare(schema)
+                tracer.phase("unshare", perf_counter() - start)
+        if tracer is not None:
+            if self.memo_hits > hits:
+                tracer.count("memo_hit", self.memo_hits - hits)
+            if self.memo_misses > misses:
+                tracer.count("memo_miss", self.memo_misses - misses)
+            for kind, n in counts.items():
+                if n:
+                    tracer.count("node:" + kind, n)
+        if example:
+            schema["example"] = example_
+        return schema
+
+    def walk(
+        self,
+        root,
+        expand=_expand_node,
+        example=False,
+        shared=False,
+        stats=None,
+        counts=None,
+    ):
+        """
+        Get the shape and schema of the tree with :code:`root` as the root
+        node.
+
+        Unlike :meth:`run`, the schema may contain memoized subschemas, and
+        must not be modified.
+
+        Parameters
+        ----------
+        root:
+            Root node of tree.
+        expand:
+            Function returning :code:`(value, children)` for a node.
+        example:
+            Whether to also make an example of the tree, in the same pass.
+            This is the same as the example made by
+            :meth:`derek.Derek.example`, except that the leaf values are
+            shared with the tree rather than copied.
+        shared:
+            Whether lists and dictionaries may appear more than once in the
+            tree (as in a tree made with :code:`Derek.tree(obj, intern=True)`,
+            or when a value contains the same object more than once). If
+            True, the children of each list or dictionary are only visited
+            once; the shape and schema found are reused wherever it appears
+            again.
+        stats:
+            :class:`derek._parse.PathStats` to add the statistics of each
+            path in the tree to, in the same pass, if any. As the statistics
+            count every value, :code:`shared` is then ignored.
+        counts:
+            Kind (see :data:`derek._parse._stats.KINDS`) -> number of values,
+            to add the values visited to, if any. The elements of a list of
+            scalars are counted, but not those of a buffer, and a list or
+            dictionary met again in a shared tree is counted without its
+            children.
+
+        Returns
+        -------
+        Tuple
+            Shape, schema and example (None if :code:`example` is False) of
+            the tree.
+        """
+        value, children = expand(root)
+        kind = _leaf_kind(value)
+        if kind is not None:
+            if stats is not None:
+                stats.visit(-1, None, kind, value)
+            if counts is not None:
+                counts[kind] += 1
+            return kind, _new_leaf_schema(kind), _leaf_example(value, kind, example)
+        if stats is None and isinstance(value, list):
+            kinds = _scalar_kinds(value)
+            if kinds is not None:
+                # (A list of scalars, with no need to visit its elements)
+                if counts is not None:
+                    counts["array"] += 1
+                    _count_scalars(value, kinds, counts)
+                shape, schema = self.combine(None, kinds, [None] * len(kinds))
+                examples = [value[0]] if example else None
+                return shape, schema, examples
+        if not children:
+            # (A non-empty buffer)
+            if stats is not None:
+                stats.visit(-1, None, "array", value)
+            if counts is not None:
+                counts["array"] += 1
+            shape, schema = self.buffer(value)
+            return shape, schema, _example(value) if example else None
+
+        scalar_types = _SCALAR_TYPES
+        scalar_kinds = _scalar_kinds
+        combine = self.combine
+        new_frame = self._new_frame
+
+        # Each entry is (value, iterator over children, shapes of children,
+        # subschemas of children (None for leaves), set of shapes seen (None
+        # if repeated shapes are kept), examples of children (None if not
+        # needed), whether every child's example is needed (or only the
+        # first), index of the path in stats (None if no stats are kept),
+        # iterator over keys (for dictionaries, if stats are kept))
+        if stats is None:
+            path = None
+        else:
+            visit = stats.visit
+            path = visit(-1, None, _container_kind(value), value)
+        stack = [new_frame(value, children, [] if example else None, path)]
+        push = stack.append
+        # id of each list/dictionary visited -> (shape, schema)
+        done = {} if shared and stats is None else None
+        while True:
+            (
+                value,
+                remaining,
+                shapes,
+                subschemas,
+                seen,
+                examples,
+                every,
+                path,
+                keys,
+            ) = stack[-1]
+            for child in remaining:
+                child_value, child_children = expand(child)
+                wanted = examples is not None and (every or not examples)
+                if path is not None:
+                    key = next(keys) if every else None
+
+                if not child_children:
+                    kind = scalar_types.get(type(child_value))
+                    if kind is None:
+                        kind = _leaf_kind(child_value)
+                    if kind is not None:
+                        if path is not None:
+                            visit(path, key, kind, child_value)
+                        if counts is not None:
+                            counts[kind] += 1
+                        if wanted:
+                            examples.append(_leaf_example(child_value, kind))
+                        if seen is None:
+                            shapes.append(kind)
+                            subschemas.append(None)
+                        elif kind not in seen:
+                            seen.add(kind)
+                            shapes.append(kind)
+                            subschemas.append(None)
+                        continue
+
+                    # A non-empty buffer, like an array.array
+                    entry = self.buffer(child_value)
+                    if path is not None:
+                        visit(path, key, "array", child_value)
+                else:
+                    entry = None if done is None else done.get(id(child_value))
+                    if entry is not None:
+                        # (Its schema appears again)
+                        self.reused = True
+                    elif path is None and isinstance(child_value, list):
+                        kinds = scalar_kinds(child_value)
+                        if kinds is not None:
+                            # A list of scalars: its schema depends only on
+                            # the kinds of its elements, so they aren't
+                            # visited
+                            entry = combine(None, kinds, [None] * len(kinds))
+                            if done is not None:
+                                done[id(child_value)] = entry
+                            if counts is not None:
+                                _count_scalars(child_value, kinds, counts)
+                if entry is not None:
+                    # (A buffer, already visited, or a list of scalars)
+                    if counts is not None:
+                        counts[_container_kind(child_value)] += 1
+                    shape, schema = entry
+                    if wanted:
+                        examples.append(_example(child_value))
+                    if seen is None:
+                        shapes.append(shape)
+                        subschemas.append(schema)
+                    elif shape not in seen:
+                        seen.add(shape)
+                        shapes.append(shape)
+                        subschemas.append(schema)
+                    continue
+
+                # Visit the children of this child first
+                if path is not None:
+                    child_path = visit(
+                        path, key, _container_kind(child_value), child_value
+                    )
+                else:
+                    child_path = None
+                push(
+                    new_frame(
+                        child_value,
+                        child_children,
+                        [] if wanted else None,
+                        child_path,
+                    )
+                )
+                break
+            else:
+                # All children visited
+                stack.pop()
+                if counts is not None:
+                    counts[_container_kind(value)] += 1
+                shape, schema = combine(
+                    value.keys() if every else None, shapes, subschemas
+                )
+                if examples is not None and every:
+                    examples = dict(zip(value, examples))
+                if done is not None:
+                    done[id(value)] = (shape, schema)
+                if not stack:
+                    return shape, schema, examples
+
+                _, _, shapes, subschemas, seen, parent_examples = stack[-1][:6]
+                if examples is not None:
+                    parent_examples.append(examples)
+                if seen is None:
+                    shapes.append(shape)
+                    subschemas.append(schema)
+                elif shape not in seen:
+                    seen.add(shape)
+                    shapes.append(shape)
+                    subschemas.append(schema)
+
+    def _new_frame(self, value, children, examples, path=None):
+        """
+        Make a stack entry for a list or dictionary.
+        """
+        every = isinstance(value, dict)
+        if every and self.strategy != "permissive":
+            # The schema depends on every value
+            seen = None
+        else:
+            # The schema only depends on the distinct subschemas
+            seen = set()
+        keys = iter(value) if every and path is not None else None
+        return (value, iter(children), [], [], seen, examples, every, path, keys)
+
+    def combine(self, keys, shapes, subschemas):
+        """
+        Combine the subschemas of the children of a list or dictionary.
+
+        Parameters
+        ----------
+        keys: Optional[Iterable]
+            Keys of a non-empty dictionary, in order, or None for a
+            non-empty list.
+        shapes: List
+            Shapes of the children.
+        subschemas: List[Optional[Dict]]
+            Subschemas of the children, or None for leaves.
+
+        Returns
+        -------
+        Tuple
+            Shape and schema of the list or dictionary.
+        """
+        if keys is None:
+            key = (list, tuple(shapes))
+        elif self.strategy == "permissive":
+            key = (dict, tuple(shapes))
+        else:
+            key = (dict, tuple(keys), tuple(shapes))
+
+        memo = self.memo
+        tracer = self.tracer
+        entry = memo.get(key)
+        if entry is not None:
+            memo.move_to_end(key)
+            self.reused = True
+            if tracer is not None:
+                self.memo_hits += 1
+            return entry
+
+        if tracer is not None:
+            self.memo_misses += 1
+            start = perf_counter()
+
+        subschemas = [
+            _new_leaf_schema(shape) if schema is None else schema
+            for shape, schema in zip(shapes, subschemas)
+        ]
+        strategy = self.strategy
+        fingerprint = self.fingerprint
+        if keys is None:
+            schema = _list_schema(subschemas, strategy, fingerprint, tracer)
+        else:
+            schema = _dict_schema(keys, subschemas, strategy, fingerprint, tracer)
+
+        if tracer is not None:
+            tracer.phase("combine", perf_counter() - start)
+
+        entry = memo[key] = (next(self._shapes), schema)
+        if len(memo) > self.memo_size:
+            memo.popitem(last=False)
+        return entry
+
+    def buffer(self, value):
+        """
+        Get the shape and schema of a non-empty buffer (see
+        :func:`derek._buffer.layout`), like an :code:`array.array`, a
+        :code:`memoryview` or a :code:`numpy.ndarray`.
+
+        These are the same as for the buffer as a list (of lists, for each
+        further dimension) of its elements, but are found from the kind of
+        its elements and the length of each dimension, without reading or
+        copying the elements.
+
+        Parameters
+        ----------
+        value:
+            The buffer.
+
+        Returns
+        -------
+        Tuple
+            Shape and schema of the buffer.
+        """
+        kind, dims = _buffer.layout(value)
+        shape, schema = kind, None
+        for n in reversed(dims):
+            if n:
+                shape, schema = self.combine(None, [shape], [schema])
+            else:
+                # (Empty, as a leaf)
+                shape, schema = "array", None
+        return shape, schema
+
+
+def _unshare(schema):
+    """
+    Copy any dictionary/list appearing more than once in a schema, so that
+    each dictionary/list in the schema is a distinct object.
+
+    Parameters
+    ----------
+    schema: Dict
+        Schema, specified as a dictionary. Modified in place.
+
+    Returns
+    -------
+    Dict
+        :code:`schema`.
+    """
+    seen = {id(schema)}
+    stack = [schema]
+    while stack:
+        obj = stack.pop()
+        for k, v in obj.items() if isinstance(obj, dict) else enumerate(obj):
+            if isinstance(v, (dict, list)):
+                if id(v) in seen:
+                    obj[k] = _copy_schema(v)
+                else:
+                    seen.add(id(v))
+                    stack.append(v)
+    return schema
+
+
+def _copy_schema(schema):
+    """
+    Copy a schema (iteratively, so that the depth of the schema is not
+    limited by the recursion limit).
+    """
+    schema = schema.copy()
+    stack = [schema]
+    while stack:
+        obj = stack.pop()
+        for k, v in obj.items() if isinstance(obj, dict) else enumerate(obj):
+            if isinstance(v, (dict, list)):
+                obj[k] = v = v.copy()
+                stack.append(v)
+    return schema
+
+
+def _list_schema(subschemas, strategy, fingerprint=None, tracer=None):
+    """
+    Get the schema for a list, from the subschemas of its elements.
 
-        Must be one of "permissive" (default), "restricted", or "inner_join".
+    :code:`fingerprint` is passed to :func:`_unique_schemas`, and
+    measurements to :code:`tracer` (see :class:`derek._parse.Tracer`), if
+    any.
 
     Examples
     --------
@@ -233,31 +987,26 @@ def _oas2_list(node, strategy):
          }
     """
     if strategy in ["permissive", "restricted"]:
-        subschemas = _get_subschemas(node, strategy)
-        subschemas = _unique_schemas(subschemas, ordered=True)
-        schema = _oneOf(subschemas)
+        # (_oneOf removes duplicate subschemas)
+        schema = _oneOf(subschemas, fingerprint, tracer)
         j = {"type": "array", "items": schema}
     elif strategy == "inner_join":
-        subschemas = _get_subschemas(node, strategy)
-        subschemas = _merge_schemas(subschemas)
-        schema = _oneOf(subschemas)
+        subschemas = _merge_schemas(subschemas, fingerprint, tracer)
+        schema = _oneOf(subschemas, fingerprint, tracer)
         j = {"type": "array", "items": schema}
+    elif strategy == "deep_join":
+        j = {"type": "array", "items": _deep_merge(subschemas, fingerprint)}
     return j
 
 
-def _oas2_dict(node, strategy):
+def _dict_schema(keys, subschemas, strategy, fingerprint=None, tracer=None):
     """
-    Parse a dict node with a given strategy, and return an OAS2 JSON
-    schema.
+    Get the schema for a dictionary, from its keys and the subschemas of its
+    values.
 
-    Parameters
-    ----------
-    node: Derek
-        Root node of tree.
-    strategy:
-        Schema extraction strategy.
-
-        Must be one of "permissive" (default), "restricted", or "inner_join".
+    :code:`fingerprint` is passed to :func:`_unique_schemas`, and
+    measurements to :code:`tracer` (see :class:`derek._parse.Tracer`), if
+    any.
 
     Examples
     --------
@@ -337,58 +1086,41 @@ def _oas2_dict(node, strategy):
          }
     """
     if strategy == "permissive":
-        subschemas = _get_subschemas(node, strategy)
-        schema = _oneOf(subschemas)
+        schema = _oneOf(subschemas, fingerprint, tracer)
         j = {"type": "object", "additionalProperties": schema}
     elif strategy in ["restricted", "inner_join"]:
-        subschemas = _get_subschemas(node, strategy)
-        schema = dict(zip(node.value.keys(), subschemas))
+        schema = dict(zip(keys, subschemas))
         j = {"type": "object", "properties": schema}
+    elif strategy == "deep_join":
+        schema = dict(zip(keys, subschemas))
+        j = {"type": "object", "properties": schema}
+        if schema:
+            # (So that merged and unmerged subschemas can be told apart)
+            j["required"] = list(schema)
     return j
 
 
-def _get_subschemas(node, strategy):
-    """
-    Get subschemas for each of the node's children.
-
-    Parameters
-    ----------
-    node: Derek
-        Root node of tree.
-    strategy:
-        Schema extraction strategy.
-
-        Must be one of "permissive" (default), "restricted", or "inner_join".
-
-    Returns
-    -------
-    subschemas: List[Dict]
-        Subschemas, returned as a list of dictionaries.
-    """
-    # Parse each of the children
-    subschemas = [oas2(c, strategy) for c in node.children]
-    return subschemas
-
-
-def _merge_schemas(schemas):
+def _merge_schemas(schemas, fingerprint=None, tracer=None):
     """
     Merge together subschemas.
 
     Parameters
     ----------
-    node: Derek
-        Root node of tree.
-    strategy:
-        Schema extraction strategy.
+    schemas: List[Dict]
+        Subschemas, specified as a list of dictionaries.
+    fingerprint: Optional[_Fingerprints]
+        Fingerprints used to remove duplicate subschemas.
 
-        Must be one of "permissive" (default), "restricted", or "inner_join".
+        If not specified, a new :class:`_Fingerprints` is used.
+    tracer: Optional[Tracer]
+        Tracer to pass measurements to, if any.
 
     Returns
     -------
     subschemas: List[Dict]
         Subschemas, returned as a list of dictionaries.
     """
-    schemas_split = _split_schemas_by_type(schemas)
+    schemas_split = _split_schemas_by_type(schemas, tracer)
 
     merged = []
     objects = schemas_split.get("object", [])
@@ -397,14 +1129,18 @@ def _merge_schemas(schemas):
     ]
 
     if len(objects) > 0:
-        merged.append(_merge_objects(objects))
+        merged.append(_merge_objects(objects, fingerprint, tracer))
     if len(non_objects) > 0:
-        merged.extend(_unique_schemas(non_objects, ordered=True))
+        merged.extend(
+            _unique_schemas(
+                non_objects, ordered=True, fingerprint=fingerprint, tracer=tracer
+            )
+        )
 
     return merged
 
 
-def _merge_objects(schemas):
+def _merge_objects(schemas, fingerprint=None, tracer=None):
     """
     Merge together object subschemas.
 
@@ -495,26 +1231,63 @@ def _merge_objects(schemas):
     ----------
     schemas: List[Dict]
         Subschemas, specified as a list of dictionaries.
+    fingerprint: Optional[_Fingerprints]
+        Fingerprints used to remove duplicate subschemas.
+
+        If not specified, a new :class:`_Fingerprints` is used.
+    tracer: Optional[Tracer]
+        Tracer to pass measurements to, if any.
 
     Returns
     -------
     subschemas: List[Dict]
         Subschemas, returned as a list of dictionaries.
     """
+    if tracer is not None:
+        start = perf_counter()
+        merged = _merge_objects(schemas, fingerprint)
+        tracer.phase("merge_objects", perf_counter() - start)
+        return merged
+
+    if fingerprint is None:
+        fingerprint = _Fingerprints()
+
     merged = {"type": "object"}
 
+    # For each key, the number of schemas with the key, and its distinct
+    # subschemas in order of first appearance. Subschemas are compared by
+    # identity first (memoized subschemas are shared between schemas), then
+    # by fingerprint, so that merging takes time linear in the total number
+    # of properties.
     count = {}
     properties = {}
+    # Key -> ids of the subschemas seen, fingerprints of the distinct
+    # subschemas (None until a second subschema is seen)
+    seen = {}
     for s in schemas:
         for k, v in s.get("properties", {}).items():
-            if k not in properties:
-                count[k] = 0
-                properties[k] = []
+            entry = seen.get(k)
+            if entry is None:
+                count[k] = 1
+                properties[k] = [v]
+                seen[k] = [{id(v)}, None]
+                continue
+
             count[k] += 1
-            if v not in properties[k]:
+            ids, fingerprints = entry
+            if id(v) in ids:
+                continue
+            ids.add(id(v))
+            if fingerprints is None:
+                fingerprints = entry[1] = {fingerprint(properties[k][0])}
+            f = fingerprint(v)
+            if f not in fingerprints:
+                fingerprints.add(f)
                 properties[k].append(v)
     if len(properties) > 0:
-        merged["properties"] = {k: _oneOf(v) for k, v in properties.items()}
+        merged["properties"] = {
+            k: v[0] if len(v) == 1 else {"oneOf": v} for k, v in properties.items()
+        }
     required = [k for k in properties.keys() if count[k] == len(schemas)]
     if len(required) > 0:
         merged["required"] = required
@@ -526,7 +1299,98 @@ def _merge_objects(schemas):
     return merged
 
 
-def _oneOf(schemas):
+def _deep_merge(schemas, fingerprint=None):
+    """
+    Merge together subschemas, and the subschemas of their properties and
+    items, at every depth (for "deep_join").
+
+    The alternatives of any "oneOf" are merged individually. Then, object
+    subschemas are merged into one: its properties are those of any of the
+    objects (with their subschemas merged in the same way), and the
+    required properties are those required by all of the objects. Array
+    subschemas are merged into one, whose items are the merged items of the
+    arrays. Other subschemas are kept if distinct.
+
+    Subschemas are merged iteratively, from the top down. Each subschema is
+    fingerprinted once (see :class:`_Fingerprints`), and duplicates are
+    dropped before merging, so the time taken and the size of the result
+    are linear in the total size of the distinct subschemas.
+
+    Parameters
+    ----------
+    schemas: List[Dict]
+        Subschemas, specified as a list of dictionaries.
+    fingerprint: Optional[_Fingerprints]
+        Fingerprints used to remove duplicate subschemas.
+
+        If not specified, a new :class:`_Fingerprints` is used.
+
+    Returns
+    -------
+    Dict
+        Merged schema: a single subschema, or a "oneOf" of subschemas of
+        different types.
+    """
+    if fingerprint is None:
+        fingerprint = _Fingerprints()
+
+    result = {}
+    # Each entry is (subschemas to merge, container of the merged schema,
+    # key of the merged schema in the container)
+    stack = [(schemas, result, "schema")]
+    while stack:
+        schemas, container, key = stack.pop()
+
+        # Distinct alternatives, grouped by type, in order of first appearance
+        seen = set()
+        groups = {}
+        for s in schemas:
+            for alternative in s["oneOf"] if "oneOf" in s else (s,):
+                f = fingerprint(alternative)
+                if f not in seen:
+                    seen.add(f)
+                    groups.setdefault(alternative.get("type"), []).append(alternative)
+
+        alternatives = []
+        for kind, group in groups.items():
+            if len(group) == 1:
+                alternatives.append(group[0])
+            elif kind == "object":
+                merged = {"type": "object"}
+                properties = {}
+                required = {}
+                for s in group:
+                    for k, v in s.get("properties", {}).items():
+                        properties.setdefault(k, []).append(v)
+                    for k in s.get("required", ()):
+                        required[k] = required.get(k, 0) + 1
+
+                if properties:
+                    merged["properties"] = dict.fromkeys(properties)
+                    for k, v in properties.items():
+                        stack.append((v, merged["properties"], k))
+                required = [k for k in properties if required.get(k) == len(group)]
+                if required:
+                    merged["required"] = required
+                alternatives.append(merged)
+            elif kind == "array":
+                # (Empty lists have no items to merge)
+                items = [s["items"] for s in group if s.get("maxItems") != 0]
+                merged = {"type": "array", "items": None}
+                stack.append((items, merged, "items"))
+                alternatives.append(merged)
+            else:
+                alternatives.extend(group)
+
+        if len(alternatives) == 1:
+            container[key] = alternatives[0]
+        else:
+            container[key] = {"oneOf": alternatives}
+
+    return result["schema"]
+
+
+def _oneOf(schemas, fingerprint=None, tracer=None):
     """
     Compress schemas using oneOf.
 
@@ -534,19 +1398,46 @@ def _oneOf(schemas):
     ----------
     schemas: List[Dict]
         Subschemas, specified as a list of dictionaries.
+    fingerprint: Optional[_Fingerprints]
+        Fingerprints used to remove duplicate subschemas.
+
+        If not specified, a new :class:`_Fingerprints` is used.
+    tracer: Optional[Tracer]
+        Tracer to pass measurements to, if any.
 
     Returns
     -------
     Dict
         schemas[0] if all schemas are the same.
     """
-    unique = _unique_schemas(schemas, ordered=True)
-    return unique[0] if len(unique) <= 1 else {"oneOf": unique}
+    if len(schemas) == 1:
+        return schemas[0]
 
+    unique = _unique_schemas(
+        schemas, ordered=True, fingerprint=fingerprint, tracer=tracer
+    )
+    if len(unique) <= 1:
+        return unique[0]
+    if tracer is not None:
+        tracer.size("oneOf", len(unique))
+    return {"oneOf": unique}
 
-def _unique_schemas(schemas, ordered=False):
+
+# Number of distinct schemas up to which _unique_schemas compares schemas
+# directly, rather than by fingerprint. For a few small schemas, comparing
+# them is faster than fingerprinting them.
+_SCAN_LIMIT = 8
+
+
+def _unique_schemas(schemas, ordered=False, fingerprint=None, tracer=None):
     """
-    Compress schemas using oneOf.
+    Remove duplicate schemas.
+
+    Two schemas are duplicates if they are equal, regardless of the order
+    of the keys in any of their dictionaries. Once more than a few distinct
+    schemas have been found, duplicates are found by comparing fingerprints
+    (see :class:`_Fingerprints`), so this takes time linear in the number of
+    schemas.
 
     Parameters
     ----------
@@ -555,29 +1446,188 @@ def _unique_schemas(schemas, ordered=False):
     ordered: bool
         If True, return schemas in the same order as represented in schemas.
 
-        If False, return schemas in any order. Set False to get a slight
-        speedup.
+        If False, return schemas in any order.
+    fingerprint: Optional[_Fingerprints]
+        Fingerprints used to compare the schemas.
+
+        If not specified, a new :class:`_Fingerprints` is used.
+    tracer: Optional[Tracer]
+        Tracer to pass measurements to, if any.
 
     Returns
     -------
-    Dict
-        schemas[0] if all schemas are the same.
+    List[Dict]
+        The first occurrence of each distinct schema.
     """
-    # Convert schemas to string to make them hashable,
-    # then use set to find unique strings
+    if tracer is not None:
+        start = perf_counter()
+        unique = _unique_schemas(schemas, ordered, fingerprint)
+        tracer.phase("unique_schemas", perf_counter() - start)
+        tracer.size("unique_schemas", len(schemas))
+        return unique
 
-    if ordered:
-        unique = []
+    unique = []
+    try:
         for s in schemas:
             if s not in unique:
                 unique.append(s)
+                if len(unique) > _SCAN_LIMIT:
+                    break
+        else:
+            return unique
+    except RecursionError:
+        # (Schemas too deeply nested to compare directly)
+        pass
+
+    if fingerprint is None:
+        fingerprint = _Fingerprints()
+
+    seen = set()
+    unique = []
+    for s in schemas:
+        f = fingerprint(s)
+        if f not in seen:
+            seen.add(f)
+            unique.append(s)
+
+    return unique
 
-        return unique
-    else:
-        return list(map(json.loads, set(map(json.dumps, schemas))))
 
+def _flat_key(obj):
+    """
+    Get the canonical key of a flat dictionary/list (one containing no
+    dictionaries or lists).
+
+    Returns
+    -------
+    Optional[Tuple]
+        Canonical key, or None if :code:`obj` is not flat.
+    """
+    try:
+        if isinstance(obj, dict):
+            return (dict, frozenset(obj.items()))
+        else:
+            key = (list, tuple(obj))
+            hash(key)
+            return key
+    except TypeError:
+        # (Contains unhashable values)
+        return None
+
+
+class _Fingerprints:
+    """
+    Canonical fingerprints of schemas.
+
+    Two schemas have the same fingerprint if and only if they are equal
+    (:code:`==`). In particular, the fingerprint does not depend on the order
+    of the keys in any of the dictionaries in a schema.
+
+    Each distinct dictionary/list in a schema is interned as a small integer,
+    so fingerprints are cheap to hash and compare:
+
+    * Flat dictionaries/lists (like :code:`{"type": "integer"}`) are interned
+      by their contents.
+    * Other dictionaries/lists are interned by the fingerprints of their
+      values. Their fingerprints are cached, so that subschemas are not
+      walked again when a schema containing them is fingerprinted.
+
+    Parameters
+    ----------
+    maxsize:
+        Maximum number of cached fingerprints. The cache is emptied when it
+        grows beyond this size, so that it doesn't keep discarded schemas
+        alive.
+    """
 
-def _split_schemas_by_type(schemas):
+    __slots__ = "_table", "_cache", "maxsize"
+
+    def __init__(self, maxsize: int = 1 << 16):
+        # Canonical key -> fingerprint
+        self._table = {}
+        # id(schema) -> (schema, fingerprint); holding schema keeps the id
+        # from being reused
+        self._cache = {}
+        self.maxsize = maxsize
+
+    def __call__(self, schema) -> int:
+        """
+        Get the fingerprint of a schema.
+
+        Parameters
+        ----------
+        schema: Dict
+            Schema, specified as a dictionary.
+
+        Returns
+        -------
+        int
+            Fingerprint of the schema.
+        """
+        table = self._table
+        key = _flat_key(schema)
+        if key is not None:
+            f = table.get(key)
+            if f is None:
+                f = table[key] = len(table)
+            return f
+
+        cache = self._cache
+        cached = cache.get(id(schema))
+        if cached is not None:
+            return cached[1]
+        if len(cache) > self.maxsize:
+            cache.clear()
+
+        # Post-order traversal, with an explicit stack. A dictionary/list is
+        # only fingerprinted once all of its values have been.
+        stack = [schema]
+        while stack:
+            obj = stack[-1]
+            if id(obj) in cache:
+                # (Appeared more than once in schema)
+                stack.pop()
+                continue
+
+            is_dict = isinstance(obj, dict)
+            parts = []
+            pending = False
+            for k, v in obj.items() if is_dict else enumerate(obj):
+                if not isinstance(v, (dict, list)):
+                    # Scalars are tagged, so that they can't be confused with
+                    # fingerprints
+                    parts.append((k, (v,)))
+                    continue
+
+                cached = cache.get(id(v))
+                if cached is not None:
+                    parts.append((k, cached[1]))
+                    continue
+
+                key = _flat_key(v)
+                if key is None:
+                    stack.append(v)
+                    pending = True
+                    continue
+
+                f = table.get(key)
+                if f is None:
+                    f = table[key] = len(table)
+                parts.append((k, f))
+            if pending:
+                continue
+
+            stack.pop()
+            key = (_Fingerprints, frozenset(parts) if is_dict else tuple(parts))
+            f = table.get(key)
+            if f is None:
+                f = table[key] = len(table)
+            cache[id(obj)] = (obj, f)
+
+        return cache[id(schema)][1]
+
+
+def _split_schemas_by_type(schemas, tracer=None):
     """
     Sort schemas by type.
 
@@ -585,6 +1635,8 @@ def _split_schemas_by_type(schemas):
     ----------
     schemas: List[Dict]
         Subschemas, specified as a list of dictionaries.
+    tracer: Optional[Tracer]
+        Tracer to pass measurements to, if any.
 
     Returns
     -------
@@ -631,6 +1683,11 @@ def _split_schemas_by_type(schemas):
          ]
        }
     """
+    if tracer is not None:
+        start = perf_counter()
+        collection = _split_schemas_by_type(schemas)
+        tracer.phase("split_schemas_by_type", perf_counter() - start)
+        return collection
 
     collection = {}
     for s in schemas:
@@ -0,0 +1,112 @@
+import os
+from functools import partial
+from multiprocessing import get_all_start_methods, get_context, get_start_method
+from typing import Any, List, Optional
+
+from .. import _typing
+
+from ._accumulate import Accumulator
+
+# List being converted, in a forked worker process (see _init_shared)
+_values = None
+
+
+def oas2_parallel(
+    values: List[Any],
+    strategy: str = "permissive",
+    workers: Optional[int] = None,
+    memo_size: int = 4096,
+    chunksize: Optional[int] = None,
+) -> _typing.JSON:
+    """
+    Convert a list into OAS2 schema, using a pool of worker processes.
+
+    The list is split into consecutive chunks. Each worker adds the elements
+    of a chunk to an :class:`Accumulator`, and the accumulators are merged in
+    order, so the schema is the same as for :func:`derek.Parser.oas2`.
+
+    Where worker processes are forked, they read the chunks from their copy
+    of the list; otherwise, each chunk is pickled and sent to a worker.
+
+    Parameters
+    ----------
+    values:
+        A JSON-serializable list.
+    strategy:
+        Schema extraction strategy. See :meth:`derek.Parser.oas2`.
+    workers:
+        Number of worker processes. If not specified, the number of CPUs is
+        used.
+    memo_size:
+        Maximum number of distinct subtree shapes for which subschemas are
+        memoized by each worker. See :meth:`derek.Parser.oas2`.
+    chunksize:
+        Number of elements sent to a worker at a time. If not specified,
+        the list is split into four chunks per worker.
+
+    Returns
+    -------
+    j: :data:`derek._typing.JSON`
+        OAS2 schema, as JSON-serializable dictionary.
+    """
+    # (Made first, so that an unknown strategy is reported here)
+    accumulator = Accumulator(strategy, memo_size)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, -(-len(values) // (4 * workers)))
+
+    # (The start method that would be used, without fixing it for the rest of
+    # the process as get_context() would)
+    method = get_start_method(allow_none=True) or get_all_start_methods()[0]
+    context = get_context(method)
+
+    starts = range(0, len(values), chunksize)
+    if method == "fork":
+        # Forked workers inherit the list as an argument of the initializer,
+        # so that only the bounds of each chunk need to be sent to them
+        initializer = (_init_shared, (values,))
+        task = partial(
+            _accumulate_shared,
+            chunksize=chunksize,
+            strategy=strategy,
+            memo_size=memo_size,
+        )
+        tasks = starts
+    else:
+        initializer = ()
+        task = partial(_accumulate, strategy=strategy, memo_size=memo_size)
+        tasks = (values[i : i + chunksize] for i in starts)
+
+    # (A pool of the context, as ProcessPoolExecutor only takes a context and
+    # an initializer from Python 3.7)
+    with context.Pool(workers, *initializer) as pool:
+        for result in pool.imap(task, tasks):
+            accumulator.merge(result)
+
+    return accumulator.schema()
+
+
+def _accumulate(chunk, strategy, memo_size):
+    """
+    Add the elements of a chunk to a new accumulator (in a worker process).
+    """
+    return Accumulator(strategy, memo_size).extend(chunk)
+
+
+def _init_shared(values):
+    """
+    Keep the list being converted (in a forked worker process).
+    """
+    global _values
+    _values = values
+
+
+def _accumulate_shared(start, chunksize, strategy, memo_size):
+    """
+    Add the elements of a chunk of the inherited list (see
+    :func:`_init_shared`) to a new accumulator (in a forked worker process).
+    """
+    chunk = _values[start : start + chunksize]
+    return Accumulator(strategy, memo_size).extend(chunk)
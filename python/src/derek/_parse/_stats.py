@@ -0,0 +1,241 @@
+from array import array
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .. import _typing
+
+# Kinds of value for which statistics are kept (see _oas2._leaf_kind, where
+# "array" and "object" are only used for empty lists and dictionaries)
+KINDS = ("integer", "number", "string", "array", "object", "boolean")
+_KIND_INDICES = {kind: i for i, kind in enumerate(KINDS)}
+_NUMERIC = 2
+_BOOLEAN = 5
+
+
+class PathStats:
+    """
+    Statistics for each path in a data structure, collected while its schema
+    is extracted (see :meth:`derek.Parser.oas2`).
+
+    A path is a tuple of the keys leading to a value, with :code:`None` for
+    the elements of a list. For example, in
+    :code:`{"a": [{"b": 1}, {"b": 2}]}`, the values 1 and 2 both have the
+    path :code:`("a", None, "b")`.
+
+    For each path, and each kind of value found at that path (see
+    :data:`KINDS`), the number of values is counted, along with:
+
+    * the range of values, for integers and numbers;
+    * the range of lengths, for strings, lists ("array") and dictionaries
+      ("object").
+
+    The counts and ranges are kept in flat :code:`array` buffers, with one
+    entry per path and kind. (Ranges of numbers are kept as floats, so
+    integers beyond 2**53 are rounded.)
+
+    Attributes
+    ----------
+    paths: List[Tuple]
+        Each path, in order of first appearance.
+    counts: array
+        Number of values, for each path and kind. The entry for path
+        :code:`paths[i]` and kind :code:`KINDS[k]` is at index
+        :code:`i * len(KINDS) + k`.
+    low: array
+        Smallest value or length, for each path and kind (:code:`inf` if
+        none).
+    high: array
+        Largest value or length, for each path and kind (:code:`-inf` if
+        none).
+    """
+
+    __slots__ = "paths", "counts", "low", "high", "_ids", "_keys"
+
+    def __init__(self):
+        self.paths = []
+        self.counts = array("q")
+        self.low = array("d")
+        self.high = array("d")
+        # (parent path index, key) -> path index
+        self._ids = {}
+        # Path index -> [(key, path index)] for the keys of dictionaries
+        self._keys = {}
+
+    def _path(self, parent: int, key: Optional[Hashable]) -> int:
+        """
+        Get the index of a path, adding it if new.
+        """
+        i = self._ids.get((parent, key))
+        if i is None:
+            i = self._ids[(parent, key)] = len(self.paths)
+            self.paths.append(() if parent < 0 else self.paths[parent] + (key,))
+            if key is not None:
+                self._keys.setdefault(parent, []).append((key, i))
+
+            n = len(KINDS)
+            self.counts.extend(array("q", [0]) * n)
+            self.low.extend(array("d", [float("inf")]) * n)
+            self.high.extend(array("d", [float("-inf")]) * n)
+        return i
+
+    def visit(self, parent: int, key: Optional[Hashable], kind: str, value: Any) -> int:
+        """
+        Record a value.
+
+        Parameters
+        ----------
+        parent:
+            Index of the path of the list/dictionary containing the value, or
+            -1 for the root value.
+        key:
+            Key of the value in its dictionary, or None.
+        kind:
+            Kind of the value (see :data:`KINDS`).
+        value:
+            The value.
+
+        Returns
+        -------
+        int
+            Index of the path of the value.
+        """
+        i = self._path(parent, key)
+        k = _KIND_INDICES[kind]
+        slot = i * len(KINDS) + k
+        self.counts[slot] += 1
+
+        if k == _BOOLEAN:
+            return i
+        measure = value if k < _NUMERIC else len(value)
+        if measure < self.low[slot]:
+            self.low[slot] = measure
+        if measure > self.high[slot]:
+            self.high[slot] = measure
+        return i
+
+    def totals(self) -> Dict[str, int]:
+        """
+        Get the number of values of each kind, over all paths.
+
+        Returns
+        -------
+        Dict[str, int]
+            Kind -> number of values, for each of :data:`KINDS`.
+        """
+        n = len(KINDS)
+        return {kind: sum(self.counts[k::n]) for k, kind in enumerate(KINDS)}
+
+    def report(self) -> Dict[Tuple, Dict[str, Any]]:
+        """
+        Get the statistics for each path.
+
+        Returns
+        -------
+        Dict[Tuple, Dict[str, Any]]
+            For each path, a dictionary with:
+
+            * "count": the number of values;
+            * "types": the number of values of each kind;
+            * "minimum" and "maximum", if any values are numbers;
+            * "minLength" and "maxLength", if any values are strings;
+            * "minItems" and "maxItems", if any values are lists;
+            * "minProperties" and "maxProperties", if any values are
+              dictionaries.
+        """
+        result = {}
+        for i, path in enumerate(self.paths):
+            stats = result[path] = {"count": 0, "types": {}}
+            for kind in KINDS:
+                count = self.counts[i * len(KINDS) + _KIND_INDICES[kind]]
+                if count:
+                    stats["count"] += count
+                    stats["types"][kind] = count
+            stats.update(self._keywords([i], ("integer", "number")))
+            for kind in ("string", "array", "object"):
+                stats.update(self._keywords([i], (kind,)))
+        return result
+
+    def annotate(self, schema: _typing.JSON) -> _typing.JSON:
+        """
+        Add the ranges found to a schema extracted from the same data
+        structure, as the OAS keywords "minimum", "maximum", "minLength",
+        "maxLength", "minItems", "maxItems", "minProperties" and
+        "maxProperties".
+
+        The ranges for each subschema are those of the values of its type at
+        the paths it describes.
+
+        Parameters
+        ----------
+        schema:
+            OAS2 (or OAS3) schema, as JSON-serializable dictionary. Modified
+            in place.
+
+        Returns
+        -------
+        j: :data:`derek._typing.JSON`
+            :code:`schema`.
+
+        Raises
+        ------
+        ValueError
+            If :code:`schema` is not a schema, such as the dictionary of
+            schemas by name returned by :meth:`derek.Derek.parse` (annotate
+            :code:`result[name]` instead).
+        """
+        if "type" not in schema and "oneOf" not in schema:
+            raise ValueError(
+                "Expected a schema with 'type' or 'oneOf', got keys {}".format(
+                    sorted(schema)
+                )
+            )
+        if not self.paths:
+            return schema
+
+        # Each entry is (schema, indices of the paths it describes)
+        stack = [(schema, [0])]
+        while stack:
+            j, indices = stack.pop()
+            if "oneOf" in j:
+                stack.extend((alternative, indices) for alternative in j["oneOf"])
+                continue
+
+            kind = j.get("type")
+            if kind in ("integer", "number", "string", "array", "object"):
+                # (Keywords already in the schema, like the "maxItems" of an
+                # empty list, are kept)
+                for keyword, bound in self._keywords(indices, (kind,)).items():
+                    j.setdefault(keyword, bound)
+
+            if kind == "array" and j.get("items"):
+                items = [self._ids.get((i, None)) for i in indices]
+                stack.append((j["items"], [i for i in items if i is not None]))
+            elif kind == "object":
+                for key, subschema in j.get("properties", {}).items():
+                    children = [self._ids.get((i, key)) for i in indices]
+                    stack.append((subschema, [i for i in children if i is not None]))
+                if j.get("additionalProperties"):
+                    children = [i for p in indices for _, i in self._keys.get(p, ())]
+                    stack.append((j["additionalProperties"], children))
+        return schema
+
+    def _keywords(self, indices, kinds):
+        """
+        Get the OAS keywords for the ranges of the values of some kinds, at
+        some paths.
+        """
+        n = len(KINDS)
+        slots = [i * n + _KIND_INDICES[kind] for i in indices for kind in kinds]
+        slots = [slot for slot in slots if self.counts[slot]]
+        if not slots:
+            return {}
+
+        low = min(self.low[slot] for slot in slots)
+        high = max(self.high[slot] for slot in slots)
+        if kinds[0] in ("integer", "number"):
+            if all(slot % n == _KIND_INDICES["integer"] for slot in slots):
+                low, high = int(low), int(high)
+            return {"minimum": low, "maximum": high}
+
+        names = {"string": "Length", "array": "Items", "object": "Properties"}
+        name = names[kinds[0]]
+        return {"min" + name: int(low), "max" + name: int(high)}
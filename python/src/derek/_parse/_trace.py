@@ -0,0 +1,117 @@
+from typing import Any, Dict
+
+
+class Tracer:
+    """
+    Collects timings, counts and sizes while a schema is extracted (see the
+    :code:`tracer` argument of :meth:`derek.Parser.oas2`).
+
+    Any object with the methods :meth:`phase`, :meth:`count` and
+    :meth:`size` can be used as a tracer instead, to send the measurements
+    elsewhere (for example, to a metrics client). When no tracer is given,
+    the parser makes no measurements.
+
+    The phases are:
+
+    * "walk": visiting the nodes and combining their subschemas (all of the
+      others, except "unshare", happen within this);
+    * "combine": making the schema of a list or dictionary, for each shape
+      not found in the memo;
+    * "unique_schemas", "merge_objects", "split_schemas_by_type": calls to
+      the functions of the same names in :mod:`derek._parse._oas2` (calls
+      made within "merge_objects" are only included in its time, and their
+      sizes aren't recorded);
+    * "unshare": copying repeated subschemas out of the final schema (only
+      when a subschema was reused, from the memo or a shared tree);
+    * "workers": making the schema with worker processes (see the
+      :code:`workers` argument of :meth:`derek.Parser.oas2`), whose own
+      phases and counts aren't measured.
+
+    The counts are:
+
+    * "cache_hit", "cache_miss": schemas found (or not) in the process-wide
+      :class:`derek._parse.SchemaCache`, if one is set;
+    * "memo_hit", "memo_miss": shapes found (or not) in the memo, for each
+      list or dictionary;
+    * "node:<kind>": the number of values of each kind (see
+      :data:`derek._parse._stats.KINDS`), counted as they are visited (so
+      the elements of a buffer aren't counted, and a list or dictionary
+      appearing more than once in a shared tree is only counted with its
+      children once).
+
+    The sizes are:
+
+    * "unique_schemas": the number of schemas deduplicated by each call;
+    * "oneOf": the number of alternatives in each "oneOf" made.
+
+    Attributes
+    ----------
+    timings: Dict[str, List]
+        Phase -> :code:`[calls, total seconds]`.
+    counts: Dict[str, int]
+        Name -> count.
+    sizes: Dict[str, List]
+        Name -> :code:`[number of sizes, total, maximum]`.
+    """
+
+    __slots__ = "timings", "counts", "sizes"
+
+    def __init__(self):
+        self.timings = {}
+        self.counts = {}
+        self.sizes = {}
+
+    def phase(self, name: str, seconds: float):
+        """
+        Record the time taken by one call of a phase.
+        """
+        entry = self.timings.get(name)
+        if entry is None:
+            self.timings[name] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    def count(self, name: str, n: int = 1):
+        """
+        Add to a count.
+        """
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def size(self, name: str, n: int):
+        """
+        Record the size of a list.
+        """
+        entry = self.sizes.get(name)
+        if entry is None:
+            self.sizes[name] = [1, n, n]
+        else:
+            entry[0] += 1
+            entry[1] += n
+            if n > entry[2]:
+                entry[2] = n
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Summarize the measurements.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Dictionary with:
+
+            * "timings": phase -> :code:`{"calls", "seconds"}`;
+            * "counts": name -> count;
+            * "sizes": name -> :code:`{"calls", "mean", "max"}`.
+        """
+        return {
+            "timings": {
+                name: {"calls": calls, "seconds": seconds}
+                for name, (calls, seconds) in self.timings.items()
+            },
+            "counts": dict(self.counts),
+            "sizes": {
+                name: {"calls": calls, "mean": total / calls, "max": largest}
+                for name, (calls, total, largest) in self.sizes.items()
+            },
+        }
@@ -0,0 +1,253 @@
+from array import array
+from itertools import compress
+from typing import Any, Optional
+
+from . import _index
+from ._derek import Derek
+from ._example import example as _example
+
+from . import _typing
+
+# Kind codes, as stored in DerekTree.kinds
+KINDS = (None, "string", "number", "boolean", "integer", "array", "object")
+"Kind of value for each kind code. (0 is used for any other type.)"
+
+_KIND_CODES = {str: 1, float: 2, bool: 3, int: 4, list: 5, dict: 6}
+
+# Whether each kind code is for a list or dictionary
+_IS_CONTAINER = (False, False, False, False, False, True, True)
+
+
+def _kind_code(value):
+    """
+    Get the kind code for a value.
+    """
+    code = _KIND_CODES.get(type(value))
+    if code is not None:
+        return code
+
+    # Subclasses (bool is checked before int)
+    for t, code in _KIND_CODES.items():
+        if isinstance(value, t):
+            return code
+    return 0
+
+
+class DerekTree(Derek):
+    """
+    A tree representing a data structure, stored in flat arrays rather than
+    as one Derek node per value.
+
+    Nodes are identified by their index. The root node has index 0, and the
+    nodes are numbered breadth-first, so that the children of each node have
+    consecutive indices.
+
+    Only the root node is a Python object. The root node has the same
+    :meth:`example` and :meth:`parse` methods as a Derek node; its
+    :code:`children` are not made (and are :code:`None`).
+
+    Use :meth:`DerekTree.tree` to make a tree.
+
+    Attributes
+    ----------
+    parents: array
+        Index of the parent of each node (-1 for the root node).
+    kinds: array
+        Kind code for the value of each node. See :data:`derek._tree.KINDS`.
+    offsets: array
+        Index of the first child of each node, followed by the number of
+        nodes. The children of node :code:`i` have indices
+        :code:`range(offsets[i], offsets[i + 1])`.
+    keys: array
+        For each node that is a value in a dictionary, the index of its key
+        in :code:`key_names`. -1 for other nodes.
+    key_names: List
+        Distinct keys of the dictionaries in the tree.
+    """
+
+    __slots__ = "parents", "kinds", "offsets", "keys", "key_names", "_values"
+
+    # Type code of the index arrays
+    typecode = "i"
+
+    @classmethod
+    def tree(
+        cls,
+        obj: _typing.JSON,
+        parent: Optional[_typing.DerekType] = None,
+        name: Optional[str] = None,
+    ) -> "DerekTree":
+        """
+        Create a flat tree representation of :code:`obj`.
+
+        Parameters
+        ----------
+        obj: :data:`derek._typing.JSON`
+            A JSON-serializable dictionary/list.
+        parent
+            Parent node of the returned DerekTree instance.
+        name:
+            Name of the returned DerekTree instance.
+
+        Returns
+        -------
+        Tree representation of :code:`obj`, as a DerekTree instance.
+
+        :code:`obj` is identical (same :code:`id`) to `self.value`.
+        """
+        self = cls.__new__(cls)
+        self.parent = parent
+        self.children = None
+        self.value = obj
+        self.name = name
+
+        # (Built as lists, then converted to arrays)
+        values = [obj]
+        parents = [-1]
+        kinds = [_kind_code(obj)]
+        offsets = []
+        keys = [-1]
+        key_indices = {}
+        key_index = key_indices.setdefault
+        code_of = _KIND_CODES.get
+        is_container = _IS_CONTAINER.__getitem__
+
+        # Breadth-first: the children of each node are added to the end, so
+        # get consecutive indices. Only lists and dictionaries are visited;
+        # they are found in order of increasing index.
+        containers = [0] if is_container(kinds[0]) else []
+        for i in containers:
+            start = len(values)
+            # Nodes before i have no children, so their first "child" is here
+            offsets += [start] * (i + 1 - len(offsets))
+
+            value = values[i]
+            if isinstance(value, list):
+                items = value
+                keys += [-1] * len(value)
+            else:
+                items = value.values()
+                keys += [key_index(k, len(key_indices)) for k in value]
+
+            codes = list(map(code_of, map(type, items)))
+            if None in codes:
+                codes = list(map(_kind_code, items))
+            values += items
+            parents += [i] * len(codes)
+            kinds += codes
+            containers += compress(
+                range(start, start + len(codes)), map(is_container, codes)
+            )
+        offsets += [len(values)] * (len(values) + 1 - len(offsets))
+
+        typecode = cls.typecode
+        parents = array(typecode, parents)
+        kinds = array("b", kinds)
+        offsets = array(typecode, offsets)
+        keys = array(typecode, keys)
+        key_names = list(key_indices)
+
+        self.parents = parents
+        self.kinds = kinds
+        self.offsets = offsets
+        self.keys = keys
+        self.key_names = key_names
+        self._values = values
+        return self
+
+    def __len__(self) -> int:
+        """
+        Get the number of nodes in the tree.
+        """
+        return len(self._values)
+
+    def node_value(self, i: int) -> Any:
+        """
+        Get the value of a node.
+
+        Parameters
+        ----------
+        i:
+            Index of the node.
+
+        Returns
+        -------
+        Value of the node.
+        """
+        return self._values[i]
+
+    def node_children(self, i: int) -> range:
+        """
+        Get the indices of the children of a node.
+
+        Parameters
+        ----------
+        i:
+            Index of the node.
+
+        Returns
+        -------
+        range
+            Indices of the children, in order.
+        """
+        return range(self.offsets[i], self.offsets[i + 1])
+
+    def node_key(self, i: int) -> Any:
+        """
+        Get the key of a node in the dictionary containing it.
+
+        Parameters
+        ----------
+        i:
+            Index of the node.
+
+        Returns
+        -------
+        Key of the node, or None if the node is not a value in a dictionary.
+        """
+        index = self.keys[i]
+        return None if index < 0 else self.key_names[index]
+
+    @property
+    def index(self) -> "_index.PathIndex":
+        """
+        Index of the nodes in the tree, by path, made on first access. Nodes
+        are identified by index. See :class:`derek._index.PathIndex`.
+        """
+        index = getattr(self, "_index", None)
+        if index is None:
+            index = self._index = _index.PathIndex(self._expansion()[1], by_id=False)
+        return index
+
+    def _index_root(self):
+        """
+        Get the root item for looking up paths in :attr:`index`.
+        """
+        return 0
+
+    def _expansion(self):
+        """
+        Get the root item and expand function for walking the tree (see
+        :meth:`derek._parse._oas2._Engine.walk`).
+        """
+        values = self._values
+        offsets = self.offsets
+
+        def expand(i):
+            return values[i], range(offsets[i], offsets[i + 1])
+
+        return 0, expand
+
+    def example(self) -> _typing.JSON:
+        """
+        Generate example JSON-serializable dictionary from self.
+
+        The example yields the same schema as a tree created
+        with self.value.
+
+        Returns
+        -------
+        j: :data:`derek._typing.JSON`
+            Example, as a JSON-serializable dictionary.
+        """
+        return _example(self.value)
@@ -0,0 +1,78 @@
+import weakref
+from typing import Optional
+
+from ._derek import Derek
+
+from . import _typing
+
+
+class WeakDerek(Derek):
+    """
+    A node in a data structure, which only holds a weak reference to its
+    parent node.
+
+    In a tree of Derek nodes, each node references its parent, which
+    references it in turn, so the tree is one large reference cycle, only
+    freed by the cyclic garbage collector. A tree of WeakDerek nodes has no
+    reference cycles: it is freed by reference counting as soon as its root
+    node is no longer referenced, and never needs to be traversed by the
+    cyclic garbage collector to be freed.
+
+    :code:`parent` is :code:`None` once the parent node has been freed, so
+    keep a reference to the root node while navigating the tree.
+
+    This takes more memory than a tree of Derek nodes: each node keeps
+    Derek's :code:`parent` slot (unused, as :code:`parent` is a property
+    here) and adds a :code:`_parent` and a :code:`__weakref__` slot, and
+    each node but the root has a weak reference object (80 bytes) to its
+    parent. For 100,000 small dictionaries, a tree takes about 40% more
+    memory (96MB rather than 69MB), so prefer a Derek tree unless the time
+    spent by the garbage collector matters more.
+
+    Use :meth:`WeakDerek.tree`, or :code:`Derek.tree(obj, weak=True)`, to
+    make a tree. Parameters are the same as for :class:`derek.Derek`.
+    """
+
+    __slots__ = ("_parent", "__weakref__")
+
+    @property
+    def parent(self) -> Optional[_typing.DerekType]:
+        """
+        Parent node, or None if there is none (or it has been freed).
+        """
+        parent = self._parent
+        return None if parent is None else parent()
+
+    @parent.setter
+    def parent(self, parent: Optional[_typing.DerekType]):
+        # (Nodes other than WeakDerek nodes may not support weak references)
+        self._parent = None if parent is None else weakref.ref(parent)
+
+    @classmethod
+    def tree(
+        cls,
+        obj: _typing.JSON,
+        parent: Optional[_typing.DerekType] = None,
+        name: Optional[str] = None,
+    ) -> "WeakDerek":
+        """
+        Create a tree representation of :code:`obj`, without reference
+        cycles.
+
+        Parameters
+        ----------
+        obj: :data:`derek._typing.JSON`
+            A JSON-serializable dictionary/list.
+        parent
+            Parent node of the returned WeakDerek instance. Must support weak
+            references (as WeakDerek nodes do).
+        name:
+            Name of the returned WeakDerek instance.
+
+        Returns
+        -------
+        Tree representation of :code:`obj`, as a WeakDerek instance.
+
+        :code:`obj` is identical (same :code:`id`) to `self.value`.
+        """
+        return super().tree(obj, parent, name)
@@ -0,0 +1,52 @@
+"""
+Data structures and checks shared by the tests of the different trees.
+"""
+
+OBJS = [
+    1,
+    "a",
+    [],
+    {},
+    [1, 2, 3],
+    [True, 1.5, "a"],
+    [1, 1.0, True, 0.0, -0.0, "1"],
+    [1, 2.5, "a", True, [], {}],
+    {"a": 1, "b": [1, 2], "c": {"d": "e"}},
+    {"a": [1, 2], "b": [1, 2], "c": {"d": [1, 2]}},
+    {"a": [{"b": [1, 2]}, {"c": 3}], "d": {}, "e": [[], {"f": "g"}]},
+    {"a": [{"b": [3]}, {"c": 4}], "d": {}, "e": [[], {"f": "h"}]},
+    [{"a": 1, "b": "x"}, {"a": 2, "c": [True]}, {"b": "y"}],
+    [{"a": 1, "b": "x"}, {"a": 1, "b": "x"}, {"b": "x", "a": 1}, {"a": 1.0}],
+    [{"a": 1, "b": "x"}, {"a": 2, "c": [True]}, {"b": "y"}, [[1.5e3]]],
+    [[1, 2], [], [[3], {"a": []}]],
+    [[[1, 2], []], [[1, 2], []], [], {}, [{}]],
+]
+
+
+def check_same(node, other, cls):
+    """
+    Check that two trees of nodes have the same structure, visiting every
+    node.
+
+    Parameters
+    ----------
+    node:
+        Root node of the tree being checked.
+    other:
+        Root node of a tree of :class:`derek.Derek` nodes of the same data
+        structure.
+    cls:
+        Class that every node of the tree being checked must be.
+    """
+    stack = [(node, other)]
+    while stack:
+        node, other = stack.pop()
+        assert type(node) is cls
+        assert node.value is other.value
+        if other.children is None:
+            assert node.children is None
+        else:
+            assert len(node.children) == len(other.children)
+            for child in node.children:
+                assert child.parent is node
+            stack.extend(zip(node.children, other.children))
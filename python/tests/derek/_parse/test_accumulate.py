@@ -0,0 +1,144 @@
+import pickle
+
+import pytest
+
+from derek import Derek
+
+from derek._parse import _accumulate, _oas2
+
+
+@pytest.fixture
+def objs():
+    return [
+        {"a": 1, "b": "b1", "c": 3.0},
+        {"a": 4, "b": ["b2"]},
+        [1, 2, 3.0],
+        {"a": 4, "b": ["b2"]},
+        "d",
+    ]
+
+
+class Test_Accumulator:
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    def test_schema(self, objs, strategy):
+        """
+        Check that the schema is the same as for a tree made from all of the
+        elements.
+        """
+        accumulator = _accumulate.Accumulator(strategy)
+        for obj in objs:
+            accumulator.add(obj)
+
+        assert accumulator.count == len(objs)
+        assert accumulator.schema() == _oas2.oas2(Derek.tree(objs), strategy)
+
+    def test_empty(self):
+        """
+        Check the schema when no elements have been added.
+        """
+        accumulator = _accumulate.Accumulator()
+
+        assert accumulator.count == 0
+        assert accumulator.schema() == {"type": "array", "items": {}, "maxItems": 0}
+
+    def test_extend(self, objs):
+        """
+        Check that extending adds each element.
+        """
+        accumulator = _accumulate.Accumulator("inner_join")
+        accumulator.extend(iter(objs))
+
+        assert accumulator.count == len(objs)
+        assert accumulator.schema() == _oas2.oas2(Derek.tree(objs), "inner_join")
+
+    def test_schema_is_copy(self, objs):
+        """
+        Check that modifying a returned schema doesn't affect the accumulator.
+        """
+        accumulator = _accumulate.Accumulator("restricted")
+        accumulator.extend(objs)
+
+        schema = accumulator.schema()
+        schema["items"]["oneOf"][0]["properties"].clear()
+        assert accumulator.schema() == _oas2.oas2(Derek.tree(objs), "restricted")
+
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    def test_merge(self, objs, strategy):
+        """
+        Check that merging accumulators gives the same schema as adding all of
+        the elements to one accumulator.
+        """
+        first = _accumulate.Accumulator(strategy).extend(objs[:2])
+        second = _accumulate.Accumulator(strategy).extend(objs[2:])
+        first.merge(second)
+
+        assert first.count == len(objs)
+        assert first.parse() == Derek.tree(objs).parse(strategy=strategy)
+
+    def test_merge_strategies(self):
+        """
+        Check that accumulators with different strategies can't be merged.
+        """
+        with pytest.raises(ValueError):
+            _accumulate.Accumulator("permissive").merge(
+                _accumulate.Accumulator("inner_join")
+            )
+
+    def test_update_required(self):
+        """
+        Check that properties stop being required for "inner_join" once
+        elements without them are added.
+        """
+        accumulator = _accumulate.Accumulator("inner_join")
+
+        accumulator.extend([{"a": 1, "b": 2}, {"a": 3, "b": 4.0}])
+        assert accumulator.schema()["items"]["required"] == ["a", "b"]
+
+        accumulator.extend([{"a": 5}])
+        assert accumulator.schema()["items"]["required"] == ["a"]
+
+        accumulator.extend([{"b": 6}])
+        assert "required" not in accumulator.schema()["items"]
+
+    def test_pickle(self, objs):
+        """
+        Check that an unpickled accumulator continues from the same state.
+        """
+        accumulator = _accumulate.Accumulator("inner_join", name="polled")
+        accumulator.extend(objs[:3])
+
+        restored = pickle.loads(pickle.dumps(accumulator))
+        restored.extend(objs[3:])
+        accumulator.extend(objs[3:])
+
+        assert restored.count == accumulator.count
+        assert restored.parse() == accumulator.parse()
+
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    def test_parse(self, objs, strategy):
+        """
+        Check that the result is the same as for a tree made from all of the
+        elements.
+        """
+        accumulator = _accumulate.Accumulator(strategy, name="objs").extend(objs)
+
+        assert accumulator.parse("oas2") == Derek.tree(objs, name="objs").parse(
+            "oas2", strategy=strategy
+        )
+
+    def test_parse_format_not_implemented(self, objs):
+        """
+        Check if an unimplemented format raises correct Exception.
+        """
+        with pytest.raises(NotImplementedError):
+            _accumulate.Accumulator().extend(objs).parse("not_a_real_format")
+
+
+@pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+def test_oas2_stream(objs, strategy):
+    """
+    Check that the schema of a stream is the same as for a tree made from all
+    of the values.
+    """
+    result = _accumulate.oas2_stream(iter(objs), strategy=strategy, memo_size=1)
+    assert result == _oas2.oas2(Derek.tree(objs), strategy)
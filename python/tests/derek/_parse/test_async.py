@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+import pytest
+
+from derek import Derek
+
+from derek._parse import _async
+
+RECORDS = [
+    {"a": 1, "b": "b1", "c": 3.0},
+    {"a": 4, "b": ["b2"]},
+    [1, 2, 3.0],
+    "d",
+]
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def generate(records):
+    for record in records:
+        yield record
+
+
+class Test_accumulate_async:
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    def test_schema(self, strategy):
+        """
+        Check that the schema is the same as for a tree made from the records.
+        """
+        accumulator = run(
+            _async.accumulate_async(generate(RECORDS), 2, strategy=strategy)
+        )
+
+        assert accumulator.count == len(RECORDS)
+        assert accumulator.parse() == Derek.tree(RECORDS).parse(strategy=strategy)
+
+    def test_stream_reader(self):
+        """
+        Try reading NDJSON lines from a StreamReader.
+        """
+
+        async def main():
+            reader = asyncio.StreamReader()
+            lines = [json.dumps(record) for record in RECORDS]
+            reader.feed_data(("\n".join(lines) + "\n\n").encode())
+            reader.feed_eof()
+            return await _async.accumulate_async(reader)
+
+        assert run(main()).parse() == Derek.tree(RECORDS).parse()
+
+    def test_yields(self):
+        """
+        Check that other tasks run while records are added.
+        """
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(len(ticks))
+                await asyncio.sleep(0)
+
+        async def main():
+            task = asyncio.ensure_future(ticker())
+            await asyncio.sleep(0)
+            before = len(ticks)
+            await _async.accumulate_async(generate(RECORDS * 10), 4)
+            task.cancel()
+            return len(ticks) - before
+
+        assert run(main()) >= len(RECORDS * 10) // 4
+
+    @pytest.mark.parametrize("yield_every", [0, -1])
+    def test_yield_every_invalid(self, yield_every):
+        """
+        Check that a yield_every that would never yield is rejected before
+        any record is read.
+        """
+        read = []
+
+        async def source():
+            for record in RECORDS:
+                read.append(record)
+                yield record
+
+        with pytest.raises(ValueError):
+            run(_async.accumulate_async(source(), yield_every))
+        with pytest.raises(ValueError):
+            run(Derek.ainfer(source(), yield_every=yield_every))
+        assert read == []
+
+
+class Test_ainfer:
+    def test_ainfer(self):
+        """
+        Check that the result is the same as for a tree made from the records.
+        """
+        result = run(Derek.ainfer(generate(RECORDS), name="records"))
+        assert result == Derek.tree(RECORDS, name="records").parse()
+
+    def test_format_not_implemented(self):
+        """
+        Check if an unimplemented format raises correct Exception.
+        """
+        with pytest.raises(NotImplementedError):
+            run(Derek.ainfer(generate(RECORDS), format="not_a_real_format"))
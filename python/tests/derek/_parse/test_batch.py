@@ -0,0 +1,77 @@
+import pytest
+
+from derek import Derek, Parser
+
+from derek._parse import _batch, _oas2
+
+from .._corpus import OBJS
+
+
+class Test_oas2_batch:
+    @pytest.mark.parametrize(
+        "strategy", ["permissive", "restricted", "inner_join", "deep_join"]
+    )
+    def test_schema(self, strategy):
+        """
+        Check that each schema is the same as for a tree made from its value.
+        """
+        schemas = _batch.oas2_batch(OBJS, strategy=strategy)
+
+        assert list(schemas) == [str(i) for i in range(len(OBJS))]
+        for i, obj in enumerate(OBJS):
+            assert schemas[str(i)] == _oas2.oas2(Derek.tree(obj), strategy)
+
+    def test_example(self):
+        schemas = _batch.oas2_batch(OBJS, example=True)
+        for i, obj in enumerate(OBJS):
+            assert schemas[str(i)]["example"] == Derek.tree(obj).example()
+
+    def test_names(self):
+        schemas = Parser.oas3_batch(iter([[1], {"a": "b"}]), names=iter(["x", "y"]))
+
+        assert schemas == {
+            "x": {"type": "array", "items": {"type": "integer"}},
+            "y": {"type": "object", "additionalProperties": {"type": "string"}},
+        }
+
+    @pytest.mark.parametrize("names", [["x"], ["x", "y", "z"], ["x", "x"]])
+    def test_bad_names(self, names):
+        with pytest.raises(ValueError):
+            _batch.oas2_batch([1, 2], names)
+
+    def test_independent(self):
+        """
+        Check that schemas of values with the same shape share no
+        dictionaries or lists, so can be modified separately.
+        """
+        schemas = _batch.oas2_batch([{"a": [1]}, {"a": [2]}], example=True)
+        schemas["0"]["additionalProperties"]["items"]["type"] = "string"
+
+        assert schemas["1"] == {
+            "type": "object",
+            "additionalProperties": {"type": "array", "items": {"type": "integer"}},
+            "example": {"a": [2]},
+        }
+
+    def test_strategy_not_implemented(self):
+        with pytest.raises(NotImplementedError):
+            _batch.oas2_batch([1], strategy="unknown")
+
+
+class Test_infer_batch:
+    def test_infer_batch(self):
+        """
+        Check that the results are the same as parsing a tree of each value.
+        """
+        names = ["n{}".format(i) for i in range(len(OBJS))]
+        expected = {}
+        for name, obj in zip(names, OBJS):
+            expected.update(
+                Derek.tree(obj, name=name).parse("oas3", strategy="restricted")
+            )
+
+        assert Derek.infer_batch(OBJS, names, strategy="restricted") == expected
+
+    def test_format_not_implemented(self):
+        with pytest.raises(NotImplementedError):
+            Derek.infer_batch([1], format="unknown")
@@ -0,0 +1,202 @@
+import json
+from array import array
+from collections import OrderedDict
+from time import perf_counter
+
+import pytest
+
+from derek import Derek, DerekTree, Parser
+
+from derek._parse import _cache, _stats, _trace
+
+OBJ = {"a": [{"b": 1}, {"b": "x", "c": [1.5]}], "d": True}
+
+
+@pytest.fixture
+def cache():
+    cache = _cache.SchemaCache(maxsize=2)
+    previous = _cache.set_schema_cache(cache)
+    try:
+        yield cache
+    finally:
+        _cache.set_schema_cache(previous)
+
+
+class Test_SchemaCache:
+    def test_default(self):
+        assert _cache.get_schema_cache() is None
+
+    @pytest.mark.parametrize("strategy", ["permissive", "inner_join"])
+    def test_schema(self, cache, strategy):
+        """
+        Check that the schema is the same as without the cache, whether or
+        not it was found in the cache.
+        """
+        expected = Parser.oas2(Derek.tree(OBJ), strategy, example=True)
+        assert _cache.get_schema_cache() is cache
+        assert cache.info() == {"hits": 0, "misses": 1, "size": 1, "maxsize": 2}
+
+        for tree in [Derek.tree(OBJ), DerekTree.tree(OBJ), Derek.tree(dict(OBJ))]:
+            assert Parser.oas2(tree, strategy, example=True) == expected
+        assert (cache.hits, cache.misses) == (3, 1)
+
+    def test_options(self, cache):
+        """
+        Check that schemas for different strategies, or with and without
+        examples, are kept separately.
+        """
+        tree = Derek.tree(OBJ)
+        restricted = Parser.oas2(tree, "restricted")
+        assert "example" in Parser.oas2(tree, "restricted", example=True)
+        assert Parser.oas2(tree, "restricted") == restricted
+        assert Parser.oas2(tree, "inner_join") != restricted
+        assert (cache.hits, cache.misses) == (1, 3)
+
+    def test_content(self, cache):
+        """
+        Check that data structures differing in any value have separate
+        schemas.
+        """
+        assert Parser.oas2(Derek.tree([1])) == {
+            "type": "array",
+            "items": {"type": "integer"},
+        }
+        assert Parser.oas2(Derek.tree([1.0])) == {
+            "type": "array",
+            "items": {"type": "number"},
+        }
+        assert Parser.oas2(Derek.tree([True])) == {
+            "type": "array",
+            "items": {"type": "boolean"},
+        }
+        assert (cache.hits, cache.misses) == (0, 3)
+
+    def test_types(self, cache):
+        """
+        Check that values with the same JSON encoding, but of different
+        types, don't share a schema.
+        """
+        expected = Derek.tree({"1": [1]}).parse(strategy="restricted")
+        Derek.tree({1: [1]}).parse(strategy="restricted")
+        assert Derek.tree({"1": [1]}).parse(strategy="restricted") == expected
+
+        Parser.oas2(Derek.tree([1, 2]))
+        with pytest.raises(NotImplementedError):
+            Parser.oas2(Derek.tree((1, 2)))
+        # (Only for the repeated {"1": [1]})
+        assert cache.hits == 1
+
+    def test_key(self):
+        key = _cache.SchemaCache.key
+        values = [[1], [1.0], [True], ["1"], (1,), {"1": 1}, {1: 1}, {True: 1}]
+        assert len({key(value, "restricted") for value in values}) == len(values)
+        assert key([1], "restricted") != key([1], "inner_join")
+
+    def test_key_shared(self):
+        """
+        Check that the key doesn't depend on which values are the same
+        object.
+        """
+        key = _cache.SchemaCache.key
+        item = {"a": [1.5]}
+        assert key([item, item]) == key([item, {"a": [1.5]}])
+
+        looped = []
+        looped.append(looped)
+        assert key(looped) is None
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            [object()],
+            [array("d", [1.5])],
+            {"a": memoryview(b"a")},
+            [type("Str", (str,), {})("a")],
+            {"a": OrderedDict()},
+        ],
+    )
+    def test_key_not_cached(self, value):
+        assert _cache.SchemaCache.key(value, "restricted") is None
+
+    def test_hit_cost(self, cache):
+        """
+        Check that a schema found in the cache costs much less than
+        extracting it.
+        """
+        obj = [
+            {"id": i, "name": str(i), "tags": ["a"], "owner": {"score": i / 2}}
+            for i in range(20000)
+        ]
+        tree = Derek.tree(obj)
+
+        def best(repeat=3):
+            times = []
+            for _ in range(repeat):
+                start = perf_counter()
+                Parser.oas2(tree)
+                times.append(perf_counter() - start)
+            return min(times)
+
+        _cache.set_schema_cache(None)
+        parse = best()
+        _cache.set_schema_cache(cache)
+        Parser.oas2(tree)
+        assert best() < parse / 4
+
+    def test_copy(self, cache):
+        """
+        Check that modifying a returned schema doesn't affect the cache.
+        """
+        expected = json.loads(json.dumps(Parser.oas2(Derek.tree(OBJ))))
+        Parser.oas2(Derek.tree(OBJ))["additionalProperties"]["oneOf"].clear()
+        Parser.oas2(Derek.tree(OBJ))["type"] = "string"
+
+        assert Parser.oas2(Derek.tree(OBJ)) == expected
+        assert (cache.hits, cache.misses) == (3, 1)
+
+    def test_lru(self, cache):
+        for obj in [[1], ["a"], [1], [True], ["a"], [1]]:
+            Parser.oas2(Derek.tree(obj))
+
+        # [1] was used more recently than ["a"] when [True] was added
+        assert (cache.hits, cache.misses) == (1, 5)
+        assert len(cache) == 2
+
+    def test_parse(self, cache):
+        """
+        Check that Derek.parse uses the cache.
+        """
+        expected = Derek.tree(OBJ, name="x").parse()
+        assert Derek.tree(OBJ, name="x").parse() == expected
+        assert cache.hits == 1
+
+    def test_not_cached(self, cache):
+        """
+        Check that the cache isn't used when statistics are collected, or
+        for values that can't be encoded as JSON.
+        """
+        Parser.oas2(Derek.tree(OBJ), stats=_stats.PathStats())
+        assert (cache.hits, cache.misses) == (0, 0)
+
+        with pytest.raises(NotImplementedError):
+            Parser.oas2(Derek.tree([{1, 2}]))
+        assert (cache.hits, cache.misses, len(cache)) == (0, 1, 0)
+
+    def test_tracer(self, cache):
+        """
+        Check that the cache is used when timings are collected, and that
+        its hits and misses are counted.
+        """
+        tracer = _trace.Tracer()
+        expected = Parser.oas2(Derek.tree(OBJ), tracer=tracer)
+        assert Parser.oas2(Derek.tree(OBJ), tracer=tracer) == expected
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert tracer.counts["cache_hit"] == tracer.counts["cache_miss"] == 1
+        assert tracer.timings["walk"][0] == 1
+
+    def test_clear(self, cache):
+        Parser.oas2(Derek.tree(OBJ))
+        Parser.oas2(Derek.tree(OBJ))
+        cache.clear()
+
+        assert cache.info() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 2}
@@ -0,0 +1,153 @@
+import io
+import json
+import sys
+
+import pytest
+
+from derek import Derek
+
+from derek._parse import _events
+
+DOCUMENTS = [
+    "1",
+    '"a"',
+    "[]",
+    "{}",
+    '[1, 2.5, "a", true, [], {}]',
+    '{"a": [{"b": [1, 2]}, {"c": 3}], "d": {}, "e": [[], {"f": "g"}]}',
+    '[{"a": 1, "b": "x"}, {"a": 2, "c": [true]}, {"b": "y"}, [[1.5e3]]]',
+]
+
+
+class Test_iter_events:
+    def test_events(self):
+        """
+        Check the events for a document.
+        """
+        document = '{"a": [1, 2.5, "b\\\\", false, null], "c": {}}'
+        events = list(_events.iter_events(io.StringIO(document)))
+
+        assert events == [
+            ("start_map", None),
+            ("map_key", "a"),
+            ("start_array", None),
+            ("integer", 1),
+            ("number", 2.5),
+            ("string", "b\\"),
+            ("boolean", False),
+            ("null", None),
+            ("end_array", None),
+            ("map_key", "c"),
+            ("start_map", None),
+            ("end_map", None),
+            ("end_map", None),
+        ]
+
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    @pytest.mark.parametrize("bufsize", [1, 2, 5, 65536])
+    def test_bufsize(self, document, bufsize):
+        """
+        Check that the events don't depend on how much is read at a time,
+        for text and binary files.
+        """
+        expected = list(_events.iter_events(io.StringIO(document)))
+
+        assert list(_events.iter_events(io.StringIO(document), bufsize)) == expected
+        data = document.encode()
+        assert list(_events.iter_events(io.BytesIO(data), bufsize)) == expected
+
+    def test_unicode(self):
+        """
+        Check that multi-byte characters split between reads are decoded.
+        """
+        document = '{"é中": ["\U0001f600", "\\u00e9"]}'
+        events = _events.iter_events(io.BytesIO(document.encode()), 1)
+        assert [value for _, value in events if value is not None] == [
+            "é中",
+            "\U0001f600",
+            "é",
+        ]
+
+    def test_long_token(self):
+        """
+        Check that the reads grow while a key or value is incomplete, so that
+        it isn't scanned again for each read.
+        """
+        string, number = "a" * 100000, "1" * 4000
+        document = '{"%s": ["%s", %s]}' % (string, string, number)
+        file = io.StringIO(document)
+        sizes = []
+
+        def read(size):
+            sizes.append(size)
+            return io.StringIO.read(file, size)
+
+        file.read = read
+        events = list(_events.iter_events(file, 16))
+        assert events[1] == ("map_key", string)
+        assert events[3] == ("string", string)
+        assert events[4] == ("integer", int(number))
+        assert len(sizes) < 100
+
+    @pytest.mark.parametrize(
+        "document",
+        ["", "[", "[1,]", '{"a" 1}', "[1] 2", "tru", "{1: 2}", "[1 2]", '"a', "[}"],
+    )
+    def test_invalid(self, document):
+        """
+        Check that invalid documents raise JSONDecodeError.
+        """
+        with pytest.raises(json.JSONDecodeError):
+            list(_events.iter_events(io.StringIO(document), 2))
+
+
+class Test_oas2_events:
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    def test_schema(self, document, strategy):
+        """
+        Check that the schema is the same as for a tree made from the
+        decoded document.
+        """
+        expected = Derek.tree(json.loads(document)).parse(
+            format="oas2", strategy=strategy
+        )["untitled"]
+
+        events = _events.iter_events(io.StringIO(document))
+        assert _events.oas2_events(events, strategy, example=True) == expected
+
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    def test_repeated_keys(self, strategy):
+        """
+        Check that the last value of a repeated key is used, like json.load.
+        """
+        document = '[{"a": 1, "b": "c", "a": [1.5]}, {"a": "d", "a": 1}]'
+        expected = Derek.tree(json.loads(document)).parse(
+            format="oas2", strategy=strategy
+        )["untitled"]
+
+        events = _events.iter_events(io.StringIO(document))
+        assert _events.oas2_events(events, strategy, example=True) == expected
+
+    def test_deep(self):
+        """
+        Try converting a document nested far deeper than the recursion limit.
+        """
+        depth = 20 * sys.getrecursionlimit()
+        document = "[" * depth + "1" + "]" * depth
+
+        events = _events.iter_events(io.StringIO(document))
+        result = _events.oas2_events(events)
+        for _ in range(depth):
+            assert result["type"] == "array"
+            result = result["items"]
+        assert result == {"type": "integer"}
+
+    def test_null_not_implemented(self):
+        events = _events.iter_events(io.StringIO("[1, null]"))
+        with pytest.raises(NotImplementedError):
+            _events.oas2_events(events)
+
+    def test_incomplete(self):
+        with pytest.raises(ValueError):
+            _events.oas2_events([("start_array", None), ("integer", 1)])
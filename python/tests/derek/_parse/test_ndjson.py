@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from derek import Derek
+
+from derek._parse import _ndjson
+
+RECORDS = [
+    {"a": 1, "b": "b1", "c": 3.0},
+    {"a": 4, "b": ["b2"]},
+    [1, 2, 3.0],
+    {"a": 4, "b": ["b2"], "d": {"e": True}},
+    "d",
+    {"a": 5, "b": "b3"},
+]
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "records.jsonl"
+    lines = [json.dumps(record) for record in RECORDS]
+    # (With a blank line, and a Windows line ending)
+    lines.insert(2, "")
+    lines[3] += "\r"
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+class Test_ndjson_accumulator:
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    @pytest.mark.parametrize("workers", [None, 1, 2])
+    def test_schema(self, path, strategy, workers):
+        """
+        Check that the schema is the same as for a tree made from the records.
+        """
+        accumulator = _ndjson.ndjson_accumulator(path, workers, strategy=strategy)
+
+        assert accumulator.count == len(RECORDS)
+        assert accumulator.parse() == Derek.tree(RECORDS).parse(strategy=strategy)
+
+    @pytest.mark.parametrize("chunksize", [1, 10, 1000])
+    def test_chunksize(self, path, chunksize):
+        """
+        Check that the size of the chunks doesn't change the schema.
+        """
+        accumulator = _ndjson.ndjson_accumulator(path, 2, chunksize)
+        assert accumulator.parse() == Derek.tree(RECORDS).parse()
+
+    @pytest.mark.parametrize("workers", [None, 2])
+    def test_empty(self, tmp_path, workers):
+        """
+        Try reading an empty file.
+        """
+        path = tmp_path / "empty.jsonl"
+        path.write_text("")
+
+        accumulator = _ndjson.ndjson_accumulator(str(path), workers)
+        assert accumulator.count == 0
+        assert accumulator.parse() == Derek.tree([]).parse()
+
+    def test_no_trailing_newline(self, tmp_path):
+        path = tmp_path / "records.jsonl"
+        path.write_text('{"a": 1}\n{"a": "b"}')
+
+        accumulator = _ndjson.ndjson_accumulator(str(path), 2, 1)
+        assert accumulator.parse() == Derek.tree([{"a": 1}, {"a": "b"}]).parse()
+
+
+def test__split(path):
+    """
+    Check that chunks end at line boundaries, and cover the file.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    chunks = _ndjson._split(path, len(data), 10)
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(data)
+    for (_, end), (start, _) in zip(chunks, chunks[1:]):
+        assert end == start
+        assert data[end - 1 : end] == b"\n"
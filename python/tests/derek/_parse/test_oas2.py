@@ -1,10 +1,11 @@
 import json
+import sys
 
 import pytest
 
 from derek import Derek
 
-from derek._parse import _oas2
+from derek._parse import _oas2, _stats
 
 
 @pytest.fixture
@@ -45,7 +46,220 @@ def schemas():
     ]
 
 
-class Test__oas2_list:
+class Test_oas2:
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    def test_deep_list(self, strategy):
+        """
+        Try parsing a list nested far deeper than the recursion limit.
+        """
+        depth = 20 * sys.getrecursionlimit()
+        obj = "a"
+        for _ in range(depth):
+            obj = [obj]
+
+        result = _oas2.oas2(Derek.tree(obj), strategy=strategy)
+        for _ in range(depth):
+            assert result.keys() == {"type", "items"}
+            assert result["type"] == "array"
+            result = result["items"]
+        assert result == {"type": "string"}
+
+    @pytest.mark.parametrize("strategy", ["restricted", "inner_join"])
+    def test_deep_dict(self, strategy):
+        """
+        Try parsing a dictionary nested far deeper than the recursion limit.
+        """
+        depth = 20 * sys.getrecursionlimit()
+        obj = 1
+        for _ in range(depth):
+            obj = {"a": obj, "b": 2.0}
+
+        result = _oas2.oas2(Derek.tree(obj), strategy=strategy)
+        for _ in range(depth):
+            assert result["type"] == "object"
+            assert result["properties"]["b"] == {"type": "number"}
+            result = result["properties"]["a"]
+        assert result == {"type": "integer"}
+
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    @pytest.mark.parametrize("memo_size", [0, 1, 2])
+    def test_memo_size(self, strategy, memo_size):
+        """
+        Check that the memo size doesn't change the result.
+        """
+        obj = [
+            {"a": [1, {"b": "c"}], "d": {"b": "c"}},
+            {"a": [1, {"b": "c"}], "d": {"b": 2}},
+            [{"b": "c"}, {"b": 2}, [1, 2.0]],
+            {"a": [1, {"b": "c"}], "d": {"b": "c"}},
+        ]
+        node = Derek.tree(obj)
+
+        assert _oas2.oas2(node, strategy, memo_size=memo_size) == _oas2.oas2(
+            node, strategy
+        )
+
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    def test_no_shared_subschemas(self, strategy):
+        """
+        Check that no dictionary/list appears twice in the result, even when
+        subschemas are reused for repeated shapes.
+        """
+        address = {"street": "a", "number": 1}
+        obj = {"home": dict(address), "work": dict(address), "other": [address]}
+        result = _oas2.oas2(Derek.tree(obj), strategy)
+
+        seen = set()
+        stack = [result]
+        while stack:
+            j = stack.pop()
+            assert id(j) not in seen
+            seen.add(id(j))
+            values = j.values() if isinstance(j, dict) else j
+            stack.extend(v for v in values if isinstance(v, (dict, list)))
+
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    @pytest.mark.parametrize(
+        "obj",
+        [
+            1,
+            [],
+            {},
+            [[], {}, [1]],
+            {"a": [{"b": [1, 2]}, {"c": 3}], "d": {}, "e": [[], {"f": "g"}]},
+            [[[1, {"a": [2.0]}]], "h"],
+        ],
+    )
+    def test_example(self, obj, strategy):
+        """
+        Check that the example made while parsing is the same as
+        Derek.example.
+        """
+        node = Derek.tree(obj)
+        result = _oas2.oas2(node, strategy, example=True)
+
+        example = result.pop("example")
+        assert example == node.example()
+        assert repr(example) == repr(node.example())
+        assert result == _oas2.oas2(node, strategy)
+
+    def test_example_shares_scalars(self):
+        """
+        Check that the example shares scalar values, but not lists or
+        dictionaries, with the data structure.
+        """
+        obj = {"a": "x" * 100, "b": [[]], "c": {}}
+        example = _oas2.oas2(Derek.tree(obj), example=True)["example"]
+
+        assert example["a"] is obj["a"]
+        assert example["b"] == [[]] and example["b"][0] is not obj["b"][0]
+        assert example["c"] == {} and example["c"] is not obj["c"]
+
+    def test_strategy_not_implemented(self, node):
+        """
+        Check if an unimplemented strategy raises correct Exception.
+        """
+        with pytest.raises(NotImplementedError):
+            _oas2.oas2(node, strategy="not_a_real_strategy")
+
+
+class Test__Engine:
+    @pytest.mark.parametrize(
+        "strategy", ["permissive", "restricted", "inner_join", "deep_join"]
+    )
+    def test_shared(self, strategy):
+        """
+        Check that visiting each list/dictionary once, for a value containing
+        the same objects more than once, doesn't change the result.
+        """
+        address = {"street": "a", "number": [1, 2.0]}
+        obj = [{"home": address, "work": address}, [address, {}], address]
+        node = Derek.tree(obj)
+
+        engine = _oas2._Engine(strategy)
+        result = engine.run(node, _oas2._expand_node, example=True, shared=True)
+        expected = _oas2._Engine(strategy).run(node, example=True)
+        assert result == expected
+
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    def test_memo(self, strategy):
+        """
+        Check that one subschema is memoized per distinct shape.
+        """
+        obj = [{"a": i, "b": [str(i)]} for i in range(100)]
+        engine = _oas2._Engine(strategy)
+        engine.run(Derek.tree(obj))
+
+        # ["0"], {"a": 0, "b": ["0"]}, and the root list
+        assert len(engine.memo) == 3
+
+    def test_memo_size(self):
+        """
+        Check that the least recently used shapes are dropped from the memo.
+        """
+        obj = [[1], [1.0], ["1"], [1]]
+        engine = _oas2._Engine("restricted", memo_size=2)
+        engine.run(Derek.tree(obj))
+
+        assert len(engine.memo) == 2
+        # [1] was used most recently before the root list
+        (key, _), _ = engine.memo.items()
+        assert key == (list, ("integer",))
+
+    @pytest.mark.parametrize(
+        "strategy", ["permissive", "restricted", "inner_join", "deep_join"]
+    )
+    def test_scalar_lists(self, strategy):
+        """
+        Check that the elements of lists of scalars aren't visited, and that
+        the result is the same as when they are (as when statistics are
+        kept).
+        """
+        obj = {
+            "a": [1.5] * 100,
+            "b": ["x", 1, "y", True, 2.5, 2],
+            "c": [[1, 2], ["z"], [1, {"d": [3]}]],
+            "e": [[]],
+        }
+        expanded = []
+
+        def expand(value):
+            expanded.append(value)
+            return _oas2._expand_value(value)
+
+        result = _oas2._Engine(strategy).run(obj, expand, example=True)
+        # (Every value except the elements of the lists of scalars)
+        assert len(expanded) == 12
+
+        expected = _oas2._Engine(strategy).run(
+            Derek.tree(obj), example=True, stats=_stats.PathStats()
+        )
+        assert result == expected
+
+        del expanded[:]
+        result = _oas2._Engine(strategy).run([1.5] * 100, expand, example=True)
+        assert len(expanded) == 1
+        assert result == {
+            "type": "array",
+            "items": {"type": "number"},
+            "example": [1.5],
+        }
+
+
+def test__scalar_kinds():
+    assert _oas2._scalar_kinds([1.5, 2.5]) == ["number"]
+    assert _oas2._scalar_kinds(["a", 1, True, 1.0, 2]) == [
+        "string",
+        "integer",
+        "boolean",
+        "number",
+    ]
+    assert _oas2._scalar_kinds([1, [2]]) is None
+    assert _oas2._scalar_kinds([[1], 2]) is None
+    assert _oas2._scalar_kinds([1, None]) is None
+
+
+class Test__list_schema:
     @pytest.fixture(scope="class")
     def node(self):
         obj = [{"a": 1, "b": "b1", "c": 3.0}, {"a": 4, "b": ["b2"]}, [1, 2, 3.0]]
@@ -53,7 +267,9 @@ class Test__oas2_list:
         return Derek.tree(obj)
 
     def test_permissive(self, node):
-        result = _oas2._oas2_list(node, strategy="permissive")
+        subschemas = [_oas2.oas2(c, strategy="permissive") for c in node.children]
+        result = _oas2._list_schema(subschemas, strategy="permissive")
+        assert _oas2.oas2(node, strategy="permissive") == result
 
         assert result == {
             "type": "array",
@@ -92,7 +308,9 @@ class Test__oas2_list:
         }
 
     def test_restricted(self, node):
-        result = _oas2._oas2_list(node, strategy="restricted")
+        subschemas = [_oas2.oas2(c, strategy="restricted") for c in node.children]
+        result = _oas2._list_schema(subschemas, strategy="restricted")
+        assert _oas2.oas2(node, strategy="restricted") == result
 
         assert result == {
             "type": "array",
@@ -127,7 +345,9 @@ class Test__oas2_list:
         }
 
     def test_inner_join(self, node):
-        result = _oas2._oas2_list(node, strategy="inner_join")
+        subschemas = [_oas2.oas2(c, strategy="inner_join") for c in node.children]
+        result = _oas2._list_schema(subschemas, strategy="inner_join")
+        assert _oas2.oas2(node, strategy="inner_join") == result
 
         assert result == {
             "type": "array",
@@ -161,7 +381,7 @@ class Test__oas2_list:
         }
 
 
-class Test__oas2_dict:
+class Test__dict_schema:
     @pytest.fixture(scope="class")
     def node(self):
         obj = {"a": 1, "b": "b1", "c": 3.0}
@@ -169,7 +389,9 @@ class Test__oas2_dict:
         return Derek.tree(obj)
 
     def test_permissive(self, node):
-        result = _oas2._oas2_dict(node, strategy="permissive")
+        subschemas = [_oas2.oas2(c, strategy="permissive") for c in node.children]
+        result = _oas2._dict_schema(node.value.keys(), subschemas, "permissive")
+        assert _oas2.oas2(node, strategy="permissive") == result
 
         assert result == {
             "type": "object",
@@ -183,7 +405,9 @@ class Test__oas2_dict:
         }
 
     def test_restricted(self, node):
-        result = _oas2._oas2_dict(node, strategy="restricted")
+        subschemas = [_oas2.oas2(c, strategy="restricted") for c in node.children]
+        result = _oas2._dict_schema(node.value.keys(), subschemas, "restricted")
+        assert _oas2.oas2(node, strategy="restricted") == result
 
         assert result == {
             "type": "object",
@@ -195,7 +419,9 @@ class Test__oas2_dict:
         }
 
     def test_inner_join(self, node):
-        result = _oas2._oas2_dict(node, strategy="inner_join")
+        subschemas = [_oas2.oas2(c, strategy="inner_join") for c in node.children]
+        result = _oas2._dict_schema(node.value.keys(), subschemas, "inner_join")
+        assert _oas2.oas2(node, strategy="inner_join") == result
 
         assert result == {
             "type": "object",
@@ -207,102 +433,180 @@ class Test__oas2_dict:
         }
 
 
-class Test__get_subschemas:
-    def test_permissive(self, node):
-        result = _oas2._get_subschemas(node, strategy="permissive")
+def test__merge_schemas(schemas):
+    merged = _oas2._merge_schemas(schemas)
+    assert merged == [
+        {"type": "object"},
+        {"type": "string"},
+        {
+            "items": {"oneOf": [{"type": "number"}, {"type": "integer"}]},
+            "type": "array",
+        },
+    ]
 
-        assert result == [
-            {
-                "additionalProperties": {
-                    "oneOf": [
-                        {"type": "integer"},
-                        {"type": "string"},
-                        {"type": "number"},
-                    ]
-                },
-                "type": "object",
-            },
-            {
-                "additionalProperties": {
-                    "oneOf": [
-                        {"type": "integer"},
-                        {"items": {"type": "string"}, "type": "array"},
-                    ]
-                },
-                "type": "object",
-            },
-            {
-                "items": {"oneOf": [{"type": "integer"}, {"type": "number"}]},
-                "type": "array",
-            },
-        ]
 
-    def test_restricted(self, node):
-        result = _oas2._get_subschemas(node, strategy="restricted")
+def test__merge_objects(schemas):
+    merged = _oas2._merge_objects(schemas)
+    assert merged == {"type": "object"}
 
-        assert result == [
-            {
+
+def test__merge_objects_many():
+    """
+    Check the properties and required keys merged from many object schemas,
+    with shared, equal and distinct subschemas.
+    """
+    integer = {"type": "integer"}
+    schemas = [
+        {"type": "object", "properties": {"a": integer, "b": {"type": "string"}}}
+        for _ in range(1000)
+    ]
+    schemas += [
+        {
+            "type": "object",
+            "properties": {"a": {"type": "number"}, str(i): {"type": "integer"}},
+        }
+        for i in range(1000)
+    ]
+    schemas.append({"properties": {"a": {"type": "integer"}}, "type": "object"})
+
+    merged = _oas2._merge_objects(schemas)
+    assert list(merged["properties"]) == ["a", "b"] + [str(i) for i in range(1000)]
+    assert merged["properties"]["a"] == {
+        "oneOf": [{"type": "integer"}, {"type": "number"}]
+    }
+    assert merged["properties"]["b"] == {"type": "string"}
+    assert merged["properties"]["999"] == {"type": "integer"}
+    assert merged["required"] == ["a"]
+
+
+class Test__deep_merge:
+    def test_nested(self):
+        """
+        Check that objects and arrays are merged at every depth.
+        """
+        obj = [
+            {"name": "a", "tags": [{"k": 1}], "address": {"city": "x"}},
+            {"name": "b", "tags": [{"k": 2, "v": "z"}, {"v": "q"}]},
+            {"tags": [], "address": {"zip": 1}},
+        ]
+        result = _oas2.oas2(Derek.tree(obj), "deep_join")
+        assert result == {
+            "type": "array",
+            "items": {
+                "type": "object",
                 "properties": {
-                    "a": {"type": "integer"},
-                    "b": {"type": "string"},
-                    "c": {"type": "number"},
+                    "name": {"type": "string"},
+                    "tags": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "k": {"type": "integer"},
+                                "v": {"type": "string"},
+                            },
+                        },
+                    },
+                    "address": {
+                        "type": "object",
+                        "properties": {
+                            "city": {"type": "string"},
+                            "zip": {"type": "integer"},
+                        },
+                    },
                 },
-                "type": "object",
+                "required": ["tags"],
             },
+        }
+
+    def test_alternatives(self):
+        """
+        Check that the alternatives of oneOfs are merged, keeping one
+        subschema per type.
+        """
+        schemas = [
             {
-                "properties": {
-                    "a": {"type": "integer"},
-                    "b": {"items": {"type": "string"}, "type": "array"},
-                },
-                "type": "object",
+                "oneOf": [
+                    {"type": "integer"},
+                    {"type": "array", "items": {}, "maxItems": 0},
+                ]
             },
+            {"type": "array", "items": {"type": "string"}},
             {
-                "items": {"oneOf": [{"type": "integer"}, {"type": "number"}]},
                 "type": "array",
+                "items": {"oneOf": [{"type": "string"}, {"type": "number"}]},
             },
+            {"type": "integer"},
         ]
+        assert _oas2._deep_merge(schemas) == {
+            "oneOf": [
+                {"type": "integer"},
+                {
+                    "type": "array",
+                    "items": {"oneOf": [{"type": "string"}, {"type": "number"}]},
+                },
+            ]
+        }
 
-    def test_inner_join(self, node):
-        result = _oas2._get_subschemas(node, strategy="inner_join")
-
-        assert result == [
+    def test_required(self):
+        """
+        Check that properties are only required if required by every object.
+        """
+        schemas = [
             {
-                "properties": {
-                    "a": {"type": "integer"},
-                    "b": {"type": "string"},
-                    "c": {"type": "number"},
-                },
                 "type": "object",
+                "properties": {"a": {"type": "integer"}},
+                "required": ["a"],
             },
             {
-                "properties": {
-                    "a": {"type": "integer"},
-                    "b": {"items": {"type": "string"}, "type": "array"},
-                },
                 "type": "object",
+                "properties": {"a": {"type": "integer"}, "b": {"type": "string"}},
+                "required": ["a", "b"],
             },
-            {
-                "items": {"oneOf": [{"type": "integer"}, {"type": "number"}]},
-                "type": "array",
-            },
+            {"type": "object", "properties": {"b": {"type": "string"}}},
         ]
+        assert _oas2._deep_merge(schemas) == {
+            "type": "object",
+            "properties": {"a": {"type": "integer"}, "b": {"type": "string"}},
+        }
+        assert _oas2._deep_merge(schemas[:2]) == {
+            "type": "object",
+            "properties": {"a": {"type": "integer"}, "b": {"type": "string"}},
+            "required": ["a"],
+        }
 
+    def test_size(self):
+        """
+        Check that the schema doesn't grow with the number of distinct
+        nested objects.
+        """
+        obj = [{"items": [{"options": [{str(i): i}]}]} for i in range(100)]
+        result = _oas2.oas2(Derek.tree(obj), "deep_join")
 
-def test__merge_schemas(schemas):
-    merged = _oas2._merge_schemas(schemas)
-    assert merged == [
-        {"type": "object"},
-        {"type": "string"},
-        {
-            "items": {"oneOf": [{"type": "number"}, {"type": "integer"}]},
-            "type": "array",
-        },
-    ]
-
+        options = result["items"]["properties"]["items"]["items"]["properties"]
+        assert options["options"]["items"] == {
+            "type": "object",
+            "properties": {str(i): {"type": "integer"} for i in range(100)},
+        }
 
-def test__merge_objects(schemas):
-    merged = _oas2._merge_objects(schemas)
-    assert merged == {"type": "object"}
+    def test_deep(self):
+        """
+        Check that schemas nested far deeper than the recursion limit are
+        merged.
+        """
+        depth = 20 * sys.getrecursionlimit()
+        obj = ["a"]
+        for _ in range(depth):
+            obj = [obj, [1]]
+
+        result = _oas2.oas2(Derek.tree(obj), "deep_join")
+        # Follow the array subschemas (one per level, merged with [1])
+        arrays = 0
+        while result.get("type") == "array":
+            arrays += 1
+            alternatives = result["items"].get("oneOf", [result["items"]])
+            assert [a["type"] for a in alternatives].count("array") <= 1
+            result = alternatives[0]
+        assert arrays == depth + 1
 
 
 def test__oneOf(schemas):
@@ -374,6 +678,101 @@ def test__unique_schemas(schemas):
     ]
 
 
+@pytest.mark.parametrize("ordered", [True, False])
+def test__unique_schemas_key_order(ordered):
+    """
+    Check that schemas differing only in the order of their keys are
+    duplicates.
+    """
+    schemas = [
+        {"type": "array", "items": {"type": "integer"}},
+        {"items": {"type": "integer"}, "type": "array"},
+    ]
+
+    assert _oas2._unique_schemas(schemas, ordered=ordered) == schemas[:1]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test__unique_schemas_many(ordered):
+    """
+    Check that duplicates are removed from many distinct schemas.
+    """
+    distinct = [
+        {"type": "object", "properties": {str(i): {"type": "integer"}}}
+        for i in range(100)
+    ]
+    # Same schemas, with keys in a different order
+    shuffled = [
+        {"properties": {str(i): {"type": "integer"}}, "type": "object"}
+        for i in reversed(range(100))
+    ]
+
+    result = _oas2._unique_schemas(distinct + shuffled, ordered=ordered)
+    if ordered:
+        assert result == distinct
+    else:
+        assert sorted(map(json.dumps, result)) == sorted(map(json.dumps, distinct))
+
+
+def test__unique_schemas_deep():
+    """
+    Check that duplicates are removed from schemas nested far deeper than the
+    recursion limit.
+    """
+    depth = 20 * sys.getrecursionlimit()
+    schemas = [{"type": "string"}, {"type": "string"}]
+    for _ in range(depth):
+        schemas = [{"type": "array", "items": s} for s in schemas]
+
+    assert _oas2._unique_schemas(schemas, ordered=True) == schemas[:1]
+
+
+class Test__Fingerprints:
+    def test_equal(self):
+        """
+        Check that equal schemas have the same fingerprint.
+        """
+        fingerprint = _oas2._Fingerprints()
+        a = {"oneOf": [{"type": "integer"}, {"type": "string"}]}
+        b = {"oneOf": [{"type": "integer"}, {"type": "string"}]}
+
+        assert fingerprint(a) == fingerprint(b)
+        assert fingerprint(a) == fingerprint(a)
+
+    def test_not_equal(self):
+        """
+        Check that schemas that are not equal have different fingerprints.
+        """
+        fingerprint = _oas2._Fingerprints()
+        schemas = [
+            {"oneOf": [{"type": "integer"}, {"type": "string"}]},
+            {"oneOf": [{"type": "string"}, {"type": "integer"}]},
+            {"type": "array", "items": {}, "maxItems": 0},
+            {"type": "array", "items": {"type": "integer"}},
+            {"type": "array", "items": {"type": "string"}},
+            {"type": "object", "properties": {}},
+            {"type": "object", "properties": {"a": {"type": "integer"}}},
+            {"type": "object", "properties": {"b": {"type": "integer"}}},
+            {"type": "integer"},
+        ]
+
+        assert len(set(map(fingerprint, schemas))) == len(schemas)
+
+    def test_cache_limit(self):
+        """
+        Check that fingerprints are unchanged once the cache is emptied.
+        """
+        fingerprint = _oas2._Fingerprints(maxsize=2)
+        schemas = [
+            {"type": "array", "items": {"type": "array", "items": {"type": t}}}
+            for t in ["integer", "string", "number", "boolean"]
+        ]
+
+        before = list(map(fingerprint, schemas))
+        after = [fingerprint(json.loads(json.dumps(s))) for s in schemas]
+        assert before == after
+
+
 def test__split_schemas_by_type(schemas):
     split = _oas2._split_schemas_by_type(schemas)
     assert split == {
@@ -0,0 +1,102 @@
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import derek
+from derek import Derek
+
+from derek._parse import _parallel
+
+
+@pytest.fixture
+def obj():
+    return [
+        {"a": 1, "b": "b1", "c": 3.0},
+        {"a": 4, "b": ["b2"]},
+        [1, 2, 3.0],
+        {"a": 4, "b": ["b2"], "d": {"e": True}},
+        "d",
+        {"a": 5, "b": "b3"},
+    ]
+
+
+class Test_oas2_parallel:
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    @pytest.mark.parametrize("chunksize", [None, 1, 4])
+    def test_schema(self, obj, strategy, chunksize):
+        """
+        Check that the schema is the same as when parsed in this process.
+        """
+        expected = Derek.tree(obj).parse(format="oas2", strategy=strategy)
+        del expected["untitled"]["example"]
+
+        schema = _parallel.oas2_parallel(obj, strategy, 2, chunksize=chunksize)
+        assert schema == expected["untitled"]
+
+    @pytest.mark.parametrize("strategy", ["permissive", "inner_join"])
+    def test_not_forked(self, obj, strategy, monkeypatch):
+        """
+        Check that the schema is the same when chunks are sent to the workers.
+        """
+        monkeypatch.setattr(
+            _parallel, "get_start_method", lambda allow_none=False: "spawn"
+        )
+        expected = Derek.tree(obj).parse(format="oas2", strategy=strategy)
+        del expected["untitled"]["example"]
+
+        schema = _parallel.oas2_parallel(obj, strategy, 2, chunksize=2)
+        assert schema == expected["untitled"]
+
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    def test_parse_workers(self, obj, strategy):
+        """
+        Check that parsing with workers gives the same result.
+        """
+        tree = Derek.tree(obj)
+        assert tree.parse(strategy=strategy, workers=2) == tree.parse(strategy=strategy)
+
+    def test_parse_workers_not_list(self):
+        """
+        Check that parsing a dictionary with workers is done in this process.
+        """
+        tree = Derek.tree({"a": [1, 2], "b": "c"})
+        assert tree.parse(workers=2) == tree.parse()
+
+    def test_strategy_not_implemented(self, obj):
+        with pytest.raises(NotImplementedError):
+            _parallel.oas2_parallel(obj, "something", 2)
+
+    def test_threads(self):
+        """
+        Check that lists converted at the same time, from several threads,
+        don't get mixed up.
+        """
+        objs = [[{"a": 1}] * 2000, [{"b": "x"}] * 2000]
+        with ThreadPoolExecutor(2) as executor:
+            futures = [
+                executor.submit(_parallel.oas2_parallel, obj, "restricted", 2)
+                for obj in objs * 2
+            ]
+        for obj, future in zip(objs * 2, futures):
+            expected = Derek.tree(obj).parse(format="oas2", strategy="restricted")
+            del expected["untitled"]["example"]
+            assert future.result() == expected["untitled"]
+
+    def test_start_method_not_fixed(self):
+        """
+        Check that converting a list doesn't fix the start method of the
+        process, so that it can still be set afterwards.
+        """
+        code = (
+            "import multiprocessing\n"
+            "from derek._parse import _parallel\n"
+            "_parallel.oas2_parallel([1, 2, 3], workers=2)\n"
+            "print(multiprocessing.get_start_method(allow_none=True))\n"
+        )
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.path.dirname(os.path.dirname(derek.__file__))
+        output = subprocess.check_output([sys.executable, "-c", code], env=env)
+        assert output.strip() == b"None"
@@ -0,0 +1,215 @@
+import pytest
+
+from derek import Derek, DerekDAG, DerekTree, LazyDerek, Parser
+
+from derek._parse import _stats
+
+OBJ = {
+    "a": [{"b": 1, "c": "xy"}, {"b": 2.5, "c": "hello"}, {"b": 3}],
+    "d": [[], [1, 2]],
+    "e": True,
+}
+
+
+class Test_PathStats:
+    def test_report(self):
+        """
+        Check the statistics for each path.
+        """
+        stats = _stats.PathStats()
+        Parser.oas2(Derek.tree(OBJ), stats=stats)
+        assert stats.report() == {
+            (): {
+                "count": 1,
+                "types": {"object": 1},
+                "minProperties": 3,
+                "maxProperties": 3,
+            },
+            ("a",): {
+                "count": 1,
+                "types": {"array": 1},
+                "minItems": 3,
+                "maxItems": 3,
+            },
+            ("a", None): {
+                "count": 3,
+                "types": {"object": 3},
+                "minProperties": 1,
+                "maxProperties": 2,
+            },
+            ("a", None, "b"): {
+                "count": 3,
+                "types": {"integer": 2, "number": 1},
+                "minimum": 1.0,
+                "maximum": 3.0,
+            },
+            ("a", None, "c"): {
+                "count": 2,
+                "types": {"string": 2},
+                "minLength": 2,
+                "maxLength": 5,
+            },
+            ("d",): {
+                "count": 1,
+                "types": {"array": 1},
+                "minItems": 2,
+                "maxItems": 2,
+            },
+            ("d", None): {
+                "count": 2,
+                "types": {"array": 2},
+                "minItems": 0,
+                "maxItems": 2,
+            },
+            ("d", None, None): {
+                "count": 2,
+                "types": {"integer": 2},
+                "minimum": 1,
+                "maximum": 2,
+            },
+            ("e",): {"count": 1, "types": {"boolean": 1}},
+        }
+
+    def test_scalar(self):
+        """
+        Check the statistics of a scalar.
+        """
+        stats = _stats.PathStats()
+        Parser.oas2(Derek.tree("abc"), stats=stats)
+        assert stats.report() == {
+            (): {
+                "count": 1,
+                "types": {"string": 1},
+                "minLength": 3,
+                "maxLength": 3,
+            }
+        }
+
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    @pytest.mark.parametrize("cls", [Derek, DerekTree, LazyDerek, DerekDAG])
+    def test_trees(self, strategy, cls):
+        """
+        Check that the statistics and schema are the same for each kind of
+        tree (including trees with shared nodes).
+        """
+        obj = [OBJ, OBJ, {"a": [{"b": -1}]}]
+
+        expected = _stats.PathStats()
+        schema = Parser.oas2(Derek.tree(obj), strategy, stats=expected)
+        assert schema == Parser.oas2(Derek.tree(obj), strategy)
+
+        stats = _stats.PathStats()
+        assert Parser.oas2(cls.tree(obj), strategy, stats=stats) == schema
+        assert stats.report() == expected.report()
+        assert stats.report()[(None, "a", None, "b")] == {
+            "count": 7,
+            "types": {"integer": 5, "number": 2},
+            "minimum": -1.0,
+            "maximum": 3.0,
+        }
+
+    def test_workers(self):
+        """
+        Check that statistics are kept when workers are requested.
+        """
+        stats = _stats.PathStats()
+        Parser.oas2(Derek.tree([1, 2]), workers=2, stats=stats)
+        assert stats.report()[(None,)]["count"] == 2
+
+    def test_annotate_inner_join(self):
+        """
+        Check the keywords added to an "inner_join" schema.
+        """
+        stats = _stats.PathStats()
+        schema = Parser.oas2(Derek.tree(OBJ), "inner_join", stats=stats)
+        assert stats.annotate(schema) == {
+            "type": "object",
+            "properties": {
+                "a": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "b": {
+                                "oneOf": [
+                                    {"type": "integer", "minimum": 1, "maximum": 3},
+                                    {"type": "number", "minimum": 2.5, "maximum": 2.5},
+                                ]
+                            },
+                            "c": {"type": "string", "minLength": 2, "maxLength": 5},
+                        },
+                        "required": ["b"],
+                        "minProperties": 1,
+                        "maxProperties": 2,
+                    },
+                    "minItems": 3,
+                    "maxItems": 3,
+                },
+                "d": {
+                    "type": "array",
+                    "items": {
+                        "oneOf": [
+                            {
+                                "type": "array",
+                                "items": {},
+                                "minItems": 0,
+                                "maxItems": 0,
+                            },
+                            {
+                                "type": "array",
+                                "items": {
+                                    "type": "integer",
+                                    "minimum": 1,
+                                    "maximum": 2,
+                                },
+                                "minItems": 0,
+                                "maxItems": 2,
+                            },
+                        ]
+                    },
+                    "minItems": 2,
+                    "maxItems": 2,
+                },
+                "e": {"type": "boolean"},
+            },
+            "minProperties": 3,
+            "maxProperties": 3,
+        }
+
+    def test_annotate_permissive(self):
+        """
+        Check that the subschema of the values of a dictionary describes each
+        of its keys.
+        """
+        obj = {"a": 1, "b": 5, "c": "text"}
+        stats = _stats.PathStats()
+        schema = Parser.oas2(Derek.tree(obj), stats=stats)
+        assert stats.annotate(schema) == {
+            "type": "object",
+            "additionalProperties": {
+                "oneOf": [
+                    {"type": "integer", "minimum": 1, "maximum": 5},
+                    {"type": "string", "minLength": 4, "maxLength": 4},
+                ]
+            },
+            "minProperties": 3,
+            "maxProperties": 3,
+        }
+
+    def test_annotate_empty(self):
+        """
+        Check that a schema is unchanged if no statistics were kept.
+        """
+        schema = {"type": "integer"}
+        assert _stats.PathStats().annotate(schema) == {"type": "integer"}
+
+    def test_annotate_not_schema(self):
+        """
+        Check that the result of parse, rather than the schema in it, is
+        rejected.
+        """
+        stats = _stats.PathStats()
+        result = Derek.tree(OBJ).parse(stats=stats)
+        with pytest.raises(ValueError):
+            stats.annotate(result)
+        assert stats.annotate(result["untitled"])["minProperties"] == 3
@@ -0,0 +1,147 @@
+from array import array
+
+import pytest
+
+from derek import Derek, DerekTree, Parser
+
+from derek._parse import _stats, _trace
+
+OBJ = [
+    {"a": [1, "x", {"b": 2.0}], "c": {"d": True}},
+    {"a": [1, "x", {"b": 2.0}], "c": {"d": True}},
+    {"a": [], "e": 1},
+]
+
+
+class Recorder:
+    """
+    Tracer recording every call.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def phase(self, name, seconds):
+        self.calls.append(("phase", name))
+
+    def count(self, name, n=1):
+        self.calls.append(("count", name, n))
+
+    def size(self, name, n):
+        self.calls.append(("size", name, n))
+
+
+class TestTracer:
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    def test_schema(self, strategy):
+        """
+        Check that tracing doesn't change the schema.
+        """
+        tracer = _trace.Tracer()
+        schema = Parser.oas2(Derek.tree(OBJ), strategy, tracer=tracer)
+        assert schema == Parser.oas2(Derek.tree(OBJ), strategy)
+
+    def test_report(self):
+        tracer = _trace.Tracer()
+        Parser.oas2(DerekTree.tree(OBJ), "inner_join", tracer=tracer)
+        report = tracer.report()
+
+        assert set(report["timings"]) == {
+            "walk",
+            "combine",
+            "unshare",
+            "split_schemas_by_type",
+            "merge_objects",
+            "unique_schemas",
+        }
+        assert report["timings"]["walk"]["calls"] == 1
+        assert all(t["seconds"] >= 0 for t in report["timings"].values())
+
+        assert report["counts"] == {
+            "memo_hit": 4,
+            "memo_miss": 6,
+            "node:integer": 3,
+            "node:number": 2,
+            "node:string": 2,
+            "node:array": 4,
+            "node:object": 7,
+            "node:boolean": 2,
+        }
+        assert report["sizes"]["oneOf"] == {"calls": 1, "mean": 3.0, "max": 3}
+
+    def test_callback(self):
+        """
+        Check that any object with the tracer methods can be used.
+        """
+        tracer = Recorder()
+        Parser.oas2(Derek.tree([1, "a"]), tracer=tracer)
+        assert tracer.calls == [
+            ("phase", "unique_schemas"),
+            ("size", "unique_schemas", 2),
+            ("size", "oneOf", 2),
+            ("phase", "combine"),
+            ("phase", "walk"),
+            ("count", "memo_miss", 1),
+            ("count", "node:integer", 1),
+            ("count", "node:string", 1),
+            ("count", "node:array", 1),
+        ]
+
+    def test_stats(self):
+        """
+        Check that only the nodes of this call are counted, when statistics
+        are also kept.
+        """
+        stats = _stats.PathStats()
+        Parser.oas2(Derek.tree([1, 2]), stats=stats)
+
+        tracer = _trace.Tracer()
+        Parser.oas2(Derek.tree([3]), stats=stats, tracer=tracer)
+        assert tracer.counts["node:integer"] == 1
+        assert stats.totals()["integer"] == 3
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            OBJ,
+            [[1, 2.0, "a", 3], [True], {"a": ["b", "c"]}],
+            [1, 2.0, True],
+            [array("d", [1.5]), [array("q", [1, 2])]],
+            "a",
+        ],
+    )
+    def test_counts(self, value):
+        """
+        Check that nodes are counted as in the statistics of each path,
+        including the elements of lists of scalars, which aren't visited.
+        """
+        stats = _stats.PathStats()
+        Parser.oas2(Derek.tree(value), stats=stats)
+        tracer = _trace.Tracer()
+        Parser.oas2(Derek.tree(value), tracer=tracer)
+
+        expected = {"node:" + k: n for k, n in stats.totals().items() if n}
+        counts = {k: n for k, n in tracer.counts.items() if k.startswith("node:")}
+        assert counts == expected
+
+    def test_counts_shared(self):
+        """
+        Check that a list or dictionary met again in a shared tree is counted
+        without its children.
+        """
+        tracer = _trace.Tracer()
+        Parser.oas2(Derek.tree(OBJ, intern=True), tracer=tracer)
+        # (The second element of OBJ is the same node as the first)
+        assert tracer.counts["node:object"] == 5
+        assert tracer.counts["node:array"] == 3
+        assert tracer.counts["node:integer"] == 2
+
+    def test_workers(self):
+        """
+        Check that the schema is still made by worker processes, timed as a
+        whole.
+        """
+        tracer = _trace.Tracer()
+        schema = Parser.oas2(Derek.tree(OBJ), workers=2, tracer=tracer)
+        assert schema == Parser.oas2(Derek.tree(OBJ))
+        assert set(tracer.timings) == {"workers"}
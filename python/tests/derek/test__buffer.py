@@ -0,0 +1,110 @@
+import ctypes
+from array import array
+
+import pytest
+
+from derek import Derek, DerekTree
+
+from derek import _buffer
+
+
+def matrix():
+    """
+    A 3 x 2 ctypes array, with a format with a byte order ("<i"), which
+    memoryview can't unpack.
+    """
+    rows = [(ctypes.c_int * 2)(i, i + 1) for i in range(3)]
+    return (ctypes.c_int * 2 * 3)(*rows)
+
+
+def as_list(value):
+    """
+    Copy a buffer as nested lists.
+    """
+    if isinstance(value, ctypes.Array):
+        return [as_list(item) for item in value]
+    elif isinstance(value, (array, memoryview)):
+        return value.tolist()
+    return value
+
+
+BUFFERS = [
+    array("d", [1.5, 2.5]),
+    array("q", [1, 2, 3]),
+    array("u", "ab"),
+    array("d"),
+    memoryview(bytes(range(6))).cast("B", (2, 3)),
+    memoryview(bytes([1, 0])).cast("?"),
+    (ctypes.c_double * 3)(1.5, 2, 3),
+    matrix(),
+    (ctypes.c_int * 0 * 2)(),
+]
+
+
+class Test_layout:
+    def test_layout(self):
+        assert _buffer.layout(array("f", [1])) == ("number", (1,))
+        assert _buffer.layout(array("u", "ab")) == ("string", (2,))
+        assert _buffer.layout(memoryview(bytes(6)).cast("B", (3, 2))) == (
+            "integer",
+            (3, 2),
+        )
+        assert _buffer.layout(memoryview(bytes(1)).cast("?")) == ("boolean", (1,))
+        assert _buffer.layout(matrix()) == ("integer", (3, 2))
+
+    @pytest.mark.parametrize("value", [1, "a", b"a", bytearray(b"a"), [1], None])
+    def test_not_buffer(self, value):
+        assert _buffer.layout(value) is None
+
+    def test_not_supported(self):
+        assert _buffer.layout((ctypes.c_char * 2)()) == (None, (2,))
+
+
+class Test_example:
+    @pytest.mark.parametrize("value", BUFFERS)
+    def test_example(self, value):
+        """
+        Check that the example is the same as for the buffer as nested
+        lists.
+        """
+        _, shape = _buffer.layout(value)
+        expected = Derek.tree(as_list(value)).example()
+        assert _buffer.example(value, shape) == expected
+
+
+class Test_parse:
+    @pytest.mark.parametrize("value", BUFFERS)
+    @pytest.mark.parametrize(
+        "strategy", ["permissive", "restricted", "inner_join", "deep_join"]
+    )
+    def test_parse(self, value, strategy):
+        """
+        Check that the schema and example are the same as for the buffer as
+        nested lists, in any tree.
+        """
+        obj = {"a": value, "b": [[1.5], value, value]}
+        copy = {"a": as_list(value), "b": [[1.5], as_list(value), as_list(value)]}
+        expected = Derek.tree(copy).parse(strategy=strategy)
+
+        root = Derek.tree(value).parse(strategy=strategy)
+        assert root == Derek.tree(as_list(value)).parse(strategy=strategy)
+        assert Derek.tree(obj).parse(strategy=strategy) == expected
+        assert DerekTree.tree(obj).parse(strategy=strategy) == expected
+        assert Derek.tree(obj, intern=True).parse(strategy=strategy) == expected
+        assert Derek.tree(obj).example() == expected["untitled"]["example"]
+
+    def test_not_supported(self):
+        with pytest.raises(NotImplementedError):
+            Derek.tree([(ctypes.c_char * 2)()]).parse()
+
+    def test_numpy(self):
+        numpy = pytest.importorskip("numpy")
+        obj = {
+            "a": numpy.arange(6, dtype=">i4").reshape(2, 3),
+            "b": numpy.array([1.5, 2.5])[::-1],
+            "c": numpy.zeros((2, 0)),
+            "d": numpy.array([True]),
+        }
+        expected = Derek.tree({k: v.tolist() for k, v in obj.items()}).parse()
+
+        assert Derek.tree(obj).parse() == expected
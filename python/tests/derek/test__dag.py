@@ -0,0 +1,96 @@
+import sys
+
+import pytest
+
+from derek._derek import Derek
+from derek._dag import DerekDAG
+
+from ._corpus import OBJS
+
+
+class Test_DerekDAG:
+    def test_shared(self):
+        """
+        Check that structurally identical subtrees share a node.
+        """
+        address = {"street": "a", "number": 1}
+        obj = [{"home": address}, {"home": dict(address)}, {"home": [address]}]
+        root = DerekDAG.tree(obj, name="some_tree")
+
+        assert root.value is obj
+        assert root.name == "some_tree"
+        assert root.parent is None
+
+        first, second, third = root.children
+        assert first is second
+        assert first.value is obj[0]
+        assert first.parent is root
+        assert third is not first
+        assert third.children[0].children[0] is first.children[0]
+
+        # (Leaves too)
+        street, number = first.children[0].children
+        assert street.parent is first.children[0]
+
+    def test_not_shared(self):
+        """
+        Check that values which are equal, but of different types, don't
+        share a node.
+        """
+        root = DerekDAG.tree([1, 1.0, True, 0.0, -0.0, [1], [True], {"a": 1}])
+        assert len({id(child) for child in root.children}) == 8
+
+    def test_intern(self):
+        """
+        Try making a tree with Derek.tree(obj, intern=True).
+        """
+        obj = {"a": [1], "b": [1]}
+        root = Derek.tree(obj, intern=True)
+
+        assert isinstance(root, DerekDAG)
+        assert root.children[0] is root.children[1]
+
+    def test_lazy_and_intern(self):
+        with pytest.raises(ValueError):
+            Derek.tree([], lazy=True, intern=True)
+
+    def test_unhashable(self):
+        """
+        Try making a tree containing unhashable values.
+        """
+        value = set()
+        root = DerekDAG.tree([value, value])
+        assert [child.value for child in root.children] == [value, value]
+
+    @pytest.mark.parametrize("obj", OBJS)
+    def test_example(self, obj):
+        """
+        Try generating an example, comparing with Derek.
+        """
+        example = DerekDAG.tree(obj).example()
+        assert repr(example) == repr(Derek.tree(obj).example())
+
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    @pytest.mark.parametrize("obj", OBJS)
+    def test_parse(self, obj, strategy):
+        """
+        Try parsing, comparing with Derek.
+        """
+        result = DerekDAG.tree(obj).parse(strategy=strategy)
+        assert repr(result) == repr(Derek.tree(obj).parse(strategy=strategy))
+
+    def test_deep(self):
+        """
+        Try making and parsing a tree nested deeper than the recursion limit.
+        """
+        depth = 20 * sys.getrecursionlimit()
+        obj = 1
+        for _ in range(depth):
+            obj = [obj, [1]]
+
+        root = DerekDAG.tree(obj)
+        schema = root.parse(format="oas2")["untitled"]
+        for _ in range(depth):
+            assert schema["type"] == "array"
+            schema = schema["items"]["oneOf"][0]
+        assert schema == {"type": "integer"}
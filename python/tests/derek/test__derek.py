@@ -1,3 +1,6 @@
+import json
+import sys
+
 import pytest
 
 from derek._derek import Derek
@@ -182,6 +185,78 @@ class Test_Tree(TreeBaseTest):
 
         self.check(*args)
 
+    def test_children(self):
+        """
+        Try making a Derek tree from a dict in list (depth 2), then check
+        that each child node refers to its parent and to its value.
+        """
+
+        obj = [{"a": 1, "b": [2, 3]}, 4]
+        node = Derek.tree(obj)
+
+        assert len(node.children) == 2
+        for child, item in zip(node.children, obj):
+            assert child.parent is node
+            assert child.value is item
+            assert child.name is None
+
+        a, b = node.children[0].children
+        assert a.value == 1 and a.children is None
+        assert b.value is obj[0]["b"]
+        assert [c.value for c in b.children] == [2, 3]
+        assert node.children[1].children is None
+
+    def test_scalar_list(self):
+        """
+        Check that the child nodes of a list of scalars are only made when
+        first accessed, and are the same as for any other list.
+        """
+        obj = {"a": [1.5, 2, "x", True], "b": [{"c": [3] * 10}]}
+        node = Derek.tree(obj)
+        a = node.children[0]
+        c = node.children[1].children[0].children[0]
+
+        assert len(a.children) == 4 and a.children._nodes is None
+        assert node.example() == {"a": [1.5], "b": [{"c": [3]}]}
+        assert node.parse() == Derek.tree(obj, lazy=True).parse()
+        assert a.children._nodes is None and c.children._nodes is None
+
+        assert [child.value for child in a.children] == obj["a"]
+        assert a.children[1] is list(a.children)[1]
+        for child in a.children:
+            assert type(child) is Derek
+            assert child.parent is a
+            assert child.children is None
+            assert child.name is None
+        assert len(c.children) == 10 and c.children[-1].value == 3
+
+    def test_empty_containers(self):
+        """
+        Try making Derek trees from an empty list and an empty dict.
+        """
+
+        assert Derek.tree([]).children == []
+        assert Derek.tree({}).children == []
+
+    def test_deep_nesting(self):
+        """
+        Try making a Derek tree from a list nested far deeper than the
+        recursion limit.
+        """
+
+        depth = 20 * sys.getrecursionlimit()
+        obj = 1
+        for _ in range(depth):
+            obj = [obj]
+
+        node = Derek.tree(obj)
+        for _ in range(depth):
+            (child,) = node.children
+            assert child.parent is node
+            node = child
+        assert node.value == 1
+        assert node.children is None
+
 
 class Test_Example:
     def test_non_iterable(self):
@@ -322,6 +397,28 @@ class Test_Example:
         node = Derek.tree(obj)
         assert node.example() == [{"d": 1, "e": 2, "f": 3}]
 
+    def test_visits_once(self, monkeypatch):
+        """
+        Check that the example of each node is made only once, so that the
+        time taken doesn't double with each level of nested lists.
+        """
+        calls = []
+        example = Derek.example
+
+        def counted(self):
+            calls.append(self)
+            return example(self)
+
+        monkeypatch.setattr(Derek, "example", counted)
+
+        obj = expected = 1
+        for _ in range(20):
+            obj = [obj, 2]
+            expected = [expected]
+        assert Derek.tree(obj).example() == expected
+        # (Each list and the innermost element)
+        assert len(calls) == 21
+
 
 class Test_Parser:
     def test_parser_class(self):
@@ -448,3 +545,140 @@ class Test_Parse:
     def test_parse_with_name(self):
         node = Derek(value=1, name="test")
         assert node.parse() == {"test": {"example": 1, "type": "integer"}}
+
+    def test_parse_deep(self):
+        """
+        Try parsing a tree nested far deeper than the recursion limit,
+        including the example.
+        """
+        depth = 20 * sys.getrecursionlimit()
+        obj = "a"
+        for _ in range(depth):
+            obj = {"b": [obj]}
+
+        result = Derek.tree(obj).parse()["untitled"]
+        example = result["example"]
+        for _ in range(depth):
+            example = example["b"][0]
+        assert example == "a"
+
+
+class Test_InferStream:
+    @pytest.fixture
+    def objs(self):
+        return [{"a": 1, "b": "b1", "c": 3.0}, {"a": 4, "b": ["b2"]}]
+
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    def test_same_as_parse(self, objs, strategy):
+        """
+        Check if Derek.infer_stream produces the same result as Derek().parse
+        for a tree made from all of the values.
+        """
+
+        j = Derek.infer_stream(iter(objs), strategy=strategy, name="stream")
+        assert j == Derek.tree(objs, name="stream").parse(strategy=strategy)
+
+    def test_empty(self):
+        """
+        Check if Derek.infer_stream produces the same result as Derek().parse
+        for an empty list.
+        """
+
+        j = Derek.infer_stream(iter([]))
+        assert j == {
+            "untitled": {
+                "type": "array",
+                "items": {},
+                "maxItems": 0,
+                "example": [],
+            }
+        }
+
+    def test_format_not_implemented(self, objs):
+        """
+        Check if an unimplemented format raises correct Exception.
+        """
+        with pytest.raises(NotImplementedError):
+            Derek.infer_stream(objs, format="not_a_real_format")
+
+    def test_deep(self, monkeypatch):
+        """
+        Check that a first value nested deeper than the recursion limit is
+        converted, without making a tree of Derek nodes.
+        """
+        obj = expected = 1
+        for _ in range(sys.getrecursionlimit() + 100):
+            obj = [obj, 2]
+            expected = [expected]
+
+        def tree(*args, **kwargs):
+            raise AssertionError("Made a tree")
+
+        expected_result = Derek.tree([obj, 3]).parse()
+        monkeypatch.setattr(Derek, "tree", tree)
+        result = Derek.infer_stream(iter([obj, 3]))
+
+        # (Comparing the results needs a higher recursion limit)
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(4 * limit)
+        try:
+            assert result == expected_result
+            assert result["untitled"]["example"] == [expected]
+        finally:
+            sys.setrecursionlimit(limit)
+
+
+class Test_FromNDJSON:
+    @pytest.fixture
+    def path(self, tmp_path):
+        path = tmp_path / "records.jsonl"
+        path.write_text('{"a": 1, "b": "b1"}\n{"a": 4, "b": ["b2"]}\n')
+        return str(path)
+
+    @pytest.mark.parametrize("workers", [None, 2])
+    def test_from_ndjson(self, path, workers):
+        """
+        Check that the result is the same as for a tree made from the records.
+        """
+        obj = [{"a": 1, "b": "b1"}, {"a": 4, "b": ["b2"]}]
+
+        assert Derek.from_ndjson(
+            path, name="records", workers=workers, strategy="inner_join"
+        ) == Derek.tree(obj, name="records").parse(strategy="inner_join")
+
+    def test_format_not_implemented(self, path):
+        """
+        Check if an unimplemented format raises correct Exception.
+        """
+        with pytest.raises(NotImplementedError):
+            Derek.from_ndjson(path, format="not_a_real_format")
+
+
+class Test_FromJSON:
+    obj = [{"a": 1, "b": "b1"}, {"a": 4, "b": ["b2"]}]
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        path = tmp_path / "document.json"
+        path.write_text(json.dumps(self.obj))
+        return str(path)
+
+    def test_path(self, path):
+        """
+        Check that the result is the same as for a tree made from the
+        document.
+        """
+        assert Derek.from_json(
+            path, name="document", strategy="inner_join"
+        ) == Derek.tree(self.obj, name="document").parse(strategy="inner_join")
+
+    def test_file(self, path):
+        with open(path) as f:
+            assert Derek.from_json(f, bufsize=3) == Derek.tree(self.obj).parse()
+
+    def test_format_not_implemented(self, path):
+        """
+        Check if an unimplemented format raises correct Exception.
+        """
+        with pytest.raises(NotImplementedError):
+            Derek.from_json(path, format="not_a_real_format")
@@ -0,0 +1,34 @@
+import gc
+
+import pytest
+
+from derek._gc import paused_gc
+
+
+class Test_paused_gc:
+    def test_paused(self):
+        assert gc.isenabled()
+        with paused_gc():
+            assert not gc.isenabled()
+        assert gc.isenabled()
+
+    def test_error(self):
+        """
+        Check that the collector is enabled again when the block raises.
+        """
+        with pytest.raises(ValueError):
+            with paused_gc():
+                raise ValueError
+        assert gc.isenabled()
+
+    def test_disabled(self):
+        """
+        Check that the collector stays disabled if it was already.
+        """
+        gc.disable()
+        try:
+            with paused_gc():
+                pass
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
@@ -0,0 +1,123 @@
+import pytest
+
+from derek import Derek, DerekDAG, DerekTree, LazyDerek
+
+from derek import _index
+
+OBJ = {
+    "items": [
+        {"owner": {"id": 1}, "tags": ["a", "b"]},
+        {"owner": {"id": 2}, "tags": []},
+        {"owner": "nobody"},
+    ],
+    "a/b": {"~": 3},
+    "*": 4,
+}
+
+
+class Test_parse_path:
+    @pytest.mark.parametrize(
+        "path,expected",
+        [
+            ("", ()),
+            ("/", ("",)),
+            ("/items/0/owner", ("items", "0", "owner")),
+            ("/a~1b/~0", ("a/b", "~")),
+            ("/items/*/id", ("items", None, "id")),
+            ("$", ()),
+            ("$.items[0].owner", ("items", "0", "owner")),
+            ("$['items'][0][\"owner\"]", ("items", "0", "owner")),
+            ("$.items[*].id", ("items", None, "id")),
+            ("$.items.*", ("items", None)),
+            ("$['*']", ("*",)),
+            ("$['it\\'s']", ("it's",)),
+        ],
+    )
+    def test_parse_path(self, path, expected):
+        assert _index.parse_path(path) == expected
+
+    @pytest.mark.parametrize("path", ["items", "$items", "$.items[", "$.items[-1]"])
+    def test_invalid(self, path):
+        with pytest.raises(ValueError):
+            _index.parse_path(path)
+
+
+class TestPathIndex:
+    @pytest.mark.parametrize("cls", [Derek, LazyDerek, DerekDAG])
+    def test_get(self, cls):
+        root = cls.tree(OBJ)
+        assert root.node_at("") is root
+        assert root.node_at("/items/1/owner/id").value == 2
+        assert root.node_at("$.items[0].owner.id").value == 1
+        assert root.node_at("$.items[0].tags").value == ["a", "b"]
+        assert root.node_at("/a~1b/~0").value == 3
+        assert root.node_at("$['*']").value == 4
+
+        node = root.node_at("/items/0/owner")
+        assert node.node_at("/id") is root.node_at("/items/0/owner/id")
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/items/3",
+            "/items/01",
+            "/items/x",
+            "/missing",
+            "$['*'][0]",
+            "/items/2/owner/id",
+        ],
+    )
+    def test_get_missing(self, path):
+        with pytest.raises(KeyError):
+            Derek.tree(OBJ).node_at(path)
+
+    def test_get_wildcard(self):
+        with pytest.raises(ValueError):
+            Derek.tree(OBJ).node_at("/items/*")
+
+    @pytest.mark.parametrize("cls", [Derek, LazyDerek, DerekDAG])
+    def test_find(self, cls):
+        root = cls.tree(OBJ)
+        values = lambda path: [node.value for node in root.nodes_at(path)]
+
+        assert values("$.items[*].owner.id") == [1, 2]
+        assert values("/items/*/tags/*") == ["a", "b"]
+        assert values("/items/*/owner") == [{"id": 1}, {"id": 2}, "nobody"]
+        assert values("/*") == [OBJ["items"], {"~": 3}, 4]
+        assert values("/items/0") == [OBJ["items"][0]]
+        assert values("/missing/*") == []
+
+    def test_tree(self):
+        """
+        Check that nodes of a DerekTree are found by index.
+        """
+        root = DerekTree.tree(OBJ)
+        i = root.node_at("/items/1/owner/id")
+        assert isinstance(i, int)
+        assert root.node_value(i) == 2
+        assert [root.node_value(i) for i in root.nodes_at("$.items[*].owner.id")] == [
+            1,
+            2,
+        ]
+
+    def test_index(self):
+        """
+        Check that the index is made once, and only indexes the dictionaries
+        looked up.
+        """
+        root = Derek.tree(OBJ)
+        index = root.index
+        assert root.index is index
+
+        root.node_at("/items/0/owner")
+        assert set(index._keys) == {id(root), id(root.node_at("/items/0"))}
+
+    def test_lazy(self):
+        """
+        Check that lookups only make the nodes along the path.
+        """
+        root = LazyDerek.tree(OBJ)
+        root.node_at("/items/0/owner")
+        assert root.children[0]._children is not None
+        assert root.children[1]._children is None
+        assert root.children[0].children[1]._children is None
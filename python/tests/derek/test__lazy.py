@@ -0,0 +1,99 @@
+import sys
+
+import pytest
+
+from derek._derek import Derek
+from derek._lazy import LazyDerek
+
+from ._corpus import OBJS, check_same
+
+
+class Test_LazyDerek:
+    def test_tree(self):
+        """
+        Try making a lazy tree, checking that only the root node is made.
+        """
+        obj = {"a": [1, 2], "b": "x"}
+        node = Derek.tree(obj, name="some_node", lazy=True)
+
+        assert isinstance(node, LazyDerek)
+        assert node.value is obj
+        assert node.name == "some_node"
+        assert node._children is None
+
+    @pytest.mark.parametrize("obj", OBJS)
+    def test_children(self, obj):
+        """
+        Try accessing the children of every node, comparing with Derek.
+        """
+        check_same(LazyDerek.tree(obj), Derek.tree(obj), LazyDerek)
+
+    def test_children_cached(self):
+        """
+        Try accessing children twice, checking that they are only made once.
+        """
+        node = LazyDerek.tree({"a": [1, 2], "b": [3]})
+        children = node.children
+        assert node.children is children
+        assert children[0]._children is None
+        assert children[0].children is children[0].children
+
+    def test_children_setter(self):
+        """
+        Try setting the children of a lazy node.
+        """
+        node = LazyDerek(value=[1, 2], children=[])
+        assert node.children == []
+
+    @pytest.mark.parametrize("obj", OBJS)
+    def test_example(self, obj):
+        """
+        Try generating an example, comparing with Derek.
+        """
+        node = LazyDerek.tree(obj)
+        assert node.example() == Derek.tree(obj).example()
+        assert node._children is None
+
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    @pytest.mark.parametrize("obj", OBJS)
+    def test_parse(self, obj, strategy):
+        """
+        Try parsing without making any nodes, comparing with Derek.
+        """
+        node = LazyDerek.tree(obj)
+        expected = Derek.tree(obj).parse(strategy=strategy)
+        assert node.parse(strategy=strategy) == expected
+        assert node._children is None
+
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    @pytest.mark.parametrize("obj", OBJS)
+    def test_parse_partly_made(self, obj, strategy):
+        """
+        Try parsing after making some of the nodes, comparing with Derek.
+        """
+        node = LazyDerek.tree(obj)
+        for child in node.children or []:
+            child.children
+
+        expected = Derek.tree(obj).parse(strategy=strategy)
+        assert node.parse(strategy=strategy) == expected
+
+    def test_deep(self):
+        """
+        Try parsing a lazy tree nested deeper than the recursion limit.
+        """
+        depth = sys.getrecursionlimit() + 100
+        obj = 1
+        for _ in range(depth):
+            obj = [obj]
+
+        node = LazyDerek.tree(obj)
+        schema = node.parse(format="oas2")["untitled"]
+        for _ in range(depth):
+            assert schema["type"] == "array"
+            schema = schema["items"]
+        assert schema == {"type": "integer"}
+
+        for _ in range(depth):
+            (node,) = node.children
+        assert node.value == 1
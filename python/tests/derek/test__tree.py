@@ -0,0 +1,110 @@
+import sys
+
+import pytest
+
+from derek._derek import Derek
+from derek._tree import DerekTree, KINDS
+
+from ._corpus import OBJS
+
+
+class Test_DerekTree:
+    def test_tree(self):
+        """
+        Try making a tree, checking the arrays.
+        """
+        obj = {"a": [1, 2], "b": "x", "c": {"a": True}}
+        tree = DerekTree.tree(obj, name="some_tree")
+
+        assert tree.value is obj
+        assert tree.name == "some_tree"
+        assert len(tree) == 7
+        assert [tree.node_value(i) for i in range(len(tree))] == [
+            obj,
+            [1, 2],
+            "x",
+            {"a": True},
+            1,
+            2,
+            True,
+        ]
+        assert list(tree.parents) == [-1, 0, 0, 0, 1, 1, 3]
+        assert [KINDS[k] for k in tree.kinds] == [
+            "object",
+            "array",
+            "string",
+            "object",
+            "integer",
+            "integer",
+            "boolean",
+        ]
+        assert list(tree.offsets) == [1, 4, 6, 6, 7, 7, 7, 7]
+        assert [tree.node_key(i) for i in range(len(tree))] == [
+            None,
+            "a",
+            "b",
+            "c",
+            None,
+            None,
+            "a",
+        ]
+        assert tree.key_names == ["a", "b", "c"]
+
+    def test_node_children(self):
+        """
+        Try getting the children of nodes.
+        """
+        tree = DerekTree.tree([[1, 2], [], 3])
+
+        assert list(tree.node_children(0)) == [1, 2, 3]
+        assert list(tree.node_children(1)) == [4, 5]
+        assert list(tree.node_children(2)) == []
+        assert list(tree.node_children(3)) == []
+        for i in range(1, len(tree)):
+            assert i in tree.node_children(tree.parents[i])
+
+    def test_subclasses(self):
+        """
+        Try making a tree containing subclasses of the JSON types.
+        """
+
+        class Str(str):
+            pass
+
+        tree = DerekTree.tree([Str("a"), True, object()])
+        assert [KINDS[k] for k in tree.kinds] == ["array", "string", "boolean", None]
+
+    @pytest.mark.parametrize("obj", OBJS)
+    def test_example(self, obj):
+        """
+        Try generating an example, comparing with Derek.
+        """
+        assert DerekTree.tree(obj).example() == Derek.tree(obj).example()
+
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    @pytest.mark.parametrize("obj", OBJS)
+    def test_parse(self, obj, strategy):
+        """
+        Try parsing, comparing with Derek.
+        """
+        assert DerekTree.tree(obj).parse(strategy=strategy) == Derek.tree(obj).parse(
+            strategy=strategy
+        )
+
+    def test_deep(self):
+        """
+        Try making and parsing a tree nested deeper than the recursion limit.
+        """
+        depth = sys.getrecursionlimit() + 100
+        obj = 1
+        for _ in range(depth):
+            obj = [obj]
+
+        tree = DerekTree.tree(obj)
+        assert len(tree) == depth + 1
+
+        schema = tree.parse(format="oas2")["untitled"]
+        for _ in range(depth):
+            assert schema["type"] == "array"
+            schema = schema["items"]
+        assert schema == {"type": "integer"}
@@ -0,0 +1,95 @@
+import gc
+import sys
+import weakref
+
+import pytest
+
+from derek import Derek, Parser
+from derek._weak import WeakDerek
+
+from ._corpus import OBJS, check_same
+
+
+class Test_WeakDerek:
+    @pytest.mark.parametrize("obj", OBJS)
+    def test_tree(self, obj):
+        """
+        Check that the tree has the same structure as a tree of Derek nodes.
+        """
+        root = WeakDerek.tree(obj, name="x")
+        assert root.parent is None
+        assert root.name == "x"
+        check_same(root, Derek.tree(obj), WeakDerek)
+
+    @pytest.mark.parametrize("obj", OBJS)
+    def test_derek_tree(self, obj):
+        """
+        Try making a tree with Derek.tree(obj, weak=True).
+        """
+        check_same(Derek.tree(obj, weak=True), Derek.tree(obj), WeakDerek)
+
+    def test_flags(self):
+        with pytest.raises(ValueError):
+            Derek.tree([], lazy=True, weak=True)
+
+    @pytest.mark.parametrize("obj", OBJS)
+    @pytest.mark.parametrize("strategy", ["permissive", "restricted", "inner_join"])
+    def test_parse(self, obj, strategy):
+        """
+        Check that the results are the same as for a tree of Derek nodes.
+        """
+        expected = Derek.tree(obj).parse(strategy=strategy)
+        assert WeakDerek.tree(obj).parse(strategy=strategy) == expected
+        assert WeakDerek.tree(obj).example() == Derek.tree(obj).example()
+
+    def test_parent(self):
+        """
+        Check that a node's parent is None once the parent has been freed.
+        """
+        root = WeakDerek.tree({"a": [1]})
+        child = root.children[0]
+        assert child.parent is root
+
+        del root
+        assert child.parent is None
+
+    def test_freed(self):
+        """
+        Check that a tree is freed by reference counting alone, with no
+        reference cycles for the garbage collector to find (even once
+        indexed).
+        """
+        obj = [{"a": [1, {"b": 2}], "c": [1.5] * 10} for _ in range(100)]
+
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            # (Any garbage from before the test)
+            gc.collect()
+
+            root = WeakDerek.tree(obj)
+            root.node_at("/0/a/1/b")
+            root.node_at("/0/c/1")
+            leaf = weakref.ref(root.children[99].children[0].children[1])
+            del root
+            assert leaf() is None
+            assert gc.collect() == 0
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def test_deep(self):
+        """
+        Check that a tree nested far deeper than the recursion limit is made
+        and parsed.
+        """
+        depth = 20 * sys.getrecursionlimit()
+        obj = ["a"]
+        for _ in range(depth):
+            obj = [obj]
+
+        root = WeakDerek.tree(obj)
+        schema = Parser.oas2(root)
+        for _ in range(depth + 1):
+            schema = schema["items"]
+        assert schema == {"type": "string"}